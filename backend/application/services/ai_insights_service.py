@@ -1,28 +1,339 @@
 """
 AI Insights Service - Provides intelligent analysis and suggestions for tasks
 """
+import asyncio
+import copy
+import heapq
+import json
 import logging
-from typing import Any, Optional, List, Dict
-from datetime import datetime, timedelta
+import re
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Optional, List, Dict, Tuple
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
 from domain.entities.task import Task
+from domain.utils.datetime_utils import utcnow_aware
+from infrastructure.cache.memory_cache import LRUCache
 from infrastructure.gpt.openai_adapter import OpenAIAdapter
 
 logger = logging.getLogger("sgti")
 
+# Palavras-chave de urgência, da mais forte para a mais fraca
+_URGENCY_KEYWORDS = {
+    "urgent": frozenset({"urgente", "urgent", "asap", "imediato", "immediate", "crítico", "critical"}),
+    "high": frozenset({"importante", "important", "prioritário", "priority", "logo", "soon"}),
+    "low": frozenset({"quando der", "eventually", "algum dia", "someday", "se possível", "if possible"}),
+}
+_URGENCY_LEVELS = {
+    "urgent": (0, "high", 1.0),
+    "high": (1, "high", 0.8),
+    "low": (2, "low", 0.2),
+}
+_POSITIVE_WORDS = frozenset({"ótimo", "excelente", "bom", "great", "excellent", "good"})
+_NEGATIVE_WORDS = frozenset({"problema", "bug", "erro", "falha", "problem", "error", "issue"})
+
+_KEYWORD_CATEGORIES = {
+    **{word: "positive" for word in _POSITIVE_WORDS},
+    **{word: "negative" for word in _NEGATIVE_WORDS},
+    **{word: level for level, words in _URGENCY_KEYWORDS.items() for word in words},
+}
+# Uma única varredura linear do texto para todas as palavras-chave; o lookahead
+# permite casamentos sobrepostos e as alternativas mais longas vêm primeiro
+_KEYWORD_PATTERN = re.compile(
+    "(?=({}))".format(
+        "|".join(re.escape(word) for word in sorted(_KEYWORD_CATEGORIES, key=len, reverse=True))
+    )
+)
+
+# Compartilhados entre instâncias: o serviço é criado a cada requisição
+_SUBTASKS_CACHE = LRUCache(max_size=512, ttl=3600)
+_SCHEDULING_CACHE = LRUCache(max_size=256, ttl=600)
+_NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+# Status e prioridades (português e inglês) agrupados para o resumo
+_SUMMARY_STATUS_BUCKETS = {
+    "done": "completed",
+    "concluida": "completed",
+    "in_progress": "in_progress",
+    "em_progresso": "in_progress",
+    "todo": "todo",
+    "a_fazer": "todo",
+    "pending": "todo",
+}
+_HIGH_PRIORITY_VALUES = frozenset({"high", "alta", "urgente", "urgent"})
+
+# Estimativa base em minutos pela primeira categoria de palavra-chave encontrada
+_DURATION_HINTS = (
+    (("rápido", "quick", "simples", "simple"), 30),
+    (("complexo", "complex", "grande", "large", "desenvolver", "develop"), 180),
+    (("reunião", "meeting"), 60),
+    (("bug", "erro", "fix"), 45),
+)
+
+
+@dataclass
+class _SummaryStats:
+    completed: int
+    in_progress: int
+    todo: int
+    total_time: int
+    overdue: int
+    completed_in_period: int
+    high_priority_pending: int
+
+    @property
+    def total_active(self) -> int:
+        return self.todo + self.in_progress
+
+    @property
+    def hours(self) -> int:
+        return self.total_time // 60
+
+    @property
+    def minutes(self) -> int:
+        return self.total_time % 60
+
+
+_PERIOD_DELTAS = {"daily": timedelta(days=1), "weekly": timedelta(days=7)}
+_DEFAULT_PERIOD_DELTA = timedelta(days=30)
+
+_NO_ACTIVE_TASKS_INSIGHT = "📋 Você não tem tarefas ativas. Crie novas tarefas para começar!"
+
+# Regras do resumo: (condição, template) avaliadas em ordem sobre _SummaryStats
+_INSIGHT_RULES = (
+    (lambda s: s.completed_in_period >= 5,
+     "🎉 Excelente produtividade! Você completou {s.completed_in_period} tarefas neste período."),
+    (lambda s: 2 <= s.completed_in_period < 5,
+     "👍 Bom progresso! {s.completed_in_period} tarefas concluídas neste período."),
+    (lambda s: s.completed_in_period == 1,
+     "📝 Você concluiu {s.completed_in_period} tarefa neste período. Continue focado!"),
+    (lambda s: s.completed_in_period == 0 and s.total_active > 0,
+     "💡 Nenhuma tarefa concluída ainda neste período. Que tal começar pela mais importante?"),
+    (lambda s: s.completed_in_period == 0 and s.total_active == 0, _NO_ACTIVE_TASKS_INSIGHT),
+    (lambda s: s.overdue > 0,
+     "⚠️ ATENÇÃO: {s.overdue} tarefas estão atrasadas e precisam de ação imediata."),
+    (lambda s: s.high_priority_pending > 3,
+     "🔴 Você tem {s.high_priority_pending} tarefas de alta prioridade pendentes. Priorize-as!"),
+    (lambda s: 0 < s.high_priority_pending <= 3,
+     "📌 {s.high_priority_pending} tarefas de alta prioridade aguardam conclusão."),
+    (lambda s: s.in_progress > 5,
+     "🎯 Muitas tarefas em progresso. Considere focar em finalizar algumas antes de iniciar novas."),
+    (lambda s: s.total_active == 0 and s.completed > 0,
+     "✅ Parabéns! Todas as tarefas foram concluídas. Que tal planejar novas metas?"),
+)
+
+_RECOMMENDATION_RULES = (
+    (lambda s: s.overdue > 0,
+     "🚨 Resolva as {s.overdue} tarefas atrasadas - elas impactam sua produtividade."),
+    (lambda s: s.high_priority_pending > 0,
+     "⭐ Comece seu dia pelas tarefas de alta prioridade para maximizar resultados."),
+    (lambda s: s.in_progress > 3,
+     "🎯 Finalize tarefas em andamento antes de iniciar novas para manter o foco."),
+    (lambda s: s.hours > 0,
+     "⏱️ Você investiu {s.hours}h{s.minutes}min em tarefas. Continue o bom trabalho!"),
+    (lambda s: s.total_time > 0 and s.hours == 0,
+     "⏱️ Você investiu {s.minutes} minutos em tarefas. Continue focado!"),
+    (lambda s: s.todo > 10,
+     "📝 Sua lista de tarefas está grande. Considere priorizar ou delegar algumas."),
+    (lambda s: s.completed > 0 and s.total_active == 0,
+     "🌟 Incrível! Você zerou sua lista de tarefas. Planeje os próximos passos!"),
+)
+
+_DEFAULT_RECOMMENDATIONS = (
+    "📅 Defina prazos para suas tarefas para manter o foco.",
+    "🔄 Revise suas tarefas diariamente para manter a produtividade.",
+)
+
+# Tarefas de teste/deploy dependem de tarefas de desenvolvimento
+_TEST_DEPLOY_WORDS = ("testar", "test", "deploy")
+_DEVELOPMENT_WORDS = ("desenvolver", "implement", "criar", "create")
+
+_UTC = timezone.utc
+
+
+def _as_aware(dt: Optional[datetime]) -> Optional[datetime]:
+    """Converte datetime naive para aware (UTC) se necessário"""
+    if dt is None or dt.tzinfo is not None:
+        return dt
+    return dt.replace(tzinfo=_UTC)
+
+
+def _task_status(task: Task) -> str:
+    status = task.status
+    value = getattr(status, "value", None)
+    return value if value is not None else str(status)
+
+
+def _task_priority(task: Task) -> str:
+    priority = task.priority
+    value = getattr(priority, "value", None)
+    return value if value is not None else str(priority)
+
+
+def _task_due_date(task: Task) -> Optional[str]:
+    due_date = task.due_date
+    if isinstance(due_date, str):
+        return due_date
+    try:
+        return due_date.isoformat()
+    except AttributeError:
+        return None
+
+
+def _task_duration(task: Task) -> int:
+    val = task.actual_duration if task.actual_duration is not None else (task.estimated_duration or 0)
+    if isinstance(val, (int, float)):
+        return int(val)
+    elif isinstance(val, str) and val.isdigit():
+        return int(val)
+    return 0
+
+
+# Templates estáticos dos prompts, montados uma vez na importação do módulo
+_SUBTASKS_PROMPT_TEMPLATE = """Dada esta tarefa, sugira 3-5 subtarefas lógicas para dividi-la:
+
+Tarefa: {title}
+{description_line}
+
+Retorne um objeto JSON com um campo "subtasks" contendo um array de subtarefas no seguinte formato EXATO:
+
+{{
+  "subtasks": [
+    {{
+      "title": "Nome da subtarefa 1",
+      "description": "Descrição detalhada da subtarefa 1",
+      "estimated_duration": 30
+    }},
+    {{
+      "title": "Nome da subtarefa 2",
+      "description": "Descrição detalhada da subtarefa 2",
+      "estimated_duration": 45
+    }}
+  ]
+}}
+
+REGRAS OBRIGATÓRIAS:
+- Todas as subtarefas DEVEM estar em PORTUGUÊS BRASILEIRO
+- Mantenha as subtarefas específicas, acionáveis e em ordem lógica
+- Use linguagem clara e profissional em português
+- Retorne APENAS o objeto JSON, sem texto adicional
+- O campo "subtasks" deve conter um array com 3-5 subtarefas"""
+
+_SCHEDULING_TASK_TEMPLATE = """
+Tarefa para agendar:
+- Título: {title}
+- Descrição: {description}
+- Prioridade: {priority}
+- Data de Vencimento: {due_date}
+- Duração Estimada: {estimated_duration} minutos
+"""
+
+_SCHEDULING_PROMPT_TEMPLATE = """{task_details}
+Data/hora atual: {now}
+
+Tarefas existentes (para contexto):
+{existing_context}
+
+Com base nos detalhes da tarefa e na carga de trabalho existente, sugira o momento ideal para agendar esta tarefa.
+
+Retorne um objeto JSON com esta estrutura exata:
+{{
+  "suggestion": "string (ex: 'hoje', 'amanhã', 'em 3 dias')",
+  "suggested_time": "string ISO datetime",
+  "reason": "string explicando o raciocínio em português brasileiro",
+  "confidence": número entre 0 e 1
+}}
+
+Considere:
+1. Prioridade e urgência da tarefa
+2. Restrições de prazo de vencimento
+3. Carga de trabalho existente e distribuição de tarefas
+4. Horário ideal do dia para este tipo de tarefa
+5. Tempo de buffer antes do prazo
+
+IMPORTANTE: Todos os textos devem estar em PORTUGUÊS BRASILEIRO.
+Retorne APENAS o objeto JSON, sem texto adicional."""
+
+# Limita chamadas simultâneas à OpenAI no processo inteiro, não só por requisição
+_LLM_GATES: Dict[int, asyncio.Semaphore] = {}
+
+
+def _get_llm_gate(max_concurrency: int) -> asyncio.Semaphore:
+    gate = _LLM_GATES.get(max_concurrency)
+    if gate is None:
+        gate = _LLM_GATES[max_concurrency] = asyncio.Semaphore(max_concurrency)
+    return gate
+
+
+def _normalize_text(text: str) -> str:
+    """Normaliza caixa, pontuação e espaços para casar títulos quase idênticos"""
+    return " ".join(_NON_WORD_PATTERN.sub(" ", text.casefold()).split())
+
+
+class _SubtaskStreamParser:
+    """Extrai cada item do array "subtasks" assim que o JSON do item fica completo"""
+
+    def __init__(self):
+        self.buffer = ""
+        self._decoder = json.JSONDecoder()
+        self._pos: Optional[int] = None
+        self._done = False
+        self.emitted = 0
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        self.buffer += chunk
+        if self._done:
+            return []
+
+        if self._pos is None:
+            key = self.buffer.find('"subtasks"')
+            if key == -1:
+                return []
+            start = self.buffer.find("[", key)
+            if start == -1:
+                return []
+            self._pos = start + 1
+
+        items = []
+        while True:
+            pos = self._pos
+            while pos < len(self.buffer) and self.buffer[pos] in " \t\r\n,":
+                pos += 1
+            self._pos = pos
+            if pos >= len(self.buffer):
+                break
+            if self.buffer[pos] == "]":
+                self._done = True
+                break
+            try:
+                item, end = self._decoder.raw_decode(self.buffer, pos)
+            except json.JSONDecodeError:
+                break
+            self._pos = end
+            items.append(item)
+
+        self.emitted += len(items)
+        return items
+
 
 class AIInsightsService:
     """Service for AI-powered insights and analysis using GPT-4 only"""
+
+    # Quantidade de tarefas existentes enviadas como contexto no agendamento
+    SCHEDULING_CONTEXT_SIZE = 10
     
     def __init__(
         self,
         openai_adapter: OpenAIAdapter,
         llama_adapter: Optional[Any] = None,
-        provider: str = "gpt4"
+        provider: str = "gpt4",
+        max_concurrency: int = 10
     ):
         self.openai_adapter = openai_adapter
         self.provider = provider
+        self.max_concurrency = max_concurrency
+        self._llm_gate = _get_llm_gate(max_concurrency)
     
     async def suggest_subtasks(
         self,
@@ -37,54 +348,167 @@ class AIInsightsService:
         else:
             raise ValueError(f"GPT-4 provider not configured. Current provider: {self.provider}")
     
+    async def suggest_subtasks_stream(
+        self,
+        task_title: str,
+        task_description: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield suggested subtasks one by one while GPT-4 is still generating"""
+        if not (self.provider == "gpt4" and self.openai_adapter):
+            raise ValueError(f"GPT-4 provider not configured. Current provider: {self.provider}")
+
+        exact_key, normalized_key = self._subtasks_cache_keys(task_title, task_description)
+        cached = _SUBTASKS_CACHE.get(exact_key) or _SUBTASKS_CACHE.get(normalized_key)
+        if cached is not None:
+            for subtask in cached:
+                yield dict(subtask)
+            return
+
+        parser = _SubtaskStreamParser()
+        subtasks: List[Dict[str, Any]] = []
+        async for chunk in self._stream_completion(
+            prompt=self._build_subtasks_prompt(task_title, task_description),
+            response_format={"type": "json_object"}
+        ):
+            for subtask in parser.feed(chunk):
+                subtasks.append(dict(subtask))
+                yield subtask
+
+        if not parser.emitted:
+            subtasks = self._parse_subtasks(parser.buffer)
+            for subtask in subtasks:
+                yield dict(subtask)
+
+        if subtasks:
+            _SUBTASKS_CACHE.set(exact_key, subtasks)
+            _SUBTASKS_CACHE.set(normalized_key, subtasks)
+
+    async def suggest_subtasks_many(
+        self,
+        items: List[Tuple[str, Optional[str]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Suggest subtasks for several tasks concurrently, bounded by the shared LLM gate"""
+        if not (self.provider == "gpt4" and self.openai_adapter):
+            raise ValueError(f"GPT-4 provider not configured. Current provider: {self.provider}")
+
+        return list(await asyncio.gather(
+            *(self._suggest_subtasks_gpt(title, description) for title, description in items)
+        ))
+
+    async def submit_subtasks_batch(
+        self,
+        items: List[Tuple[str, Optional[str]]]
+    ) -> str:
+        """Submit subtask suggestions to the OpenAI Batch API for non-interactive workloads
+
+        Returns the batch id; results are read later with get_subtasks_batch_results,
+        keyed by the item index as a string.
+        """
+        if not (self.provider == "gpt4" and self.openai_adapter):
+            raise ValueError(f"GPT-4 provider not configured. Current provider: {self.provider}")
+
+        requests = [
+            {
+                "custom_id": str(index),
+                "body": self.openai_adapter.build_completion_body(
+                    prompt=self._build_subtasks_prompt(title, description),
+                    response_format={"type": "json_object"}
+                ),
+            }
+            for index, (title, description) in enumerate(items)
+        ]
+        batch_id = await self.openai_adapter.submit_batch(requests)
+        logger.info("Subtask batch submitted", extra={"batch_id": batch_id, "items": len(items)})
+        return batch_id
+
+    async def get_subtasks_batch_results(
+        self,
+        batch_id: str
+    ) -> Optional[Dict[str, Optional[List[Dict[str, Any]]]]]:
+        """Return parsed subtasks per custom_id, or None while the batch is still running
+
+        Items whose request failed map to None, unlike an empty list of suggestions.
+        """
+        if not (self.provider == "gpt4" and self.openai_adapter):
+            raise ValueError(f"GPT-4 provider not configured. Current provider: {self.provider}")
+
+        contents = await self.openai_adapter.get_batch_results(batch_id)
+        if contents is None:
+            return None
+        return {
+            custom_id: self._parse_subtasks(content) if content is not None else None
+            for custom_id, content in contents.items()
+        }
+
     async def _suggest_subtasks_gpt(
         self,
         task_title: str,
         task_description: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Use GPT-4 to suggest subtasks"""
-        prompt = f"""Dada esta tarefa, sugira 3-5 subtarefas lógicas para dividi-la:
+        exact_key, normalized_key = self._subtasks_cache_keys(task_title, task_description)
+        cached = _SUBTASKS_CACHE.get(exact_key) or _SUBTASKS_CACHE.get(normalized_key)
+        if cached is not None:
+            logger.info("Subtask suggestions served from cache", extra={"task_title": task_title[:50]})
+            return [dict(subtask) for subtask in cached]
 
-Tarefa: {task_title}
-{f'Descrição: {task_description}' if task_description else ''}
+        result = await self._generate_completion(
+            prompt=self._build_subtasks_prompt(task_title, task_description),
+            response_format={"type": "json_object"}
+        )
 
-Retorne um objeto JSON com um campo "subtasks" contendo um array de subtarefas no seguinte formato EXATO:
+        logger.info("GPT-4 raw response: %s", result)
+        subtasks = self._parse_subtasks(result.get("content", "{}"))
 
-{{
-  "subtasks": [
-    {{
-      "title": "Nome da subtarefa 1",
-      "description": "Descrição detalhada da subtarefa 1",
-      "estimated_duration": 30
-    }},
-    {{
-      "title": "Nome da subtarefa 2",
-      "description": "Descrição detalhada da subtarefa 2",
-      "estimated_duration": 45
-    }}
-  ]
-}}
+        if subtasks:
+            stored = [dict(subtask) for subtask in subtasks]
+            _SUBTASKS_CACHE.set(exact_key, stored)
+            _SUBTASKS_CACHE.set(normalized_key, stored)
+        return subtasks
 
-REGRAS OBRIGATÓRIAS:
-- Todas as subtarefas DEVEM estar em PORTUGUÊS BRASILEIRO
-- Mantenha as subtarefas específicas, acionáveis e em ordem lógica
-- Use linguagem clara e profissional em português
-- Retorne APENAS o objeto JSON, sem texto adicional
-- O campo "subtasks" deve conter um array com 3-5 subtarefas"""
-        
-        result = await self.openai_adapter.generate_completion(
-            prompt=prompt,
-            response_format={"type": "json_object"}
+    async def _generate_completion(self, **kwargs: Any) -> Dict[str, Any]:
+        """Call the OpenAI adapter through the process-wide concurrency gate"""
+        async with self._llm_gate:
+            return await self.openai_adapter.generate_completion(**kwargs)
+
+    async def _stream_completion(self, **kwargs: Any) -> AsyncIterator[str]:
+        """Stream from the OpenAI adapter, holding the concurrency gate only until the first chunk
+
+        The gate never spans a yield, so a slow or abandoned consumer cannot keep a slot.
+        """
+        stream = self.openai_adapter.generate_completion_stream(**kwargs)
+        try:
+            async with self._llm_gate:
+                first = await anext(stream, None)
+            if first is None:
+                return
+            yield first
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    @staticmethod
+    def _subtasks_cache_keys(task_title: str, task_description: Optional[str]) -> Tuple[str, str]:
+        exact_key = LRUCache.generate_hash(f"{task_title}|{task_description or ''}")
+        normalized_key = LRUCache.generate_hash(
+            f"{_normalize_text(task_title)}|{_normalize_text(task_description or '')}"
         )
+        return exact_key, normalized_key
 
-        import json
-        logger.info(f"GPT-4 raw response: {result}")
+    @staticmethod
+    def _build_subtasks_prompt(task_title: str, task_description: Optional[str] = None) -> str:
+        return _SUBTASKS_PROMPT_TEMPLATE.format(
+            title=task_title,
+            description_line=f"Descrição: {task_description}" if task_description else ""
+        )
 
-        content = result.get("content", "{}")
-        logger.info(f"GPT-4 content: {content}")
+    @staticmethod
+    def _parse_subtasks(content: Optional[str]) -> List[Dict[str, Any]]:
+        logger.info("GPT-4 content: %s", content)
 
-        parsed = json.loads(content)
-        logger.info(f"Parsed JSON: {parsed}")
+        parsed = json.loads(content or "{}")
+        logger.info("Parsed JSON: %s", parsed)
 
         if isinstance(parsed, list):
             subtasks = parsed
@@ -93,37 +517,33 @@ REGRAS OBRIGATÓRIAS:
         else:
             subtasks = []
 
-        logger.info(f"Final subtasks: {subtasks}")
+        logger.info("Final subtasks: %s", subtasks)
         return subtasks
     
     async def analyze_sentiment_urgency(self, text: str) -> Dict[str, Any]:
         """Analyze sentiment and urgency from task text"""
-        text_lower = text.lower()
-        
-        urgency_keywords = {
-            "urgent": ["urgente", "urgent", "asap", "imediato", "immediate", "crítico", "critical"],
-            "high": ["importante", "important", "prioritário", "priority", "logo", "soon"],
-            "low": ["quando der", "eventually", "algum dia", "someday", "se possível", "if possible"]
-        }
-        
-        priority = "medium"
-        urgency_score = 0.5
-        
-        for level, keywords in urgency_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
-                if level == "urgent":
-                    priority = "high"
-                    urgency_score = 1.0
-                elif level == "high":
-                    priority = "high"
-                    urgency_score = 0.8
-                elif level == "low":
-                    priority = "low"
-                    urgency_score = 0.2
+        best_level = None
+        sentiment_positive = False
+        sentiment_negative = False
+
+        for match in _KEYWORD_PATTERN.finditer(text.lower()):
+            category = _KEYWORD_CATEGORIES[match.group(1)]
+            if category == "positive":
+                sentiment_positive = True
+            elif category == "negative":
+                sentiment_negative = True
+            elif best_level is None or _URGENCY_LEVELS[category][0] < _URGENCY_LEVELS[best_level][0]:
+                best_level = category
+
+            # Nível máximo e sentimento positivo não podem mais mudar o resultado
+            if best_level == "urgent" and sentiment_positive:
                 break
-        
-        sentiment_positive = any(word in text_lower for word in ["ótimo", "excelente", "bom", "great", "excellent", "good"])
-        sentiment_negative = any(word in text_lower for word in ["problema", "bug", "erro", "falha", "problem", "error", "issue"])
+
+        if best_level is None:
+            priority = "medium"
+            urgency_score = 0.5
+        else:
+            _, priority, urgency_score = _URGENCY_LEVELS[best_level]
         
         return {
             "priority": priority,
@@ -141,25 +561,21 @@ REGRAS OBRIGATÓRIAS:
         """Estimate task duration in minutes based on content and history"""
         base_duration = 60
         
-        text = f"{task_title} {task_description or ''}".lower()
+        title_lower = task_title.lower()
+        text = f"{title_lower} {(task_description or '').lower()}"
         
-        if any(word in text for word in ["rápido", "quick", "simples", "simple"]):
-            base_duration = 30
-        elif any(word in text for word in ["complexo", "complex", "grande", "large", "desenvolver", "develop"]):
-            base_duration = 180
-        elif any(word in text for word in ["reunião", "meeting"]):
-            base_duration = 60
-        elif any(word in text for word in ["bug", "erro", "fix"]):
-            base_duration = 45
+        for keywords, duration in _DURATION_HINTS:
+            if any(word in text for word in keywords):
+                base_duration = duration
+                break
         
-        if historical_tasks:
-            similar_durations = []
-            for task in historical_tasks[-10:]:
-                if task.actual_duration and any(
-                    word in task.title.lower() 
-                    for word in task_title.lower().split()[:3]
-                ):
-                    similar_durations.append(task.actual_duration)
+        query_words = title_lower.split()[:3]
+        if historical_tasks and query_words:
+            similar_durations = [
+                task.actual_duration
+                for task in historical_tasks[-10:]
+                if task.actual_duration and any(word in task.title_lower for word in query_words)
+            ]
             
             if similar_durations:
                 avg_duration = sum(similar_durations) / len(similar_durations)
@@ -179,6 +595,19 @@ REGRAS OBRIGATÓRIAS:
         else:
             raise ValueError(f"GPT-4 provider not configured. Current provider: {self.provider}")
     
+    async def suggest_scheduling_many(
+        self,
+        tasks: List[Task],
+        existing_tasks: List[Task]
+    ) -> List[Dict[str, Any]]:
+        """Suggest scheduling for several tasks concurrently, bounded by the shared LLM gate"""
+        if not (self.provider == "gpt4" and self.openai_adapter):
+            raise ValueError(f"GPT-4 provider not configured. Current provider: {self.provider}")
+
+        return list(await asyncio.gather(
+            *(self._suggest_scheduling_gpt(task, existing_tasks) for task in tasks)
+        ))
+    
     async def _suggest_scheduling_gpt(
         self,
         task: Task,
@@ -187,54 +616,40 @@ REGRAS OBRIGATÓRIAS:
         """Use GPT-4 to suggest optimal scheduling for a task"""
         now = datetime.utcnow()
         
-        task_context = f"""
-Tarefa para agendar:
-- Título: {task.title}
-- Descrição: {task.description or 'N/A'}
-- Prioridade: {task.priority}
-- Data de Vencimento: {task.due_date.isoformat() if task.due_date else 'Não definida'}
-- Duração Estimada: {task.estimated_duration or 'Desconhecida'} minutos
-
-Data/hora atual: {now.isoformat()}
-
-Tarefas existentes (para contexto):
-"""
+        task_details = _SCHEDULING_TASK_TEMPLATE.format(
+            title=task.title,
+            description=task.description or 'N/A',
+            priority=task.priority,
+            due_date=task.due_date.isoformat() if task.due_date else 'Não definida',
+            estimated_duration=task.estimated_duration or 'Desconhecida'
+        )
 
-        for t in existing_tasks[:10]:
-            task_context += f"- {t.title} (Prioridade: {t.priority}, Status: {t.status}"
+        existing_context = ""
+        for t in existing_tasks[:self.SCHEDULING_CONTEXT_SIZE]:
+            existing_context += f"- {t.title} (Prioridade: {t.priority}, Status: {t.status}"
             if t.due_date:
-                task_context += f", Vencimento: {t.due_date.isoformat()}"
-            task_context += ")\n"
-
-        prompt = f"""{task_context}
-
-Com base nos detalhes da tarefa e na carga de trabalho existente, sugira o momento ideal para agendar esta tarefa.
-
-Retorne um objeto JSON com esta estrutura exata:
-{{
-  "suggestion": "string (ex: 'hoje', 'amanhã', 'em 3 dias')",
-  "suggested_time": "string ISO datetime",
-  "reason": "string explicando o raciocínio em português brasileiro",
-  "confidence": número entre 0 e 1
-}}
+                existing_context += f", Vencimento: {t.due_date.isoformat()}"
+            existing_context += ")\n"
 
-Considere:
-1. Prioridade e urgência da tarefa
-2. Restrições de prazo de vencimento
-3. Carga de trabalho existente e distribuição de tarefas
-4. Horário ideal do dia para este tipo de tarefa
-5. Tempo de buffer antes do prazo
+        # A sugestão depende da tarefa e da carga atual, não do instante exato da chamada
+        cache_key = LRUCache.generate_hash(f"{task.id}|{task_details}|{existing_context}")
+        cached = _SCHEDULING_CACHE.get(cache_key)
+        if cached is not None:
+            logger.info("Scheduling suggestion served from cache", extra={"task_id": str(task.id)})
+            return copy.deepcopy(cached)
 
-IMPORTANTE: Todos os textos devem estar em PORTUGUÊS BRASILEIRO.
-Retorne APENAS o objeto JSON, sem texto adicional."""
+        prompt = _SCHEDULING_PROMPT_TEMPLATE.format(
+            task_details=task_details,
+            now=now.isoformat(),
+            existing_context=existing_context
+        )
         
         try:
-            result = await self.openai_adapter.generate_completion(
+            result = await self._generate_completion(
                 prompt=prompt,
                 response_format={"type": "json_object"}
             )
             
-            import json
             scheduling_data = json.loads(result.get("content", "{}"))
             
             required_fields = ["suggestion", "suggested_time", "reason", "confidence"]
@@ -250,6 +665,7 @@ Retorne APENAS o objeto JSON, sem texto adicional."""
                 }
             )
             
+            _SCHEDULING_CACHE.set(cache_key, copy.deepcopy(scheduling_data))
             return scheduling_data
             
         except Exception as e:
@@ -269,35 +685,44 @@ Retorne APENAS o objeto JSON, sem texto adicional."""
     ) -> List[Dict[str, Any]]:
         """Detect potential dependencies between tasks"""
         dependencies = []
-        task_words = set(task.title.lower().split())
+        task_title_lower = task.title_lower
+        task_words = task.title_tokens
+        is_test_or_deploy = any(word in task_title_lower for word in _TEST_DEPLOY_WORDS)
+
+        if len(task_words) < 2 and not is_test_or_deploy:
+            return []
         
         for other_task in all_tasks:
             if other_task.id == task.id or other_task.status == "done":
                 continue
             
-            other_words = set(other_task.title.lower().split())
-            common_words = task_words & other_words
+            other_words = other_task.title_tokens
+            # Títulos com menos de duas palavras nunca compartilham duas palavras-chave
+            if len(other_words) >= 2 and not task_words.isdisjoint(other_words):
+                common_words = task_words & other_words
+                if len(common_words) >= 2:
+                    dependencies.append({
+                        "task_id": str(other_task.id),
+                        "task_title": other_task.title,
+                        "relationship": "related",
+                        "confidence": len(common_words) / max(len(task_words), len(other_words)),
+                        "reason": f"Tarefas compartilham palavras-chave: {', '.join(list(common_words)[:3])}"
+                    })
             
-            if len(common_words) >= 2:
+            if not is_test_or_deploy:
+                continue
+
+            other_title_lower = other_task.title_lower
+            if any(word in other_title_lower for word in _DEVELOPMENT_WORDS):
                 dependencies.append({
                     "task_id": str(other_task.id),
                     "task_title": other_task.title,
-                    "relationship": "related",
-                    "confidence": len(common_words) / max(len(task_words), len(other_words)),
-                    "reason": f"Tarefas compartilham palavras-chave: {', '.join(list(common_words)[:3])}"
+                    "relationship": "blocks",
+                    "confidence": 0.8,
+                    "reason": "Desenvolvimento deve ser concluído antes de testes/deploy"
                 })
-            
-            if any(word in task.title.lower() for word in ["testar", "test", "deploy"]):
-                if any(word in other_task.title.lower() for word in ["desenvolver", "implement", "criar", "create"]):
-                    dependencies.append({
-                        "task_id": str(other_task.id),
-                        "task_title": other_task.title,
-                        "relationship": "blocks",
-                        "confidence": 0.8,
-                        "reason": "Desenvolvimento deve ser concluído antes de testes/deploy"
-                    })
         
-        return sorted(dependencies, key=lambda x: x["confidence"], reverse=True)[:5]
+        return heapq.nlargest(5, dependencies, key=lambda x: x["confidence"])
     
     async def generate_summary(
         self, 
@@ -305,137 +730,80 @@ Retorne APENAS o objeto JSON, sem texto adicional."""
         period: str = "daily"
     ) -> Dict[str, Any]:
         """Generate AI-powered summary of tasks based on real data"""
-        from datetime import timedelta
-        from domain.utils.datetime_utils import utcnow_aware
-        
-        def get_status(task):
-            return task.status.value if hasattr(task.status, 'value') else str(task.status)
-        
-        def get_priority(task):
-            return task.priority.value if hasattr(task.priority, 'value') else str(task.priority)
-        
-        def get_due_date(task):
-            if hasattr(task.due_date, 'isoformat'):
-                return task.due_date.isoformat()
-            elif isinstance(task.due_date, str):
-                return task.due_date
-            return None
-        
-        def get_duration(task):
-            val = task.actual_duration if task.actual_duration is not None else (task.estimated_duration or 0)
-            if isinstance(val, (int, float)):
-                return int(val)
-            elif isinstance(val, str) and val.isdigit():
-                return int(val)
-            return 0
-        
-        def make_aware(dt):
-            """Converte datetime naive para aware (UTC) se necessário"""
-            if dt is None:
-                return None
-            if dt.tzinfo is None:
-                from datetime import timezone
-                return dt.replace(tzinfo=timezone.utc)
-            return dt
-        
+        if not tasks:
+            return {
+                "period": period,
+                "summary": {"completed": 0, "in_progress": 0, "todo": 0, "total_time_minutes": 0},
+                "insights": [_NO_ACTIVE_TASKS_INSIGHT],
+                "top_completed": [],
+                "high_priority_pending": [],
+                "recommendations": list(_DEFAULT_RECOMMENDATIONS),
+            }
+
         now = utcnow_aware()
-        if period == "daily":
-            period_start = now - timedelta(days=1)
-        elif period == "weekly":
-            period_start = now - timedelta(days=7)
-        else:
-            period_start = now - timedelta(days=30)
-        
-        period_tasks = [t for t in tasks if t.created_at and make_aware(t.created_at) >= period_start]
-        
-        completed = [t for t in tasks if get_status(t) in ["done", "concluida"]]
-        in_progress = [t for t in tasks if get_status(t) in ["in_progress", "em_progresso"]]
-        todo = [t for t in tasks if get_status(t) in ["todo", "a_fazer", "pending"]]
-        
-        completed_in_period = [
-            t for t in completed 
-            if t.completed_at and make_aware(t.completed_at) >= period_start
-        ]
-        
-        total_time = sum(get_duration(t) for t in completed)
-        
-        high_priority_pending = [t for t in todo + in_progress if get_priority(t) in ["high", "alta", "urgente", "urgent"]]
-        
-        overdue_tasks = [
-            t for t in todo + in_progress 
-            if t.due_date and make_aware(t.due_date) < now
-        ]
-        
-        insights = []
-        
-        total_active = len(todo) + len(in_progress)
-        
-        if len(completed_in_period) > 0:
-            if len(completed_in_period) >= 5:
-                insights.append(f"🎉 Excelente produtividade! Você completou {len(completed_in_period)} tarefas neste período.")
-            elif len(completed_in_period) >= 2:
-                insights.append(f"👍 Bom progresso! {len(completed_in_period)} tarefas concluídas neste período.")
-            else:
-                insights.append(f"📝 Você concluiu {len(completed_in_period)} tarefa neste período. Continue focado!")
-        else:
-            if total_active > 0:
-                insights.append("💡 Nenhuma tarefa concluída ainda neste período. Que tal começar pela mais importante?")
-            else:
-                insights.append("📋 Você não tem tarefas ativas. Crie novas tarefas para começar!")
-        
-        if len(overdue_tasks) > 0:
-            insights.append(f"⚠️ ATENÇÃO: {len(overdue_tasks)} tarefas estão atrasadas e precisam de ação imediata.")
-        
-        if len(high_priority_pending) > 3:
-            insights.append(f"🔴 Você tem {len(high_priority_pending)} tarefas de alta prioridade pendentes. Priorize-as!")
-        elif len(high_priority_pending) > 0:
-            insights.append(f"📌 {len(high_priority_pending)} tarefas de alta prioridade aguardam conclusão.")
-        
-        if len(in_progress) > 5:
-            insights.append("🎯 Muitas tarefas em progresso. Considere focar em finalizar algumas antes de iniciar novas.")
-        
-        if total_active == 0 and len(completed) > 0:
-            insights.append("✅ Parabéns! Todas as tarefas foram concluídas. Que tal planejar novas metas?")
-        
-        recommendations = []
-        
-        if len(overdue_tasks) > 0:
-            recommendations.append(f"🚨 Resolva as {len(overdue_tasks)} tarefas atrasadas - elas impactam sua produtividade.")
-        
-        if len(high_priority_pending) > 0:
-            recommendations.append("⭐ Comece seu dia pelas tarefas de alta prioridade para maximizar resultados.")
-        
-        if len(in_progress) > 3:
-            recommendations.append("🎯 Finalize tarefas em andamento antes de iniciar novas para manter o foco.")
-        
-        if total_time > 0:
-            hours = total_time // 60
-            minutes = total_time % 60
-            if hours > 0:
-                recommendations.append(f"⏱️ Você investiu {hours}h{minutes}min em tarefas. Continue o bom trabalho!")
+        period_start = now - _PERIOD_DELTAS.get(period, _DEFAULT_PERIOD_DELTA)
+        
+        completed_count = 0
+        in_progress_count = 0
+        todo_count = 0
+        total_time = 0
+        overdue_count = 0
+        completed_in_period = []
+        high_priority_todo = []
+        high_priority_in_progress = []
+
+        for t in tasks:
+            bucket = _SUMMARY_STATUS_BUCKETS.get(_task_status(t))
+            if bucket is None:
+                continue
+
+            if bucket == "completed":
+                completed_count += 1
+                total_time += _task_duration(t)
+                if t.completed_at and _as_aware(t.completed_at) >= period_start:
+                    completed_in_period.append(t)
+                continue
+
+            if bucket == "in_progress":
+                in_progress_count += 1
+                high_priority_bucket = high_priority_in_progress
             else:
-                recommendations.append(f"⏱️ Você investiu {minutes} minutos em tarefas. Continue focado!")
-        
-        if len(todo) > 10:
-            recommendations.append("📝 Sua lista de tarefas está grande. Considere priorizar ou delegar algumas.")
-        
-        if len(completed) > 0 and len(todo) == 0 and len(in_progress) == 0:
-            recommendations.append("🌟 Incrível! Você zerou sua lista de tarefas. Planeje os próximos passos!")
-        
-        if len(recommendations) == 0:
-            recommendations.append("📅 Defina prazos para suas tarefas para manter o foco.")
-            recommendations.append("🔄 Revise suas tarefas diariamente para manter a produtividade.")
+                todo_count += 1
+                high_priority_bucket = high_priority_todo
+
+            if _task_priority(t) in _HIGH_PRIORITY_VALUES:
+                high_priority_bucket.append(t)
+            if t.due_date and _as_aware(t.due_date) < now:
+                overdue_count += 1
+
+        high_priority_pending = high_priority_todo + high_priority_in_progress
+        stats = _SummaryStats(
+            completed=completed_count,
+            in_progress=in_progress_count,
+            todo=todo_count,
+            total_time=total_time,
+            overdue=overdue_count,
+            completed_in_period=len(completed_in_period),
+            high_priority_pending=len(high_priority_pending),
+        )
+
+        insights = [template.format(s=stats) for applies, template in _INSIGHT_RULES if applies(stats)]
+        recommendations = [
+            template.format(s=stats) for applies, template in _RECOMMENDATION_RULES if applies(stats)
+        ]
+        if not recommendations:
+            recommendations.extend(_DEFAULT_RECOMMENDATIONS)
         
         return {
             "period": period,
             "summary": {
-                "completed": len(completed),
-                "in_progress": len(in_progress),
-                "todo": len(todo),
-                "total_time_minutes": total_time
+                "completed": stats.completed,
+                "in_progress": stats.in_progress,
+                "todo": stats.todo,
+                "total_time_minutes": stats.total_time
             },
             "insights": insights,
-            "top_completed": [{"title": t.title, "priority": get_priority(t)} for t in completed_in_period[:5]],
-            "high_priority_pending": [{"title": t.title, "due_date": get_due_date(t)} for t in high_priority_pending[:5]],
+            "top_completed": [{"title": t.title, "priority": _task_priority(t)} for t in completed_in_period[:5]],
+            "high_priority_pending": [{"title": t.title, "due_date": _task_due_date(t)} for t in high_priority_pending[:5]],
             "recommendations": recommendations[:4]
         }
@@ -1,33 +1,186 @@
 """
 Serviço de Analytics - Levantamento e análise de dados das tarefas
 """
+import copy
 import logging
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from enum import Enum
 from typing import List, Dict, Any, Optional
 from collections import defaultdict, Counter
+from itertools import chain
+from uuid import UUID
 
 from domain.entities.task import Task
 from domain.utils.datetime_utils import now_brazil
+from infrastructure.cache.memory_cache import LRUCache
 
 logger = logging.getLogger("sgti")
 
 
+_DONE_STATUSES = frozenset({"done", "concluida"})
+_CANCELLED_STATUSES = frozenset({"cancelled", "cancelada"})
+
+
 def get_status_value(status) -> str:
     """Obtém o valor string do status (suporta Enum e string)"""
-    return status.value if hasattr(status, 'value') else str(status)
+    if type(status) is str:
+        return status
+    return status.value if isinstance(status, Enum) else str(status)
 
 def is_done(status) -> bool:
-    s = get_status_value(status)
-    return s in ["done", "concluida"]
+    return get_status_value(status) in _DONE_STATUSES
 
 def is_cancelled(status) -> bool:
-    s = get_status_value(status)
-    return s in ["cancelled", "cancelada"]
+    return get_status_value(status) in _CANCELLED_STATUSES
 
 def is_active(status) -> bool:
     return not is_done(status) and not is_cancelled(status)
 
 
+def _pct(part: int, whole: int) -> float:
+    """Percentual com duas casas; 0.0 quando não há base"""
+    return round((part / whole) * 100, 2) if whole > 0 else 0.0
+
+
+# Código inteiro por status (pt e en): ativos < _DONE_CODE, concluída e cancelada no topo.
+# A posição em _STATUS_KEYS é o código, e dá as chaves de status_distribution
+_STATUS_KEYS = ("pending", "todo", "in_progress", "done", "cancelled")
+_STATUS_CODE = {
+    "pending": 0,
+    "todo": 1,
+    "a_fazer": 1,
+    "in_progress": 2,
+    "em_progresso": 2,
+    "done": 3,
+    "concluida": 3,
+    "cancelled": 4,
+    "cancelada": 4,
+}
+_DONE_CODE = 3
+_CANCELLED_CODE = 4
+
+# Código por prioridade (pt e en), na ordem das chaves de priority_distribution
+_PRIORITY_KEYS = ("urgente", "alta", "media", "baixa")
+_PRIORITY_CODE = {
+    "urgente": 0,
+    "urgent": 0,
+    "alta": 1,
+    "high": 1,
+    "media": 2,
+    "medium": 2,
+    "baixa": 3,
+    "low": 3,
+}
+
+
+def get_status_code(status) -> int:
+    """Código inteiro do status; valores desconhecidos contam como pendentes"""
+    code = _STATUS_CODE.get(status)
+    if code is None:
+        code = _STATUS_CODE.get(get_status_value(status), 0)
+    return code
+
+# Relatórios recentes por (usuário, versão das tarefas, período); o TTL curto limita
+# a defasagem de campos que dependem do relógio, como atrasos e vencimentos do dia
+_REPORT_CACHE = LRUCache(max_size=128, ttl=60)
+
+# Seções do relatório sem tarefas; só as tendências dependem da data de referência
+_EMPTY_REPORT_SECTIONS = {
+    "summary": {"total_tasks": 0, "active_tasks": 0, "completed_tasks": 0, "completion_rate": 0.0},
+    "completion": {
+        "completed_in_period": 0,
+        "avg_completion_time_hours": None,
+        "completed_on_time": 0,
+        "completed_late": 0,
+        "on_time_rate": 0.0
+    },
+    "priority_distribution": {key: 0 for key in _PRIORITY_KEYS},
+    "status_distribution": {key: 0 for key in _STATUS_KEYS},
+    "time_analysis": {
+        "overdue_count": 0,
+        "due_today_count": 0,
+        "due_this_week_count": 0,
+        "total_estimated_hours": 0,
+        "active_estimated_hours": 0,
+        "tasks_with_estimate": 0
+    },
+    "productivity": {
+        "tasks_created_in_period": 0,
+        "tasks_completed_in_period": 0,
+        "avg_tasks_created_per_day": 0.0,
+        "avg_tasks_completed_per_day": 0.0,
+        "completion_velocity": 0.0
+    },
+    "tags_analysis": {"total_unique_tags": 0, "most_used_tags": [], "tags_usage": {}},
+    "overdue_analysis": {
+        "total_overdue": 0,
+        "avg_days_overdue": 0,
+        "max_days_overdue": 0,
+        "overdue_by_priority": {}
+    },
+    "project_distribution": {
+        "tasks_with_project": 0,
+        "tasks_without_project": 0,
+        "unique_projects": 0,
+        "tasks_per_project": {}
+    },
+}
+
+
+def _tasks_version(tasks: List[Task]) -> tuple:
+    """Token barato que muda quando tarefas são criadas, removidas ou atualizadas"""
+    latest = max((t.updated_at.timestamp() for t in tasks if t.updated_at), default=0.0)
+    return len(tasks), latest
+
+
+def _trend_days(period_start: datetime, now: datetime) -> List[date]:
+    """Dias cobertos pelas tendências, de period_start até hoje inclusive"""
+    start = period_start.toordinal()
+    return [date.fromordinal(ordinal) for ordinal in range(start, now.toordinal() + 1)]
+
+
+@dataclass
+class _ReportStats:
+    """Acumuladores preenchidos por uma única passada sobre as tarefas"""
+    now: datetime
+    period_start: datetime
+    total: int = 0
+    status_counts: List[int] = field(default_factory=lambda: [0] * len(_STATUS_KEYS))
+    priority_counts: List[int] = field(default_factory=lambda: [0] * len(_PRIORITY_KEYS))
+    completed_in_period: int = 0
+    completion_hours_total: float = 0.0
+    completion_hours_count: int = 0
+    on_time: int = 0
+    late: int = 0
+    due_today: int = 0
+    due_week: int = 0
+    total_estimated_minutes: int = 0
+    active_estimated_minutes: int = 0
+    tasks_with_estimate: int = 0
+    created_in_period: int = 0
+    completed_of_created: int = 0
+    # Histogramas diários alinhados com _trend_days(period_start, now)
+    created_by_day: List[int] = field(default_factory=list)
+    completed_by_day: List[int] = field(default_factory=list)
+    overdue_count: int = 0
+    overdue_days_sum: int = 0
+    overdue_days_max: int = 0
+    overdue_by_priority: Dict[Any, int] = field(default_factory=lambda: defaultdict(int))
+
+    @property
+    def active(self) -> int:
+        return sum(self.status_counts[:_DONE_CODE])
+
+    @property
+    def completed(self) -> int:
+        return self.status_counts[_DONE_CODE]
+
+    @property
+    def cancelled(self) -> int:
+        return self.status_counts[_CANCELLED_CODE]
+
+
 class AnalyticsService:
     """Serviço para análise de dados e geração de relatórios de tarefas"""
 
@@ -37,37 +190,244 @@ class AnalyticsService:
     def generate_full_report(
         self,
         tasks: List[Task],
-        period_days: int = 30
+        period_days: int = 30,
+        now: Optional[datetime] = None,
+        user_id: Optional[UUID] = None
     ) -> Dict[str, Any]:
         """
         Gera relatório completo de analytics das tarefas
 
         Args:
-            tasks: Lista de todas as tarefas do usuário
+            tasks: Lista de todas as tarefas do usuário (entidades Task ou
+                TaskAnalyticsRow carregadas por get_analytics_rows)
             period_days: Período em dias para análise temporal (padrão: 30)
+            now: Instante de referência do relatório (padrão: agora em Brasília)
+            user_id: Dono das tarefas; quando informado (e sem now explícito),
+                o relatório é reaproveitado até as tarefas mudarem
 
         Returns:
             Dict com todos os dados analytics
         """
-        now = now_brazil()
+        cache_key = None
+        if user_id is not None and now is None:
+            cache_key = (user_id, _tasks_version(tasks), period_days)
+            cached = _REPORT_CACHE.get(cache_key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
+        report = self._build_report(tasks, period_days, now or now_brazil())
+        if cache_key is not None:
+            _REPORT_CACHE.set(cache_key, copy.deepcopy(report))
+        return report
+
+    def _build_report(self, tasks: List[Task], period_days: int, now: datetime) -> Dict[str, Any]:
         period_start = now - timedelta(days=period_days)
+        if not tasks:
+            return self._empty_report(period_start, now)
+
+        stats = self._collect(tasks, period_start, now)
 
         return {
-            "summary": self.get_summary_stats(tasks),
-            "completion": self.get_completion_stats(tasks, period_start),
-            "priority_distribution": self.get_priority_distribution(tasks),
-            "status_distribution": self.get_status_distribution(tasks),
-            "time_analysis": self.get_time_analysis(tasks),
-            "productivity": self.get_productivity_metrics(tasks, period_start),
-            "trends": self.get_trends(tasks, period_days),
+            "summary": self._format_summary(stats),
+            "completion": self._format_completion(stats),
+            "priority_distribution": self._format_priority_distribution(stats),
+            "status_distribution": self._format_status_distribution(stats),
+            "time_analysis": self._format_time_analysis(stats),
+            "productivity": self._format_productivity(stats),
+            "trends": self._format_trends(stats),
             "tags_analysis": self.get_tags_analysis(tasks),
-            "overdue_analysis": self.get_overdue_analysis(tasks),
+            "overdue_analysis": self._format_overdue(stats),
             "project_distribution": self.get_project_distribution(tasks)
         }
 
+    @staticmethod
+    def _empty_report(period_start: datetime, now: datetime) -> Dict[str, Any]:
+        report = copy.deepcopy(_EMPTY_REPORT_SECTIONS)
+        report["trends"] = {
+            "daily_trends": [
+                {"date": day.isoformat(), "created": 0, "completed": 0}
+                for day in _trend_days(period_start, now)
+            ]
+        }
+        return report
+
+    def _collect(
+        self,
+        tasks: List[Task],
+        period_start: datetime,
+        now: datetime
+    ) -> _ReportStats:
+        """Percorre as tarefas uma única vez acumulando os dados de todas as seções"""
+        # Acumuladores em variáveis locais: o laço roda uma vez por tarefa e
+        # evita atribuições de atributo em cada iteração
+        status_counts = [0] * len(_STATUS_KEYS)
+        priority_counts = [0] * len(_PRIORITY_KEYS)
+        completion_hours_total = 0.0
+        completion_hours_count = 0
+        overdue_by_priority = defaultdict(int)
+        completed_in_period = on_time = late = 0
+        due_today = due_week = 0
+        tasks_with_estimate = total_estimated = active_estimated = 0
+        created_in_period = completed_of_created = 0
+        overdue_count = overdue_days_sum = overdue_days_max = 0
+
+        today = now.date()
+        week_end = (now + timedelta(days=7)).date()
+        trend_days = _trend_days(period_start, now)
+        day_index = {day: index for index, day in enumerate(trend_days)}
+        created_by_day = [0] * len(trend_days)
+        completed_by_day = [0] * len(trend_days)
+        status_codes = _STATUS_CODE
+        priority_codes = _PRIORITY_CODE
+
+        for task in tasks:
+            status = task.status
+            code = status_codes.get(status)
+            if code is None:
+                code = get_status_code(status)
+            done = code == _DONE_CODE
+            active = code < _DONE_CODE
+
+            status_counts[code] += 1
+            if active:
+                priority_code = priority_codes.get(task.priority)
+                if priority_code is not None:
+                    priority_counts[priority_code] += 1
+
+            created_at = task.created_at
+            completed_at = task.completed_at
+            due_date = task.due_date
+
+            if done and completed_at:
+                if completed_at >= period_start:
+                    completed_in_period += 1
+                    if created_at:
+                        completion_hours_total += (completed_at - created_at).total_seconds() / 3600
+                        completion_hours_count += 1
+                    if due_date:
+                        if completed_at <= due_date:
+                            on_time += 1
+                        else:
+                            late += 1
+                index = day_index.get(completed_at.date())
+                if index is not None:
+                    completed_by_day[index] += 1
+
+            if due_date and active:
+                if due_date < now:
+                    days = (now - due_date).days
+                    overdue_count += 1
+                    overdue_days_sum += days
+                    if days > overdue_days_max:
+                        overdue_days_max = days
+                    overdue_by_priority[task.priority] += 1
+                due_day = due_date.date()
+                if due_day == today:
+                    due_today += 1
+                elif today < due_day <= week_end:
+                    due_week += 1
+
+            estimated = task.estimated_duration
+            if estimated:
+                tasks_with_estimate += 1
+                total_estimated += estimated
+                if active:
+                    active_estimated += estimated
+
+            if created_at:
+                if created_at >= period_start:
+                    created_in_period += 1
+                    if done and completed_at:
+                        completed_of_created += 1
+                index = day_index.get(created_at.date())
+                if index is not None:
+                    created_by_day[index] += 1
+
+        return _ReportStats(
+            now=now,
+            period_start=period_start,
+            total=len(tasks),
+            status_counts=status_counts,
+            priority_counts=priority_counts,
+            completed_in_period=completed_in_period,
+            completion_hours_total=completion_hours_total,
+            completion_hours_count=completion_hours_count,
+            on_time=on_time,
+            late=late,
+            due_today=due_today,
+            due_week=due_week,
+            total_estimated_minutes=total_estimated,
+            active_estimated_minutes=active_estimated,
+            tasks_with_estimate=tasks_with_estimate,
+            created_in_period=created_in_period,
+            completed_of_created=completed_of_created,
+            created_by_day=created_by_day,
+            completed_by_day=completed_by_day,
+            overdue_count=overdue_count,
+            overdue_days_sum=overdue_days_sum,
+            overdue_days_max=overdue_days_max,
+            overdue_by_priority=overdue_by_priority,
+        )
+
+    def _collect_now(
+        self,
+        tasks: List[Task],
+        period_start: Optional[datetime] = None,
+        now: Optional[datetime] = None
+    ) -> _ReportStats:
+        now = now or now_brazil()
+        return self._collect(tasks, period_start or now, now)
+
     def get_summary_stats(self, tasks: List[Task]) -> Dict[str, Any]:
         """Estatísticas resumidas gerais"""
-        total = len(tasks)
+        return self._format_summary(self._collect_now(tasks))
+
+    def get_completion_stats(
+        self,
+        tasks: List[Task],
+        period_start: datetime
+    ) -> Dict[str, Any]:
+        """Estatísticas de conclusão de tarefas"""
+        return self._format_completion(self._collect_now(tasks, period_start))
+
+    def get_priority_distribution(self, tasks: List[Task]) -> Dict[str, int]:
+        """Distribuição de tarefas por prioridade"""
+        return self._format_priority_distribution(self._collect_now(tasks))
+
+    def get_status_distribution(self, tasks: List[Task]) -> Dict[str, int]:
+        """Distribuição de tarefas por status"""
+        return self._format_status_distribution(self._collect_now(tasks))
+
+    def get_time_analysis(self, tasks: List[Task], now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Análise de prazos e tempo estimado"""
+        return self._format_time_analysis(self._collect_now(tasks, now=now))
+
+    def get_productivity_metrics(
+        self,
+        tasks: List[Task],
+        period_start: datetime,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Métricas de produtividade"""
+        return self._format_productivity(self._collect_now(tasks, period_start, now))
+
+    def get_trends(
+        self,
+        tasks: List[Task],
+        days: int = 30,
+        now: Optional[datetime] = None
+    ) -> Dict[str, List[Dict]]:
+        """Tendências ao longo do tempo"""
+        now = now or now_brazil()
+        return self._format_trends(self._collect(tasks, now - timedelta(days=days), now))
+
+    def get_overdue_analysis(self, tasks: List[Task], now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Análise detalhada de tarefas atrasadas"""
+        return self._format_overdue(self._collect_now(tasks, now=now))
+
+    @staticmethod
+    def _format_summary(stats: _ReportStats) -> Dict[str, Any]:
+        total = stats.total
         if total == 0:
             return {
                 "total_tasks": 0,
@@ -76,31 +436,18 @@ class AnalyticsService:
                 "completion_rate": 0.0
             }
 
-        active = len([t for t in tasks if is_active(t.status)])
-        completed = len([t for t in tasks if is_done(t.status)])
-        cancelled = len([t for t in tasks if is_cancelled(t.status)])
-
         return {
             "total_tasks": total,
-            "active_tasks": active,
-            "completed_tasks": completed,
-            "cancelled_tasks": cancelled,
-            "completion_rate": round((completed / total) * 100, 2) if total > 0 else 0.0,
-            "cancellation_rate": round((cancelled / total) * 100, 2) if total > 0 else 0.0
+            "active_tasks": stats.active,
+            "completed_tasks": stats.completed,
+            "cancelled_tasks": stats.cancelled,
+            "completion_rate": _pct(stats.completed, total),
+            "cancellation_rate": _pct(stats.cancelled, total)
         }
 
-    def get_completion_stats(
-        self,
-        tasks: List[Task],
-        period_start: datetime
-    ) -> Dict[str, Any]:
-        """Estatísticas de conclusão de tarefas"""
-        completed_tasks = [
-            t for t in tasks
-            if is_done(t.status) and t.completed_at and t.completed_at >= period_start
-        ]
-
-        if not completed_tasks:
+    @staticmethod
+    def _format_completion(stats: _ReportStats) -> Dict[str, Any]:
+        if not stats.completed_in_period:
             return {
                 "completed_in_period": 0,
                 "avg_completion_time_hours": None,
@@ -109,150 +456,101 @@ class AnalyticsService:
                 "on_time_rate": 0.0
             }
 
-        completion_times = []
-        on_time = 0
-        late = 0
-
-        for task in completed_tasks:
-            if task.created_at and task.completed_at:
-                delta = task.completed_at - task.created_at
-                completion_times.append(delta.total_seconds() / 3600)
-
-            if task.due_date:
-                if task.completed_at <= task.due_date:
-                    on_time += 1
-                else:
-                    late += 1
-
-        avg_time = sum(completion_times) / len(completion_times) if completion_times else None
+        on_time = stats.on_time
+        late = stats.late
+        hours_count = stats.completion_hours_count
+        avg_time = stats.completion_hours_total / hours_count if hours_count else None
 
         return {
-            "completed_in_period": len(completed_tasks),
+            "completed_in_period": stats.completed_in_period,
             "avg_completion_time_hours": round(avg_time, 2) if avg_time else None,
             "completed_on_time": on_time,
             "completed_late": late,
-            "on_time_rate": round((on_time / (on_time + late)) * 100, 2) if (on_time + late) > 0 else 0.0
-        }
-
-    def get_priority_distribution(self, tasks: List[Task]) -> Dict[str, int]:
-        """Distribuição de tarefas por prioridade"""
-        active_tasks = [t for t in tasks if is_active(t.status)]
-        priorities = Counter(t.priority for t in active_tasks)
-
-        return {
-            "urgente": priorities.get("urgente", 0) + priorities.get("urgent", 0),
-            "alta": priorities.get("alta", 0) + priorities.get("high", 0),
-            "media": priorities.get("media", 0) + priorities.get("medium", 0),
-            "baixa": priorities.get("baixa", 0) + priorities.get("low", 0)
+            "on_time_rate": _pct(on_time, on_time + late)
         }
 
-    def get_status_distribution(self, tasks: List[Task]) -> Dict[str, int]:
-        """Distribuição de tarefas por status"""
-        statuses = Counter(t.status for t in tasks)
+    @staticmethod
+    def _format_priority_distribution(stats: _ReportStats) -> Dict[str, int]:
+        return dict(zip(_PRIORITY_KEYS, stats.priority_counts))
 
-        return {
-            "pending": statuses.get("pending", 0),
-            "todo": statuses.get("todo", 0),
-            "in_progress": statuses.get("in_progress", 0),
-            "done": statuses.get("done", 0),
-            "cancelled": statuses.get("cancelled", 0)
-        }
+    @staticmethod
+    def _format_status_distribution(stats: _ReportStats) -> Dict[str, int]:
+        return dict(zip(_STATUS_KEYS, stats.status_counts))
 
-    def get_time_analysis(self, tasks: List[Task]) -> Dict[str, Any]:
-        """Análise de prazos e tempo estimado"""
-        tasks_with_due = [t for t in tasks if t.due_date and is_active(t.status)]
-        tasks_with_estimate = [t for t in tasks if t.estimated_duration]
-
-        now = now_brazil()
-        overdue = len([t for t in tasks_with_due if t.due_date < now])
-        due_today = len([t for t in tasks_with_due if t.due_date.date() == now.date()])
-        due_week = len([
-            t for t in tasks_with_due
-            if now.date() < t.due_date.date() <= (now + timedelta(days=7)).date()
-        ])
-
-        total_estimated_minutes = sum(t.estimated_duration for t in tasks_with_estimate)
-        active_estimated = sum(
-            t.estimated_duration for t in tasks_with_estimate
-            if is_active(t.status)
-        )
+    @staticmethod
+    def _format_time_analysis(stats: _ReportStats) -> Dict[str, Any]:
+        total_estimated_minutes = stats.total_estimated_minutes
+        active_estimated = stats.active_estimated_minutes
 
         return {
-            "overdue_count": overdue,
-            "due_today_count": due_today,
-            "due_this_week_count": due_week,
+            "overdue_count": stats.overdue_count,
+            "due_today_count": stats.due_today,
+            "due_this_week_count": stats.due_week,
             "total_estimated_hours": round(total_estimated_minutes / 60, 2) if total_estimated_minutes else 0,
             "active_estimated_hours": round(active_estimated / 60, 2) if active_estimated else 0,
-            "tasks_with_estimate": len(tasks_with_estimate)
+            "tasks_with_estimate": stats.tasks_with_estimate
         }
 
-    def get_productivity_metrics(
-        self,
-        tasks: List[Task],
-        period_start: datetime
-    ) -> Dict[str, Any]:
-        """Métricas de produtividade"""
-        period_tasks = [t for t in tasks if t.created_at >= period_start]
-        completed_in_period = [
-            t for t in period_tasks
-            if is_done(t.status) and t.completed_at
-        ]
-
-        now = now_brazil()
-        days_in_period = max((now - period_start).days, 1)
+    @staticmethod
+    def _format_productivity(stats: _ReportStats) -> Dict[str, Any]:
+        created = stats.created_in_period
+        completed = stats.completed_of_created
+        days_in_period = max((stats.now - stats.period_start).days, 1)
 
         return {
-            "tasks_created_in_period": len(period_tasks),
-            "tasks_completed_in_period": len(completed_in_period),
-            "avg_tasks_created_per_day": round(len(period_tasks) / days_in_period, 2),
-            "avg_tasks_completed_per_day": round(len(completed_in_period) / days_in_period, 2),
-            "completion_velocity": round(
-                (len(completed_in_period) / len(period_tasks)) * 100, 2
-            ) if period_tasks else 0.0
+            "tasks_created_in_period": created,
+            "tasks_completed_in_period": completed,
+            "avg_tasks_created_per_day": round(created / days_in_period, 2),
+            "avg_tasks_completed_per_day": round(completed / days_in_period, 2),
+            "completion_velocity": _pct(completed, created)
         }
 
-    def get_trends(self, tasks: List[Task], days: int = 30) -> Dict[str, List[Dict]]:
-        """Tendências ao longo do tempo"""
-        now = now_brazil()
-        start_date = (now - timedelta(days=days)).date()
+    @staticmethod
+    def _format_trends(stats: _ReportStats) -> Dict[str, List[Dict]]:
+        trends = [
+            {
+                "date": day.isoformat(),
+                "created": created,
+                "completed": completed
+            }
+            for day, created, completed in zip(
+                _trend_days(stats.period_start, stats.now),
+                stats.created_by_day,
+                stats.completed_by_day
+            )
+        ]
 
-        created_by_day = defaultdict(int)
-        completed_by_day = defaultdict(int)
+        return {"daily_trends": trends}
 
-        for task in tasks:
-            if task.created_at and task.created_at.date() >= start_date:
-                created_by_day[task.created_at.date()] += 1
-
-            if is_done(task.status) and task.completed_at and task.completed_at.date() >= start_date:
-                completed_by_day[task.completed_at.date()] += 1
-
-        trends = []
-        current_date = start_date
-        while current_date <= now.date():
-            trends.append({
-                "date": current_date.isoformat(),
-                "created": created_by_day.get(current_date, 0),
-                "completed": completed_by_day.get(current_date, 0)
-            })
-            current_date += timedelta(days=1)
+    @staticmethod
+    def _format_overdue(stats: _ReportStats) -> Dict[str, Any]:
+        overdue_count = stats.overdue_count
+        if not overdue_count:
+            return {
+                "total_overdue": 0,
+                "avg_days_overdue": 0,
+                "max_days_overdue": 0,
+                "overdue_by_priority": {}
+            }
 
-        return {"daily_trends": trends}
+        return {
+            "total_overdue": overdue_count,
+            "avg_days_overdue": round(stats.overdue_days_sum / overdue_count, 1),
+            "max_days_overdue": stats.overdue_days_max,
+            "overdue_by_priority": dict(stats.overdue_by_priority)
+        }
 
     def get_tags_analysis(self, tasks: List[Task]) -> Dict[str, Any]:
         """Análise de tags utilizadas"""
-        all_tags = []
-        for task in tasks:
-            if task.tags:
-                all_tags.extend(task.tags)
+        tag_counts = Counter(chain.from_iterable(t.tags for t in tasks if t.tags))
 
-        if not all_tags:
+        if not tag_counts:
             return {
                 "total_unique_tags": 0,
                 "most_used_tags": [],
                 "tags_usage": {}
             }
 
-        tag_counts = Counter(all_tags)
         most_used = tag_counts.most_common(10)
 
         return {
@@ -264,50 +562,19 @@ class AnalyticsService:
             "tags_usage": dict(tag_counts)
         }
 
-    def get_overdue_analysis(self, tasks: List[Task]) -> Dict[str, Any]:
-        """Análise detalhada de tarefas atrasadas"""
-        now = now_brazil()
-        overdue_tasks = [
-            t for t in tasks
-            if t.due_date
-            and t.due_date < now
-            and is_active(t.status)
-        ]
-
-        if not overdue_tasks:
-            return {
-                "total_overdue": 0,
-                "avg_days_overdue": 0,
-                "max_days_overdue": 0,
-                "overdue_by_priority": {}
-            }
-
-        days_overdue = [(now - t.due_date).days for t in overdue_tasks]
-
-        by_priority = defaultdict(int)
-        for task in overdue_tasks:
-            by_priority[task.priority] += 1
-
-        return {
-            "total_overdue": len(overdue_tasks),
-            "avg_days_overdue": round(sum(days_overdue) / len(days_overdue), 1),
-            "max_days_overdue": max(days_overdue),
-            "overdue_by_priority": dict(by_priority)
-        }
-
     def get_project_distribution(self, tasks: List[Task]) -> Dict[str, Any]:
         """Distribuição de tarefas por projeto"""
-        with_project = len([t for t in tasks if t.project_id])
-        without_project = len([t for t in tasks if not t.project_id])
+        # Conta pelo próprio id e converte para string só uma vez por projeto
+        counts = Counter(t.project_id for t in tasks if t.project_id)
+        with_project = sum(counts.values())
 
         projects = defaultdict(int)
-        for task in tasks:
-            if task.project_id:
-                projects[str(task.project_id)] += 1
+        for project_id, count in counts.items():
+            projects[str(project_id)] += count
 
         return {
             "tasks_with_project": with_project,
-            "tasks_without_project": without_project,
+            "tasks_without_project": len(tasks) - with_project,
             "unique_projects": len(projects),
             "tasks_per_project": dict(projects)
         }
@@ -1,4 +1,7 @@
+import asyncio
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 from uuid import UUID
 
@@ -7,6 +10,24 @@ from passlib.context import CryptContext
 
 from domain.entities.user import User
 from domain.repositories.user_repository import UserRepository
+from infrastructure.cache.memory_cache import LRUCache
+
+# Custo padrão do bcrypt no passlib; hashes antigos carregam o próprio custo e seguem válidos
+DEFAULT_BCRYPT_ROUNDS = 12
+
+# Payloads de tokens já verificados, por (chave, algoritmo, token); valem até o "exp" do token
+_TOKEN_CACHE = LRUCache(max_size=4096, ttl=300)
+
+
+@lru_cache(maxsize=None)
+def _get_pwd_context(bcrypt_rounds: int) -> CryptContext:
+    """CryptContext compartilhado por processo, criado uma única vez por custo"""
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        bcrypt__ident="2b",
+    )
 
 
 class AuthService:
@@ -17,13 +38,14 @@ class AuthService:
         algorithm: str = "HS256",
         access_token_expire_minutes: int = 30,
         refresh_token_expire_days: int = 7,
+        bcrypt_rounds: int = DEFAULT_BCRYPT_ROUNDS,
     ):
         self.user_repository = user_repository
         self.secret_key = secret_key
         self.algorithm = algorithm
         self.access_token_expire_minutes = access_token_expire_minutes
         self.refresh_token_expire_days = refresh_token_expire_days
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.pwd_context = _get_pwd_context(bcrypt_rounds)
 
     def hash_password(self, password: str) -> str:
         return self.pwd_context.hash(password)
@@ -52,20 +74,28 @@ class AuthService:
         return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
 
     def verify_token(self, token: str, token_type: str = "access") -> Optional[dict]:
-        try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            if payload.get("type") != token_type:
+        cache_key = (self.secret_key, self.algorithm, token)
+        payload = _TOKEN_CACHE.get(cache_key)
+        if payload is None or payload["exp"] <= time.time():
+            try:
+                payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            except JWTError:
+                _TOKEN_CACHE.delete(cache_key)
                 return None
-            return payload
-        except JWTError:
+            if "exp" in payload:
+                _TOKEN_CACHE.set(cache_key, payload)
+
+        if payload.get("type") != token_type:
             return None
+        return dict(payload)
 
     async def register_user(self, email: str, password: str, full_name: Optional[str] = None) -> User:
         existing_user = await self.user_repository.get_by_email(email)
         if existing_user:
             raise ValueError("Email already registered")
 
-        hashed_password = self.hash_password(password)
+        # bcrypt é CPU-bound; roda fora do event loop para não travar outras requisições
+        hashed_password = await asyncio.to_thread(self.hash_password, password)
         user = User(
             email=email,
             hashed_password=hashed_password,
@@ -77,7 +107,7 @@ class AuthService:
         user = await self.user_repository.get_by_email(email)
         if not user:
             return None
-        if not self.verify_password(password, user.hashed_password):
+        if not await asyncio.to_thread(self.verify_password, password, user.hashed_password):
             return None
         if not user.is_active:
             return None
@@ -1,19 +1,638 @@
 """
 Chat Assistant Service - AI Agent for autonomous task management
 """
+import json
 import logging
-import random
 import re
-from typing import Any, Optional, List, Dict, Callable, Awaitable
-from datetime import datetime, timedelta, timezone
+import unicodedata
+from collections import Counter, deque
+from itertools import islice
+from operator import attrgetter
+from dataclasses import dataclass, field
+from enum import Enum
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Optional, List, Dict, Mapping, Tuple, Callable, Awaitable, NamedTuple
+from datetime import date, datetime, time, timedelta, timezone
 from uuid import UUID
 
 from domain.entities.task import Task
+from domain.value_objects.priority import Priority
+from domain.value_objects.task_status import TaskStatus
 from domain.utils.datetime_utils import now_brazil, to_brazil_tz, BRAZIL_TZ
+from infrastructure.cache.memory_cache import LRUCache
 from infrastructure.gpt.openai_adapter import OpenAIAdapter
 
 logger = logging.getLogger("sgti")
 
+_INTENT_SYSTEM_PROMPT = """Você é um classificador de intenções para um sistema de gerenciamento de tarefas.
+
+Analise a mensagem do usuário CONSIDERANDO O CONTEXTO DA CONVERSA e retorne APENAS UMA das seguintes intenções:
+
+INTENÇÕES DISPONÍVEIS:
+- greeting: Saudações como "oi", "olá", "bom dia", "boa tarde"
+- thanks: Agradecimentos como "obrigado", "valeu", "thanks"
+- about_system: Perguntas sobre o sistema, como funciona, o que faz, funcionalidades
+- help: Pedidos de ajuda ou comandos disponíveis
+- list_tasks: Listar, ver, mostrar tarefas (hoje, pendentes, atrasadas, etc.)
+- create_task: Criar/adicionar tarefa OU descrever uma tarefa para criar (título, descrição, horário)
+- complete_task: Concluir, finalizar, terminar uma tarefa
+- delete_task: Deletar, remover, excluir uma tarefa
+- update_task: Atualizar, modificar, editar uma tarefa
+- suggest_next_task: Perguntar qual tarefa fazer agora, por onde começar, priorização
+- task_status: Ver progresso, status geral, produtividade, resumo
+- general: Qualquer outra coisa que não se encaixe acima
+
+REGRAS IMPORTANTES:
+1. Se a ÚLTIMA mensagem do assistente PEDIU para descrever uma tarefa, e o usuário responde com algo que parece uma tarefa (ex: "reunião com cliente às 14h") → create_task
+2. Se o usuário menciona horário, data ou atividade que parece uma tarefa → provavelmente create_task
+3. Se o usuário quer saber SOBRE o sistema/app/assistente em si → about_system
+4. Se o usuário quer ver/listar SUAS tarefas existentes → list_tasks
+5. Se pergunta "o que fazer agora" ou quer recomendação → suggest_next_task
+
+Responda APENAS com a intenção, nada mais."""
+
+# Prompt de sistema das perguntas livres; fica fixo e vai primeiro na requisição para
+# que o prefixo se repita entre chamadas (cache de prompt do provedor)
+_GENERAL_SYSTEM_PROMPT = """Você é um assistente especializado em gerenciamento de tarefas. Suas responsabilidades são LIMITADAS a:
+
+1. Responder perguntas sobre as tarefas do usuário com base nos dados fornecidos
+2. Fornecer insights sobre produtividade e organização de tarefas
+3. Sugerir prioridades baseadas nas tarefas existentes
+4. Ajudar a entender status e progresso das tarefas
+
+REGRAS CRÍTICAS:
+- SEMPRE use os dados REAIS das tarefas fornecidas - liste tarefas específicas com títulos, status e prazos
+- NUNCA invente ou sugira tarefas que não existem na lista fornecida
+- Quando perguntarem sobre tarefas (hoje, amanhã, pendentes, etc.), LISTE as tarefas reais com detalhes
+- Se não houver tarefas para o período/filtro solicitado, informe claramente
+- Seja específico e factual - cite títulos e detalhes das tarefas
+- Seja conciso mas completo (máximo 5-6 linhas)
+- Responda SEMPRE em português brasileiro
+- NÃO use emojis
+- NÃO responda perguntas não relacionadas a tarefas ou produtividade
+
+EXEMPLOS DE RESPOSTAS CORRETAS:
+
+Pergunta: "O que tenho para hoje?"
+Resposta: "Você tem 2 tarefas para hoje:
+- Reunião com cliente (Status: todo, Prioridade: high)
+- Revisar código (Status: in_progress, Prioridade: medium)"
+
+Pergunta: "Quais são minhas tarefas urgentes?"
+Resposta: "Você tem 1 tarefa urgente:
+- Corrigir bug em produção (Status: todo, Prazo: hoje às 18h)"
+
+Se perguntarem algo fora do escopo, responda: "Só posso ajudar com questões relacionadas às suas tarefas. Digite 'ajuda' para ver os comandos."
+"""
+
+_VALID_INTENTS = frozenset({
+    "greeting", "thanks", "about_system", "help", "list_tasks",
+    "create_task", "complete_task", "delete_task", "update_task",
+    "suggest_next_task", "task_status", "general",
+})
+
+# Intenções classificadas pelo GPT, por (mensagem normalizada, contexto da conversa)
+_INTENT_CACHE = LRUCache(max_size=4096, ttl=3600)
+
+# Dados extraídos pelo GPT para criar tarefas, por (mensagem normalizada, data de hoje);
+# a data na chave invalida a entrada na virada do dia ("amanhã" muda de valor)
+_EXTRACT_CACHE = LRUCache(max_size=512, ttl=3600)
+
+# Respostas do GPT a perguntas livres autocontidas, por (usuário, mensagem normalizada,
+# data de hoje, assinatura das tarefas); qualquer tarefa criada, alterada ou removida muda
+# a assinatura. Essas perguntas vão ao GPT sem o histórico, então a resposta não depende dele
+_ANSWER_CACHE = LRUCache(max_size=256, ttl=3600)
+
+# Pergunta autocontida sobre as tarefas ("o que tenho para hoje?"), comparada sem acentos:
+# cita tarefas ou um período e não continua a conversa ("e amanhã?", "e essa?")
+_STANDALONE_TOPIC_RE = re.compile(
+    r"\b(tarefas?|hoje|amanha|semana|pendentes?|atrasad[ao]s?|prazos?|urgentes?|prioridades?)\b"
+)
+_FOLLOW_UP_RE = re.compile(
+    r"^(e|mas|entao)\b|\b(isso|essa|esse|essas|esses|ela|ele|elas|eles|dela|dele|delas|deles|anterior)\b"
+)
+
+
+def _task_signature(tasks: List[Task]) -> str:
+    """Hash dos ids e updated_at das tarefas, independente da ordem"""
+    return LRUCache.generate_hash("|".join(sorted(f"{t.id}:{t.updated_at.isoformat()}" for t in tasks)))
+
+
+def _fold_accents(text: str) -> str:
+    """Remove acentos (NFKD + ASCII) para comparar mensagens com as chaves de intenção"""
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+
+
+_PRIORITY_ORDER: Dict[Priority, int] = {
+    Priority.URGENTE: 0, Priority.URGENT: 0,
+    Priority.ALTA: 1, Priority.HIGH: 1,
+    Priority.MEDIA: 2, Priority.MEDIUM: 2,
+    Priority.BAIXA: 3, Priority.LOW: 3,
+}
+
+_PRIORITY_LABEL: Dict[Priority, str] = {
+    Priority.URGENTE: "🚨 Urgente", Priority.URGENT: "🚨 Urgente",
+    Priority.ALTA: "🔴 Alta", Priority.HIGH: "🔴 Alta",
+    Priority.MEDIA: "🟡 Média", Priority.MEDIUM: "🟡 Média",
+    Priority.BAIXA: "🟢 Baixa", Priority.LOW: "🟢 Baixa",
+}
+
+_PRIORITY_TEXT: Dict[Priority, str] = {
+    Priority.URGENTE: "Urgente", Priority.URGENT: "Urgente",
+    Priority.ALTA: "Alta", Priority.HIGH: "Alta",
+    Priority.MEDIA: "Média", Priority.MEDIUM: "Média",
+    Priority.BAIXA: "Baixa", Priority.LOW: "Baixa",
+}
+
+_STATUS_LABEL: Dict[TaskStatus, str] = {
+    TaskStatus.TODO: "A Fazer",
+    TaskStatus.PENDING: "Pendente",
+    TaskStatus.IN_PROGRESS: "Em Progresso",
+    TaskStatus.DONE: "Concluída",
+    TaskStatus.CANCELLED: "Cancelada",
+}
+
+_STATUS_TEXT: Dict[TaskStatus, str] = {
+    TaskStatus.TODO: "A Fazer",
+    TaskStatus.PENDING: "A Fazer",
+    TaskStatus.IN_PROGRESS: "Em Progresso",
+    TaskStatus.DONE: "Concluída",
+    TaskStatus.CANCELLED: "Cancelada",
+}
+
+# Rótulos da listagem de tarefas, por valor normalizado
+_LIST_STATUS_LABEL: Dict[str, str] = {
+    "pending": "PENDENTE",
+    "todo": "A FAZER",
+    "in_progress": "EM PROGRESSO",
+    "done": "CONCLUÍDA",
+    "cancelled": "CANCELADA",
+}
+
+_LIST_PRIORITY_LABEL: Dict[str, str] = {
+    "urgente": "URGENTE", "urgent": "URGENTE",
+    "alta": "ALTA", "high": "ALTA",
+    "media": "MÉDIA", "medium": "MÉDIA",
+    "baixa": "BAIXA", "low": "BAIXA",
+}
+
+# Chave de ordenação para tarefas sem data
+_NO_DATE = datetime.max.replace(tzinfo=timezone.utc)
+_NO_DUE_TS = float("inf")
+
+# Membros do enum (ou seus valores) -> valor normalizado, sem isinstance por tarefa
+_STATUS_VALUES: Dict[TaskStatus, str] = {status: status.value for status in TaskStatus}
+_PRIORITY_VALUES: Dict[Priority, str] = {priority: priority.value for priority in Priority}
+
+_CLOSED_STATUSES = frozenset({"done", "concluida", "cancelled", "cancelada"})
+_URGENT_PRIORITIES = frozenset({"urgente", "urgent"})
+_HIGH_PRIORITIES = frozenset({"alta", "high"})
+
+# Palavras da mensagem ignoradas ao procurar a tarefa pelo título
+_COMPLETE_STOPWORDS = frozenset({
+    "concluir", "finalizar", "terminar", "completar", "complete", "finish", "done", "feito",
+    "terminei", "tarefa", "tarefas", "marcar", "como", "concluída", "feita",
+})
+_UPDATE_STOPWORDS = frozenset({"atualizar", "modificar", "mudar", "update", "modify", "change", "para"})
+_DELETE_STOPWORDS = frozenset({"deletar", "remover", "excluir", "delete", "remove", "apagar"})
+
+
+def _normalize_enum(value) -> str:
+    """Valor normalizado (minúsculo) de um enum ou string de status/prioridade"""
+    return value.value if isinstance(value, Enum) else str(value).lower()
+
+
+def _format_due_tag(due_date_brazil: Optional[datetime], now: datetime) -> str:
+    """
+    Marcador de prazo da listagem ("[HOJE 14:00]", "[ATRASADA 2d]"...) para um prazo já em Brasília.
+
+    Os campos são formatados direto no f-string, sem strftime; só há campos
+    numéricos, então o resultado não depende do locale, como antes.
+    """
+    if not due_date_brazil:
+        return ""
+    date_diff = (due_date_brazil.date() - now.date()).days
+
+    if date_diff < 0:
+        return f" [ATRASADA {abs(date_diff)}d]"
+    elif date_diff == 0:
+        return f" [HOJE {due_date_brazil.hour:02d}:{due_date_brazil.minute:02d}]"
+    elif date_diff == 1:
+        return f" [AMANHÃ {due_date_brazil.hour:02d}:{due_date_brazil.minute:02d}]"
+    else:
+        return (
+            f" [{due_date_brazil.day:02d}/{due_date_brazil.month:02d}"
+            f" {due_date_brazil.hour:02d}:{due_date_brazil.minute:02d}]"
+        )
+
+
+# Linha de tarefa enviada ao GPT; "prazo" é vazio para tarefas sem data
+_LINE_TMPL = "• {title} | Status: {status} | Prioridade: {priority}{prazo}"
+_PRAZO_TMPL = " | Prazo: {due:%d/%m/%Y %H:%M}{tag}"
+
+# Marcador de prazo das linhas de tarefa enviadas ao GPT, por dias até o prazo
+_PROMPT_DUE_TAGS: Dict[int, str] = {0: " [HOJE]", 1: " [AMANHÃ]"}
+
+
+def _prompt_task_line(task: Task, status_pt: str, priority_pt: str, today: date) -> str:
+    """Linha de uma tarefa no prompt do GPT, com prazo em Brasília e marcador relativo a hoje"""
+    prazo = ""
+    if task.due_date:
+        due = to_brazil_tz(task.due_date)
+        days = (due.date() - today).days
+        tag = " [ATRASADA]" if days < 0 else _PROMPT_DUE_TAGS.get(days, "")
+        prazo = _PRAZO_TMPL.format(due=due, tag=tag)
+    return _LINE_TMPL.format(title=task.title, status=status_pt, priority=priority_pt, prazo=prazo)
+
+
+class _HistoryMessage(NamedTuple):
+    """Mensagem do histórico do chat (mais leve que um dict por entrada)"""
+    role: str
+    content: str
+    timestamp: str
+
+
+def _history_within_budget(messages: List[_HistoryMessage], budget: int) -> List[str]:
+    """
+    Linhas "ROLE: conteúdo" das mensagens mais recentes cujo conteúdo soma até `budget` caracteres.
+
+    Mensagens curtas entram inteiras e deixam espaço para as longas; a mais antiga
+    que não cabe entra só com o final e encerra a lista.
+    """
+    lines: List[str] = []
+    for msg in reversed(messages):
+        content = msg.content
+        if len(content) > budget:
+            if budget:
+                lines.append(f"{msg.role.upper()}: {content[-budget:]}")
+            break
+        budget -= len(content)
+        lines.append(f"{msg.role.upper()}: {content}")
+    lines.reverse()
+    return lines
+
+
+@dataclass(slots=True)
+class _NormalizedTask:
+    """Tarefa com status, prioridade, prazo (em Brasília) e título em minúsculas calculados uma única vez por mensagem"""
+    task: Task
+    status: str
+    priority: str
+    due_local: Optional[datetime]
+    title_lower: str
+
+
+def _normalize_tasks(tasks: List[Task]) -> List[_NormalizedTask]:
+    """Normaliza status, prioridade, prazo e título de cada tarefa para reuso pelos handlers"""
+    return [
+        _NormalizedTask(
+            t,
+            _STATUS_VALUES.get(t.status) or _normalize_enum(t.status),
+            _PRIORITY_VALUES.get(t.priority) or _normalize_enum(t.priority),
+            to_brazil_tz(t.due_date) if t.due_date else None,
+            t.title.lower(),
+        )
+        for t in tasks
+    ]
+
+
+def _match_titles(entries: List[_NormalizedTask], keywords: List[str]) -> List[Task]:
+    """Tarefas cujo título contém alguma das palavras, com uma única varredura por título"""
+    if len(keywords) == 1:
+        keyword = keywords[0]
+        return [n.task for n in entries if keyword in n.title_lower]
+    search = re.compile("|".join(map(re.escape, keywords))).search
+    return [n.task for n in entries if search(n.title_lower)]
+
+
+def _nth_pending_task(entries: List[_NormalizedTask], index: int) -> Optional[Task]:
+    """N-ésima tarefa não concluída (base 0), sem montar a lista de pendentes"""
+    if index < 0:
+        return None
+    pending = (n.task for n in entries if n.status != "done")
+    return next(islice(pending, index, None), None)
+
+
+class _ListBounds(NamedTuple):
+    """Referências de data usadas pelos filtros da listagem, calculadas uma vez"""
+    now: datetime
+    today: date
+    tomorrow: date
+    week_end: datetime
+
+
+def _is_due_today(n: _NormalizedTask, bounds: _ListBounds) -> bool:
+    return n.due_local is not None and n.due_local.date() == bounds.today
+
+
+def _is_due_tomorrow(n: _NormalizedTask, bounds: _ListBounds) -> bool:
+    return n.due_local is not None and n.due_local.date() == bounds.tomorrow
+
+
+def _is_due_this_week(n: _NormalizedTask, bounds: _ListBounds) -> bool:
+    return n.due_local is not None and n.due_local <= bounds.week_end
+
+
+def _is_overdue(n: _NormalizedTask, bounds: _ListBounds) -> bool:
+    return n.due_local is not None and n.due_local < bounds.now and n.status != "done"
+
+
+def _is_pending(n: _NormalizedTask, bounds: _ListBounds) -> bool:
+    return n.status in ("pending", "todo")
+
+
+def _is_in_progress(n: _NormalizedTask, bounds: _ListBounds) -> bool:
+    return n.status == "in_progress"
+
+
+def _is_done(n: _NormalizedTask, bounds: _ListBounds) -> bool:
+    return n.status == "done"
+
+
+def _is_not_done(n: _NormalizedTask, bounds: _ListBounds) -> bool:
+    return n.status != "done"
+
+
+def _is_high_priority(n: _NormalizedTask, bounds: _ListBounds) -> bool:
+    return n.priority in _HIGH_PRIORITIES
+
+
+def _is_urgent(n: _NormalizedTask, bounds: _ListBounds) -> bool:
+    return n.priority in _URGENT_PRIORITIES
+
+
+# Filtro da listagem (None = sem filtro na mensagem) -> predicado
+_LIST_FILTER_PREDICATES: Dict[Optional[str], Callable[[_NormalizedTask, _ListBounds], bool]] = {
+    None: _is_not_done,
+    "today": _is_due_today,
+    "tomorrow": _is_due_tomorrow,
+    "week": _is_due_this_week,
+    "overdue": _is_overdue,
+    "pending": _is_pending,
+    "in_progress": _is_in_progress,
+    "done": _is_done,
+    "high": _is_high_priority,
+    "urgent": _is_urgent,
+}
+
+
+# Confirmação de conclusão/exclusão: (mensagem, ação, ação do botão, rótulo do botão)
+_CONFIRM_TEMPLATES: Dict[str, Tuple[str, str, str, str]] = {
+    "complete": (
+        "✅ Marcar como concluída:\n\n📌 {title}\n\nConfirmar?",
+        "confirm_complete", "complete", "✅ Confirmar",
+    ),
+    "delete": (
+        "🗑️ Excluir tarefa:\n\n📌 {title}\n\n⚠️ Esta ação não pode ser desfeita. Confirmar?",
+        "confirm_delete", "delete", "🗑️ Excluir",
+    ),
+    "delete_by_name": (
+        "🗑️ Tem certeza que quer deletar a tarefa:\n\n📌 {title}\n\n⚠️ Essa ação não pode ser desfeita.",
+        "confirm_delete", "delete", "🗑️ Sim, deletar",
+    ),
+}
+
+
+def _build_confirm_response(kind: str, task_id: Any, task_title: str) -> Dict[str, Any]:
+    """Resposta que pede confirmação antes de concluir ou excluir uma tarefa"""
+    message, action, button_action, button_label = _CONFIRM_TEMPLATES[kind]
+    task_id = str(task_id)
+    return {
+        "message": message.format(title=task_title),
+        "action": action,
+        "data": {
+            "task_id": task_id,
+            "task_title": task_title
+        },
+        "requires_confirmation": True,
+        "action_buttons": [
+            {"label": button_label, "action": button_action, "data": {"task_id": task_id}},
+            {"label": "❌ Cancelar", "action": "cancel", "data": None}
+        ]
+    }
+
+
+class _JsonObjectScanner:
+    """Acompanha o stream do GPT e detecta quando o primeiro objeto JSON se fecha"""
+
+    def __init__(self):
+        self.buffer = ""
+        self._start = -1
+        self._end = -1
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> bool:
+        """Adiciona um trecho do stream; retorna True quando o objeto está completo"""
+        offset = len(self.buffer)
+        self.buffer += chunk
+        for i, ch in enumerate(chunk, offset):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif self._start == -1:
+                if ch == "{":
+                    self._start = i
+                    self._depth = 1
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._end = i + 1
+                    return True
+        return False
+
+    @property
+    def text(self) -> str:
+        """O objeto JSON completo ou, se ele não fechou, tudo o que foi recebido"""
+        if self._end == -1:
+            return self.buffer
+        return self.buffer[self._start:self._end]
+
+
+class _TaskView(NamedTuple):
+    """Tarefa com status, prioridade e prazo (sempre com timezone) já normalizados"""
+    task: Task
+    status: str
+    priority: str
+    due_date: Optional[datetime]
+    priority_rank: int
+    due_sort: float
+
+
+_GREETING_TEMPLATE = (
+    "{greeting}! 👋 Sou seu agente de tarefas.\n\n{summary}\n\n"
+    "Como posso ajudar? Exemplos:\n• 📋 Listar tarefas\n• ➕ Criar tarefa\n• ✅ Concluir tarefa\n• 📈 Meu progresso"
+)
+
+_SUGGEST_TEMPLATE = """🎯 Recomendo que você trabalhe nesta tarefa agora:
+
+{title}
+• Status: {status}
+• Prioridade: {priority}{due_info}
+
+{reason}
+
+📊 Resumo das suas tarefas pendentes:
+• Atrasadas: {overdue}
+• Para hoje: {today}
+• Urgentes: {urgent}
+• Alta prioridade: {high}
+• Outras: {other}
+
+Quer que eu marque esta tarefa como concluída quando terminar? Basta dizer "concluir {short_title}..."."""
+
+# Respostas fixas de ajuda e "sobre o sistema"
+_HELP_RESPONSE: Mapping[str, Any] = MappingProxyType({
+    "message": """🤖 Comandos do Agente de IA
+
+📋 LISTAR:
+• Minhas tarefas / Tarefas de hoje
+• Tarefas atrasadas / Tarefas pendentes
+
+➕ CRIAR:
+• Criar [descrição da tarefa]
+• Ex: Criar reunião amanhã às 14h
+
+✅ CONCLUIR:
+• Concluir [nome da tarefa]
+• Ou digite o número após listar
+
+🗑️ DELETAR:
+• Deletar [nome da tarefa]
+
+📊 STATUS:
+• Meu progresso / Status
+
+💡 Dica: Fale naturalmente! Eu entendo o contexto.""",
+    "action": "help",
+    "data": None,
+})
+
+_ABOUT_PREAMBLE = """🚀 SGTI - Sistema de Gerenciamento de Tarefas Inteligente
+
+Sou seu assistente pessoal de produtividade! Fui criado para ajudar você a organizar suas tarefas de forma inteligente.
+
+💡 O que posso fazer por você:
+
+📋 Gerenciar Tarefas
+   Criar, editar, concluir e organizar suas atividades
+
+🎯 Priorização Inteligente
+   Sugiro qual tarefa você deveria fazer primeiro com base em prazos e prioridades
+
+📊 Análise de Produtividade
+   Mostro estatísticas e insights sobre seu desempenho
+
+🗓️ Controle de Prazos
+   Aviso sobre tarefas atrasadas ou próximas do vencimento
+
+💬 Conversa Natural
+   Você pode falar comigo naturalmente, sem comandos específicos!
+
+"""
+
+_ABOUT_PANORAMA_TEMPLATE = """📈 Seu panorama atual:
+   Você tem {total} tarefa(s) no sistema
+   {pending} pendente(s), {in_progress} em andamento, {completed} concluída(s)
+
+"""
+
+_ABOUT_SUFFIX = """🎯 Experimente perguntar:
+   "Qual tarefa devo fazer agora?"
+   "Criar uma nova tarefa"
+   "Minhas tarefas para hoje"
+   "Meu progresso"
+
+Estou aqui para ajudar! Como posso te auxiliar?"""
+
+# Chaves de ordenação da sugestão de próxima tarefa
+_BY_DUE = attrgetter("due_sort")
+_BY_DUE_THEN_PRIORITY = attrgetter("due_sort", "priority_rank")
+_BY_PRIORITY_THEN_DUE = attrgetter("priority_rank", "due_sort")
+
+
+@dataclass
+class _TaskPartition:
+    """Tarefas do usuário separadas uma única vez por mensagem"""
+    now: datetime
+    today: date
+    total: int = 0
+    status_counts: Counter = field(default_factory=Counter)
+    active: List[_TaskView] = field(default_factory=list)
+    overdue: List[_TaskView] = field(default_factory=list)
+    due_today: List[_TaskView] = field(default_factory=list)
+    urgent: List[_TaskView] = field(default_factory=list)
+    high: List[_TaskView] = field(default_factory=list)
+    other: List[_TaskView] = field(default_factory=list)
+    overdue_now: int = 0
+    high_priority_active: int = 0
+
+
+def _partition_tasks(tasks: List[Task], now: datetime) -> _TaskPartition:
+    """
+    Separa as tarefas em uma única passada.
+
+    Tarefas ativas (não concluídas nem canceladas) com prazo vencido ou para hoje
+    vão para overdue/due_today; as demais são separadas por prioridade.
+    Os prazos são comparados como timestamps com os limites do dia (fuso de
+    Brasília) calculados uma vez, sem converter cada data com to_brazil_tz.
+    """
+    today = now.date()
+    now_ts = now.timestamp()
+    day_start_ts = datetime.combine(today, time.min, tzinfo=BRAZIL_TZ).timestamp()
+    next_day_start_ts = datetime.combine(today + timedelta(days=1), time.min, tzinfo=BRAZIL_TZ).timestamp()
+    partition = _TaskPartition(now=now, today=today, total=len(tasks))
+    status_counts = partition.status_counts
+    active_append = partition.active.append
+    
+    for t in tasks:
+        status = _STATUS_VALUES.get(t.status) or _normalize_enum(t.status)
+        status_counts[status] += 1
+        if status in _CLOSED_STATUSES:
+            continue
+        
+        priority = _PRIORITY_VALUES.get(t.priority) or _normalize_enum(t.priority)
+        due = t.due_date
+        if due is not None:
+            if due.tzinfo is None:
+                due = due.replace(tzinfo=BRAZIL_TZ)
+            due_ts = due.timestamp()
+        else:
+            due_ts = _NO_DUE_TS
+        view = _TaskView(t, status, priority, due, _PRIORITY_ORDER.get(priority, 99), due_ts)
+        active_append(view)
+        
+        if priority in _URGENT_PRIORITIES or priority in _HIGH_PRIORITIES:
+            partition.high_priority_active += 1
+        
+        if due is not None:
+            if due_ts < now_ts:
+                partition.overdue_now += 1
+            if due_ts < day_start_ts:
+                partition.overdue.append(view)
+                continue
+            elif due_ts < next_day_start_ts:
+                partition.due_today.append(view)
+                continue
+        
+        if priority in _URGENT_PRIORITIES:
+            partition.urgent.append(view)
+        elif priority in _HIGH_PRIORITIES:
+            partition.high.append(view)
+        else:
+            partition.other.append(view)
+    
+    return partition
+
 
 class ChatAssistantService:
     """
@@ -28,6 +647,10 @@ class ChatAssistantService:
     """
 
     MAX_HISTORY_SIZE = 30
+    # Tamanho máximo da resposta do GPT às perguntas livres (o excedente vira "...")
+    GENERAL_RESPONSE_MAX_CHARS = 1000
+    # Caracteres do histórico recente incluídos no prompt das perguntas livres (~300 tokens)
+    HISTORY_PROMPT_CHARS = 1200
     
     QUICK_INTENT_MAP = {
         "oi": "greeting", "olá": "greeting", "ola": "greeting", "hey": "greeting",
@@ -54,6 +677,132 @@ class ChatAssistantService:
         "meu progresso": "task_status", "meu status": "task_status",
     }
 
+    _NORMALIZED_INTENT_MAP = {_fold_accents(k).lower(): v for k, v in QUICK_INTENT_MAP.items()}
+
+    _PREFIX_RE = re.compile(r"^(criar|adicionar|concluir|finalizar|deletar|excluir|remover)\s")
+    _PREFIX_INTENTS = {
+        "criar": "create_task", "adicionar": "create_task",
+        "concluir": "complete_task", "finalizar": "complete_task",
+        "deletar": "delete_task", "excluir": "delete_task", "remover": "delete_task",
+    }
+
+    # Roteador determinístico usado antes do GPT: palavras-chave (sem acento,
+    # palavra inteira) -> intenção. Quando há várias, vale a ordem de _KEYWORD_PRIORITY.
+    _INTENT_KEYWORDS = {
+        "create_task": (
+            "criar", "crie", "cria", "adicionar", "adicione", "adiciona",
+            "nova tarefa", "cadastrar", "agendar",
+        ),
+        "complete_task": (
+            "concluir", "conclua", "finalizar", "finalize", "terminar", "termine",
+            "terminei", "marcar como concluida",
+        ),
+        "delete_task": (
+            "deletar", "delete", "remover", "remova", "excluir", "exclua", "apagar", "apague",
+        ),
+        "update_task": (
+            "atualizar", "atualize", "editar", "edite", "alterar", "altere", "modificar", "modifique",
+        ),
+        "list_tasks": (
+            "listar", "liste", "mostrar", "mostre", "mostra", "exibir",
+            "minhas tarefas", "tarefas de hoje", "tarefas para hoje",
+        ),
+        "suggest_next_task": (
+            "proxima", "proxima tarefa", "agora", "por onde comecar", "o que fazer",
+        ),
+        "task_status": ("status", "progresso", "resumo", "produtividade"),
+        "help": ("ajuda", "ajude", "help", "comandos"),
+        "about_system": ("o que voce faz", "como funciona", "funcionalidades"),
+        "thanks": ("obrigado", "obrigada", "valeu", "vlw", "thanks"),
+        "greeting": ("oi", "ola", "bom dia", "boa tarde", "boa noite", "hey"),
+    }
+    _KEYWORD_PRIORITY = tuple(_INTENT_KEYWORDS)
+    _KEYWORD_INTENTS = {kw: intent for intent, kws in _INTENT_KEYWORDS.items() for kw in kws}
+    _KEYWORD_RE = re.compile(
+        r"\b(" + "|".join(map(re.escape, sorted(_KEYWORD_INTENTS, key=len, reverse=True))) + r")\b"
+    )
+    # Intenções com handler próprio em _dispatch_intent; as demais são respondidas pelo GPT
+    _ROUTED_INTENTS = frozenset({
+        "confirm_yes", "confirm_no", "greeting", "thanks", "about_system", "suggest_next_task",
+        "list_tasks", "create_task", "complete_task", "select_complete", "update_task",
+        "delete_task", "select_delete", "task_status", "help",
+    })
+    # Mensagens sem palavra-chave e com até este tamanho não vão ao GPT
+    GPT_INTENT_MIN_LENGTH = 15
+    # Mensagens maiores que isso não passam pelo cache de intenções
+    INTENT_CACHE_MAX_LENGTH = 80
+
+    # Fallback quando o GPT falha: palavras isoladas (por token) e expressões
+    # de mais de uma palavra (regex), avaliadas na ordem de _FALLBACK_TOKENS
+    _FALLBACK_TOKENS = (
+        ("greeting", frozenset({"oi", "olá"})),
+        ("thanks", frozenset({"obrigado", "valeu", "thanks"})),
+        ("help", frozenset({"ajuda", "help", "comandos"})),
+        ("create_task", frozenset({"criar", "adicionar"})),
+        ("complete_task", frozenset({"concluir", "finalizar", "terminar"})),
+        ("delete_task", frozenset({"deletar", "remover", "excluir"})),
+        ("list_tasks", frozenset({"listar"})),
+    )
+    _FALLBACK_PHRASES = {
+        "bom dia": "greeting", "boa tarde": "greeting", "boa noite": "greeting",
+        "nova tarefa": "create_task",
+        "minhas tarefas": "list_tasks", "tarefas de hoje": "list_tasks",
+    }
+    _FALLBACK_WORD_RE = re.compile(r"\w+")
+    _FALLBACK_PHRASE_RE = re.compile(r"\b(" + "|".join(map(re.escape, _FALLBACK_PHRASES)) + r")\b")
+
+    _THANKS_RESPONSES = (
+        "😊 Por nada! Estou aqui para ajudar.",
+        "👍 Disponha! Qualquer coisa, é só chamar.",
+        "✨ Fico feliz em ajudar! Precisa de mais alguma coisa?",
+        "🙌 Sempre às ordens! Boa produtividade!",
+    )
+    _CANCEL_RESPONSES = (
+        "👌 Tudo bem, ação cancelada! O que mais posso fazer por você?",
+        "✅ Cancelado! Estou aqui se precisar de algo.",
+        "Ok, sem problemas! Como posso ajudar?",
+    )
+
+    # Frases das respostas do assistente -> contexto (em ordem de prioridade).
+    # "confirmar" e "concluí" só indicam conclusão quando aparecem juntas.
+    _CONTEXT_PHRASES = {
+        "vou criar a tarefa": "awaiting_create_confirmation",
+        "confirmar para criar": "awaiting_create_confirmation",
+        "marcar como concluída": "awaiting_complete_confirmation",
+        "excluir tarefa": "awaiting_delete_confirmation",
+        "deletar": "awaiting_delete_confirmation",
+        "descreva a tarefa": "awaiting_task_description",
+        "qual tarefa você quer": "awaiting_task_description",
+        "digite o número": "awaiting_selection",
+        "qual delas": "awaiting_selection",
+        "confirmar": None,
+        "concluí": None,
+    }
+    _CONTEXT_ORDER = (
+        "awaiting_create_confirmation", "awaiting_complete_confirmation",
+        "awaiting_delete_confirmation", "awaiting_task_description", "awaiting_selection",
+    )
+    _CONTEXT_RE = re.compile("|".join(map(re.escape, sorted(_CONTEXT_PHRASES, key=len, reverse=True))))
+
+    # Filtros da listagem em ordem de prioridade: (filtro, período, palavras).
+    # As palavras são trechos de regex casados como palavra inteira; cada filtro
+    # vira um grupo nomeado, então uma única varredura encontra todos os citados.
+    _LIST_FILTERS = (
+        ("today", "hoje", r"hoje|today"),
+        ("tomorrow", "amanhã", r"amanhã|tomorrow"),
+        ("week", "esta semana", r"semana|week"),
+        ("overdue", "atrasadas", r"atrasadas?|vencidas?|overdue|late"),
+        ("pending", "pendentes", r"pendentes?|pending|todo"),
+        ("in_progress", "em progresso", r"progresso|progress"),
+        ("done", "concluídas", r"concluídas?|done|completed"),
+        ("high", "de alta prioridade", r"alta|high|priorit\w*"),
+        ("urgent", "urgentes", r"urgentes?|urgent"),
+    )
+    _LIST_FILTER_ORDER = {key: (i, period) for i, (key, period, _) in enumerate(_LIST_FILTERS)}
+    _LIST_FILTER_RE = re.compile(
+        r"\b(?:" + "|".join(f"(?P<{key}>{words})" for key, _, words in _LIST_FILTERS) + r")\b"
+    )
+
     def __init__(
         self,
         openai_adapter: OpenAIAdapter,
@@ -63,82 +812,98 @@ class ChatAssistantService:
         self.openai_adapter = openai_adapter
         self.task_repository = task_repository
         self.user_id = user_id
-        self.conversation_history = []
+        self.conversation_history: deque = deque(maxlen=self.MAX_HISTORY_SIZE)
         self.last_action_context = None
         self.pending_tasks_list = []
         self.agent_mode = True
         self.executed_actions = []
         self.awaiting_confirmation = None
         self.conversation_context = None
+        self._assistant_contexts: tuple = (None, None)
+        self._recent_context_messages: deque = deque(maxlen=4)
+        self._thanks_index = 0
+        self._cancel_index = 0
     
     def set_repository(self, repository, user_id: UUID):
         """Set the task repository for direct execution"""
         self.task_repository = repository
         self.user_id = user_id
     
+    def _append_history(self, role: str, content: str, timestamp: str) -> None:
+        """Append a message and refresh the cached context derived from the history"""
+        self.conversation_history.append(_HistoryMessage(role, content, timestamp))
+        
+        self._recent_context_messages.append({"role": role, "content": content[:100]})
+        
+        if role == "assistant":
+            self._remember_assistant_context(content)
+    
+    def _recent_history(self, count: int) -> List[_HistoryMessage]:
+        """Last `count` history entries (the deque does not support slicing)"""
+        history = self.conversation_history
+        return list(islice(history, max(0, len(history) - count), None))
+    
     def _is_waiting_for_task_description(self) -> bool:
         """Check if the last assistant message was asking for task description"""
-        if not self.conversation_history:
-            return False
-        
-        for msg in reversed(self.conversation_history):
-            if msg.get("role") == "assistant":
-                content = msg.get("content", "").lower()
-                waiting_phrases = [
-                    "descreva a tarefa",
-                    "qual tarefa",
-                    "que tarefa você quer criar",
-                    "por favor, descreva",
-                    "me diga qual tarefa",
-                    "qual seria a tarefa"
-                ]
-                return any(phrase in content for phrase in waiting_phrases)
-        
-        return False
+        return self._get_conversation_context() == "awaiting_task_description"
     
-    def _get_conversation_context(self) -> Optional[str]:
-        """Analyze recent conversation to understand context"""
-        if not self.conversation_history:
+    @staticmethod
+    def _classify_assistant_content(content: str) -> Optional[str]:
+        """Classify an assistant message (already lowercased) into a context tag"""
+        found = set(ChatAssistantService._CONTEXT_RE.findall(content))
+        if not found:
             return None
         
-        recent = self.conversation_history[-4:] if len(self.conversation_history) >= 4 else self.conversation_history
-        
-        for msg in reversed(recent):
-            if msg.get("role") == "assistant":
-                content = msg.get("content", "").lower()
-                
-                if "vou criar a tarefa" in content or "confirmar para criar" in content:
-                    return "awaiting_create_confirmation"
-                elif "marcar como concluída" in content or "confirmar" in content and "concluí" in content:
-                    return "awaiting_complete_confirmation"
-                elif "excluir tarefa" in content or "deletar" in content:
-                    return "awaiting_delete_confirmation"
-                elif "descreva a tarefa" in content or "qual tarefa você quer" in content:
-                    return "awaiting_task_description"
-                elif "digite o número" in content or "qual delas" in content:
-                    return "awaiting_selection"
+        tags = {ChatAssistantService._CONTEXT_PHRASES[phrase] for phrase in found}
+        if "confirmar" in found and "concluí" in found:
+            tags.add("awaiting_complete_confirmation")
         
-        return None
+        return next((tag for tag in ChatAssistantService._CONTEXT_ORDER if tag in tags), None)
+    
+    def _remember_assistant_context(self, content: str) -> None:
+        """Classify the new assistant message once and keep the last two tags"""
+        self._assistant_contexts = (
+            self._assistant_contexts[1],
+            self._classify_assistant_content(content.lower()),
+        )
+    
+    def _get_conversation_context(self) -> Optional[str]:
+        """
+        Context of the recent conversation (last two assistant messages,
+        i.e. the last 4 history entries), classified when each was appended
+        """
+        previous, last = self._assistant_contexts
+        return last or previous
     
     def _quick_intent_check(self, message: str) -> Optional[str]:
-        """Check for quick intent matches without calling GPT"""
-        message_lower = message.lower().strip()
+        """
+        Check for quick intent matches without calling GPT.
+        
+        Expects the message already lowercased and stripped (see process_message).
+        """
+        message_lower = _fold_accents(message)
         
-        if message_lower in self.QUICK_INTENT_MAP:
-            return self.QUICK_INTENT_MAP[message_lower]
+        intent = self._NORMALIZED_INTENT_MAP.get(message_lower)
+        if intent:
+            return intent
         
         if message_lower.isdigit() and self.last_action_context:
             return f"select_{self.last_action_context}"
         
-        if message_lower.startswith("criar ") or message_lower.startswith("adicionar "):
-            return "create_task"
-        if message_lower.startswith("concluir ") or message_lower.startswith("finalizar "):
-            return "complete_task"
-        if message_lower.startswith("deletar ") or message_lower.startswith("excluir ") or message_lower.startswith("remover "):
-            return "delete_task"
+        match = self._PREFIX_RE.match(message_lower)
+        if match:
+            return self._PREFIX_INTENTS[match.group(1)]
         
         return None
 
+    @staticmethod
+    def _parse_task_id(task_id: Any) -> Optional[UUID]:
+        """Parse a task id once; None when it is not a valid UUID"""
+        try:
+            return task_id if isinstance(task_id, UUID) else UUID(str(task_id))
+        except ValueError:
+            return None
+    
     async def execute_action(self, action: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute an action directly.
@@ -157,32 +922,31 @@ class ChatAssistantService:
             }
         
         try:
-            from domain.value_objects.task_status import TaskStatus
-            
             if action == "complete":
                 task_id = data.get("task_id")
                 if not task_id:
                     return {"success": False, "message": "ID da tarefa não fornecido"}
                 
-                task = await self.task_repository.get_by_id(UUID(task_id))
-                if not task or task.user_id != self.user_id:
-                    return {"success": False, "message": "Tarefa não encontrada"}
+                tid = self._parse_task_id(task_id)
+                if tid is None:
+                    return {"success": False, "message": "ID inválido"}
                 
-                task.status = TaskStatus.DONE
-                task.completed_at = now_brazil()
-                await self.task_repository.update(task)
+                now = now_brazil()
+                title = await self.task_repository.complete_by_id(tid, self.user_id, now)
+                if title is None:
+                    return {"success": False, "message": "Tarefa não encontrada"}
                 
                 self.executed_actions.append({
                     "action": "complete",
                     "task_id": task_id,
-                    "task_title": task.title,
-                    "timestamp": now_brazil().isoformat()
+                    "task_title": title,
+                    "timestamp": now.isoformat()
                 })
                 
                 return {
                     "success": True,
-                    "message": f"✅ Tarefa '{task.title}' concluída com sucesso!",
-                    "task": {"id": task_id, "title": task.title, "status": "done"}
+                    "message": f"✅ Tarefa '{title}' concluída com sucesso!",
+                    "task": {"id": task_id, "title": title, "status": "done"}
                 }
             
             elif action == "delete":
@@ -190,12 +954,13 @@ class ChatAssistantService:
                 if not task_id:
                     return {"success": False, "message": "ID da tarefa não fornecido"}
                 
-                task = await self.task_repository.get_by_id(UUID(task_id))
-                if not task or task.user_id != self.user_id:
-                    return {"success": False, "message": "Tarefa não encontrada"}
+                tid = self._parse_task_id(task_id)
+                if tid is None:
+                    return {"success": False, "message": "ID inválido"}
                 
-                title = task.title
-                await self.task_repository.delete(UUID(task_id))
+                title = await self.task_repository.delete_by_id(tid, self.user_id)
+                if title is None:
+                    return {"success": False, "message": "Tarefa não encontrada"}
                 
                 self.executed_actions.append({
                     "action": "delete",
@@ -225,6 +990,78 @@ class ChatAssistantService:
         """Process a chat message and return appropriate response with actions"""
 
         try:
+            self._log_incoming(message, user_tasks)
+
+            now = now_brazil()
+            now_iso = now.isoformat()
+            message_lower = message.lower().strip()
+            
+            intent = await self._resolve_intent(message, message_lower)
+
+            self._append_history("user", message, now_iso)
+
+            response = await self._dispatch_intent(intent, message, message_lower, user_tasks, now)
+
+            self._append_history("assistant", response.get("message", ""), now_iso)
+
+            return response
+        except Exception as e:
+            return self._processing_error(message, e)
+    
+    async def process_message_stream(
+        self,
+        message: str,
+        user_tasks: List[Task]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a chat message yielding events as the answer is produced.
+
+        Free-form questions answered by GPT yield {"type": "delta", "content": ...}
+        for each streamed chunk. Every message ends with a single
+        {"type": "done", "response": ...} carrying the same response
+        process_message would return.
+
+        The user turn is always paired with an assistant turn in the history, holding
+        the text streamed so far if the consumer stops early (e.g. client disconnect).
+        """
+        response = None
+        now_iso = None
+        streamed: List[str] = []
+        gpt_events = None
+        try:
+            self._log_incoming(message, user_tasks)
+
+            now = now_brazil()
+            message_lower = message.lower().strip()
+
+            intent = await self._resolve_intent(message, message_lower)
+
+            now_iso = now.isoformat()
+            self._append_history("user", message, now_iso)
+
+            if intent in self._ROUTED_INTENTS:
+                response = await self._dispatch_intent(intent, message, message_lower, user_tasks, now)
+            else:
+                gpt_events = self._stream_with_gpt(message, user_tasks)
+                async for event in gpt_events:
+                    if event["type"] == "done":
+                        response = event["response"]
+                    else:
+                        streamed.append(event["content"])
+                        yield event
+        except Exception as e:
+            response = self._processing_error(message, e)
+        finally:
+            if gpt_events is not None:
+                await gpt_events.aclose()
+            if now_iso is not None:
+                reply = response.get("message", "") if response is not None else "".join(streamed)
+                self._append_history("assistant", reply, now_iso)
+
+        yield {"type": "done", "response": response}
+
+    def _log_incoming(self, message: str, user_tasks: List[Task]) -> None:
+        if logger.isEnabledFor(logging.INFO):
             logger.info(
                 "Processing chat message",
                 extra={
@@ -234,221 +1071,195 @@ class ChatAssistantService:
                 }
             )
 
-            message_lower = message.lower().strip()
-            
-            conv_context = self._get_conversation_context()
-            
-            quick_intent = self._quick_intent_check(message_lower)
-            
-            intent = None
-            
-            if quick_intent == "confirm_yes" and conv_context:
-                if conv_context == "awaiting_create_confirmation":
-                    intent = "confirm_yes"
-                elif conv_context == "awaiting_complete_confirmation":
-                    intent = "confirm_yes"
-                elif conv_context == "awaiting_delete_confirmation":
-                    intent = "confirm_yes"
-            elif quick_intent == "confirm_no" and conv_context:
-                intent = "confirm_no"
-            
-            elif conv_context == "awaiting_task_description" and not quick_intent:
-                logger.info("Context: waiting for task description, treating as create_task")
-                intent = "create_task"
-            
-            elif conv_context == "awaiting_selection" and message_lower.isdigit():
-                if self.last_action_context:
-                    intent = f"select_{self.last_action_context}"
-            
-            elif quick_intent and quick_intent not in ["confirm_yes", "confirm_no"]:
-                intent = quick_intent
-            
-            if not intent:
-                intent = await self._detect_intent(message_lower)
+    @staticmethod
+    def _processing_error(message: str, error: Exception) -> Dict[str, Any]:
+        logger.error(
+            f"Error processing chat message: {str(error)}",
+            exc_info=error,
+            extra={
+                "message_preview": message[:50] if message else "",
+                "error_type": type(error).__name__,
+            }
+        )
+        return {
+            "message": "Desculpe, ocorreu um erro. Tente novamente ou digite 'ajuda' para ver os comandos disponíveis.",
+            "action": None,
+            "data": None
+        }
 
-            self.conversation_history.append({
-                "role": "user",
-                "content": message,
-                "timestamp": now_brazil().isoformat()
-            })
+    async def _resolve_intent(self, message: str, message_lower: str) -> str:
+        """Pick the intent from the conversation context, quick checks, keywords or GPT"""
+        conv_context = self._get_conversation_context()
+        
+        quick_intent = self._quick_intent_check(message_lower)
+        
+        intent = None
+        
+        if quick_intent == "confirm_yes" and conv_context:
+            if conv_context == "awaiting_create_confirmation":
+                intent = "confirm_yes"
+            elif conv_context == "awaiting_complete_confirmation":
+                intent = "confirm_yes"
+            elif conv_context == "awaiting_delete_confirmation":
+                intent = "confirm_yes"
+        elif quick_intent == "confirm_no" and conv_context:
+            intent = "confirm_no"
+        
+        elif conv_context == "awaiting_task_description" and not quick_intent:
+            logger.info("Context: waiting for task description, treating as create_task")
+            intent = "create_task"
+        
+        elif conv_context == "awaiting_selection" and message_lower.isdigit():
+            if self.last_action_context:
+                intent = f"select_{self.last_action_context}"
+        
+        elif quick_intent and quick_intent not in ["confirm_yes", "confirm_no"]:
+            intent = quick_intent
+        
+        if not intent:
+            intent = await self._detect_intent(message_lower)
 
+        if logger.isEnabledFor(logging.INFO):
             logger.info(
                 "Intent detected",
                 extra={"intent": intent, "context": conv_context, "message_preview": message[:50]}
             )
 
-            if intent == "confirm_yes":
-                response = self._handle_confirmation_yes()
-            elif intent == "confirm_no":
-                response = self._handle_confirmation_no()
-            elif intent == "greeting":
-                response = await self._handle_greeting(user_tasks)
-            elif intent == "thanks":
-                response = self._handle_thanks()
-            elif intent == "about_system":
-                response = self._handle_about_system(user_tasks)
-            elif intent == "suggest_next_task":
-                response = await self._handle_suggest_next_task(user_tasks)
-            elif intent == "list_tasks":
-                response = await self._handle_list_tasks(message_lower, user_tasks)
-            elif intent == "create_task":
-                response = await self._handle_create_task(message, user_tasks)
-            elif intent == "complete_task":
-                response = await self._handle_complete_task(message_lower, user_tasks)
-                if response.get("action") == "select_complete":
-                    self.last_action_context = "complete"
-                    self.pending_tasks_list = response.get("data", [])
-            elif intent == "select_complete":
-                response = await self._handle_task_selection(message_lower, user_tasks, "complete")
-            elif intent == "update_task":
-                response = await self._handle_update_task(message_lower, user_tasks)
-            elif intent == "delete_task":
-                response = await self._handle_delete_task(message_lower, user_tasks)
-                if response.get("action") == "select_delete":
-                    self.last_action_context = "delete"
-                    self.pending_tasks_list = response.get("data", [])
-            elif intent == "select_delete":
-                response = await self._handle_task_selection(message_lower, user_tasks, "delete")
-            elif intent == "task_status":
-                response = await self._handle_task_status(message_lower, user_tasks)
-            elif intent == "help":
-                response = self._handle_help()
-            else:
-                response = await self._handle_general_query(message, user_tasks)
+        return intent
 
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": response.get("message", ""),
-                "timestamp": now_brazil().isoformat()
-            })
-
-            if len(self.conversation_history) > self.MAX_HISTORY_SIZE:
-                self.conversation_history = self.conversation_history[-self.MAX_HISTORY_SIZE:]
+    async def _dispatch_intent(
+        self,
+        intent: str,
+        message: str,
+        message_lower: str,
+        user_tasks: List[Task],
+        now: datetime
+    ) -> Dict[str, Any]:
+        """Run the handler for an intent; intents outside _ROUTED_INTENTS go to GPT"""
+        if intent == "confirm_yes":
+            response = self._handle_confirmation_yes()
+        elif intent == "confirm_no":
+            response = self._handle_confirmation_no()
+        elif intent == "greeting":
+            response = await self._handle_greeting(_partition_tasks(user_tasks, now))
+        elif intent == "thanks":
+            response = self._handle_thanks()
+        elif intent == "about_system":
+            response = self._handle_about_system(user_tasks)
+        elif intent == "suggest_next_task":
+            response = await self._handle_suggest_next_task(_partition_tasks(user_tasks, now))
+        elif intent == "list_tasks":
+            response = await self._handle_list_tasks(message_lower, _normalize_tasks(user_tasks), now)
+        elif intent == "create_task":
+            response = await self._handle_create_task(message, user_tasks)
+        elif intent == "complete_task":
+            response = await self._handle_complete_task(message_lower, _normalize_tasks(user_tasks))
+            if response.get("action") == "select_complete":
+                self.last_action_context = "complete"
+                self.pending_tasks_list = response.get("data", [])
+        elif intent == "select_complete":
+            response = await self._handle_task_selection(message_lower, _normalize_tasks(user_tasks), "complete")
+        elif intent == "update_task":
+            response = await self._handle_update_task(message_lower, _normalize_tasks(user_tasks))
+        elif intent == "delete_task":
+            response = await self._handle_delete_task(message_lower, _normalize_tasks(user_tasks))
+            if response.get("action") == "select_delete":
+                self.last_action_context = "delete"
+                self.pending_tasks_list = response.get("data", [])
+        elif intent == "select_delete":
+            response = await self._handle_task_selection(message_lower, _normalize_tasks(user_tasks), "delete")
+        elif intent == "task_status":
+            response = await self._handle_task_status(message_lower, _partition_tasks(user_tasks, now))
+        elif intent == "help":
+            response = self._handle_help()
+        else:
+            response = await self._handle_general_query(message, user_tasks)
 
-            return response
-        except Exception as e:
-            logger.error(
-                f"Error processing chat message: {str(e)}",
-                exc_info=True,
-                extra={
-                    "message_preview": message[:50] if message else "",
-                    "error_type": type(e).__name__,
-                }
-            )
-            return {
-                "message": "Desculpe, ocorreu um erro. Tente novamente ou digite 'ajuda' para ver os comandos disponíveis.",
-                "action": None,
-                "data": None
-            }
+        return response
     
     async def _detect_intent_with_gpt(self, message: str) -> str:
         """Use GPT to intelligently classify user intent with conversation context"""
         
-        recent_context = ""
-        if self.conversation_history:
-            recent = self.conversation_history[-4:]
-            context_lines = []
-            for msg in recent:
-                role = "Usuário" if msg.get("role") == "user" else "Assistente"
-                content = msg.get("content", "")[:100]
-                context_lines.append(f"{role}: {content}")
-            if context_lines:
-                recent_context = "\n".join(context_lines)
+        cache_key = None
+        if len(message) <= self.INTENT_CACHE_MAX_LENGTH:
+            cache_key = (message, self._get_conversation_context())
+            cached = _INTENT_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
         
-        system_prompt = """Você é um classificador de intenções para um sistema de gerenciamento de tarefas.
-
-Analise a mensagem do usuário CONSIDERANDO O CONTEXTO DA CONVERSA e retorne APENAS UMA das seguintes intenções:
-
-INTENÇÕES DISPONÍVEIS:
-- greeting: Saudações como "oi", "olá", "bom dia", "boa tarde"
-- thanks: Agradecimentos como "obrigado", "valeu", "thanks"
-- about_system: Perguntas sobre o sistema, como funciona, o que faz, funcionalidades
-- help: Pedidos de ajuda ou comandos disponíveis
-- list_tasks: Listar, ver, mostrar tarefas (hoje, pendentes, atrasadas, etc.)
-- create_task: Criar/adicionar tarefa OU descrever uma tarefa para criar (título, descrição, horário)
-- complete_task: Concluir, finalizar, terminar uma tarefa
-- delete_task: Deletar, remover, excluir uma tarefa
-- update_task: Atualizar, modificar, editar uma tarefa
-- suggest_next_task: Perguntar qual tarefa fazer agora, por onde começar, priorização
-- task_status: Ver progresso, status geral, produtividade, resumo
-- general: Qualquer outra coisa que não se encaixe acima
-
-REGRAS IMPORTANTES:
-1. Se a ÚLTIMA mensagem do assistente PEDIU para descrever uma tarefa, e o usuário responde com algo que parece uma tarefa (ex: "reunião com cliente às 14h") → create_task
-2. Se o usuário menciona horário, data ou atividade que parece uma tarefa → provavelmente create_task
-3. Se o usuário quer saber SOBRE o sistema/app/assistente em si → about_system
-4. Se o usuário quer ver/listar SUAS tarefas existentes → list_tasks
-5. Se pergunta "o que fazer agora" ou quer recomendação → suggest_next_task
-
-Responda APENAS com a intenção, nada mais."""
-
-        context_section = ""
-        if recent_context:
-            context_section = f"\nCONTEXTO DA CONVERSA RECENTE:\n{recent_context}\n"
-        
-        user_prompt = f"{context_section}MENSAGEM ATUAL DO USUÁRIO: \"{message}\"\n\nIntenção:"
+        # As mensagens recentes vão como turnos anteriores (não como texto no prompt),
+        # assim o prefixo system + histórico se repete entre requisições
+        user_prompt = f"MENSAGEM ATUAL DO USUÁRIO: \"{message}\"\n\nIntenção:"
 
         try:
             result = await self.openai_adapter.generate_completion(
                 prompt=user_prompt,
-                system_prompt=system_prompt,
+                system_prompt=_INTENT_SYSTEM_PROMPT,
                 temperature=0.1,
-                max_tokens=20
+                max_tokens=20,
+                history=list(self._recent_context_messages)
             )
             
             intent = result.get("content", "").strip().lower()
             
-            valid_intents = [
-                "greeting", "thanks", "about_system", "help", "list_tasks",
-                "create_task", "complete_task", "delete_task", "update_task",
-                "suggest_next_task", "task_status", "general"
-            ]
-            
-            if intent in valid_intents:
+            if intent in _VALID_INTENTS:
                 logger.info(f"GPT classified intent as: {intent}")
-                return intent
             else:
                 logger.warning(f"GPT returned unexpected intent: {intent}, defaulting to general")
-                return "general"
+                intent = "general"
+            
+            if cache_key is not None:
+                _INTENT_CACHE.set(cache_key, intent)
+            return intent
                 
         except Exception as e:
             logger.error(f"GPT intent classification failed: {e}")
             return self._detect_intent_fallback(message)
     
     def _detect_intent_fallback(self, message: str) -> str:
-        """Fallback intent detection using keywords (used when GPT fails)"""
-        message_lower = message.lower()
-        
-        if any(g in message_lower for g in ["oi", "olá", "bom dia", "boa tarde", "boa noite"]):
-            return "greeting"
-        if any(t in message_lower for t in ["obrigado", "valeu", "thanks"]):
-            return "thanks"
-        if any(h in message_lower for h in ["ajuda", "help", "comandos"]):
-            return "help"
-        if any(c in message_lower for c in ["criar", "adicionar", "nova tarefa"]):
-            return "create_task"
-        if any(c in message_lower for c in ["concluir", "finalizar", "terminar"]):
-            return "complete_task"
-        if any(d in message_lower for d in ["deletar", "remover", "excluir"]):
-            return "delete_task"
-        if any(l in message_lower for l in ["listar", "minhas tarefas", "tarefas de hoje"]):
-            return "list_tasks"
+        """Fallback intent detection using keywords (used when GPT fails); expects lowercase input"""
+        tokens = set(self._FALLBACK_WORD_RE.findall(message))
+        phrase_intents = {
+            self._FALLBACK_PHRASES[phrase] for phrase in self._FALLBACK_PHRASE_RE.findall(message)
+        }
+        
+        for intent, words in self._FALLBACK_TOKENS:
+            if intent in phrase_intents or not words.isdisjoint(tokens):
+                return intent
             
         return "general"
     
+    def _detect_intent_by_keywords(self, message: str) -> Optional[str]:
+        """Deterministic intent detection with a single scan over the keyword regex"""
+        found = {
+            self._KEYWORD_INTENTS[kw]
+            for kw in self._KEYWORD_RE.findall(_fold_accents(message))
+        }
+        if not found:
+            return None
+        return next(intent for intent in self._KEYWORD_PRIORITY if intent in found)
+    
     async def _detect_intent(self, message: str) -> str:
-        """Detect user intent - uses GPT for intelligent classification"""
-
-        message_stripped = message.strip()
-        if message_stripped.isdigit() and self.last_action_context:
+        """
+        Detect user intent - keywords first, GPT only for longer unmatched messages.
+        
+        Expects the message already lowercased and stripped (see process_message).
+        """
+        if message.isdigit() and self.last_action_context:
             return f"select_{self.last_action_context}"
         
+        intent = self._detect_intent_by_keywords(message)
+        if intent:
+            return intent
+        
+        if len(message) <= self.GPT_INTENT_MIN_LENGTH:
+            return "general"
+        
         return await self._detect_intent_with_gpt(message)
     
-    async def _handle_greeting(self, tasks: List[Task]) -> Dict[str, Any]:
+    async def _handle_greeting(self, partition: _TaskPartition) -> Dict[str, Any]:
         """Handle greeting messages with a friendly summary"""
-        now = now_brazil()
-        hour = now.hour
+        hour = partition.now.hour
         
         if 5 <= hour < 12:
             greeting = "Bom dia"
@@ -457,9 +1268,9 @@ Responda APENAS com a intenção, nada mais."""
         else:
             greeting = "Boa noite"
         
-        pending = [t for t in tasks if t.status.value != "done"]
-        overdue = [t for t in pending if t.due_date and to_brazil_tz(t.due_date).date() < now.date()]
-        today_tasks = [t for t in pending if t.due_date and to_brazil_tz(t.due_date).date() == now.date()]
+        pending = partition.active
+        overdue = partition.overdue
+        today_tasks = partition.due_today
         
         summary_parts = []
         if len(overdue) > 0:
@@ -471,7 +1282,7 @@ Responda APENAS com a intenção, nada mais."""
         
         summary = " | ".join(summary_parts) if summary_parts else "✨ Nenhuma tarefa pendente!"
         
-        message = f"{greeting}! 👋 Sou seu agente de tarefas.\n\n{summary}\n\nComo posso ajudar? Exemplos:\n• 📋 Listar tarefas\n• ➕ Criar tarefa\n• ✅ Concluir tarefa\n• 📈 Meu progresso"
+        message = _GREETING_TEMPLATE.format(greeting=greeting, summary=summary)
         
         return {
             "message": message,
@@ -480,15 +1291,11 @@ Responda APENAS com a intenção, nada mais."""
         }
     
     def _handle_thanks(self) -> Dict[str, Any]:
-        """Handle thank you messages"""
-        responses = [
-            "😊 Por nada! Estou aqui para ajudar.",
-            "👍 Disponha! Qualquer coisa, é só chamar.",
-            "✨ Fico feliz em ajudar! Precisa de mais alguma coisa?",
-            "🙌 Sempre às ordens! Boa produtividade!"
-        ]
+        """Handle thank you messages (rotating through the canned replies)"""
+        message = self._THANKS_RESPONSES[self._thanks_index % len(self._THANKS_RESPONSES)]
+        self._thanks_index += 1
         return {
-            "message": random.choice(responses),
+            "message": message,
             "action": None,
             "data": None
         }
@@ -507,108 +1314,70 @@ Responda APENAS com a intenção, nada mais."""
         self.last_action_context = None
         self.pending_tasks_list = []
         
-        responses = [
-            "👌 Tudo bem, ação cancelada! O que mais posso fazer por você?",
-            "✅ Cancelado! Estou aqui se precisar de algo.",
-            "Ok, sem problemas! Como posso ajudar?"
-        ]
+        message = self._CANCEL_RESPONSES[self._cancel_index % len(self._CANCEL_RESPONSES)]
+        self._cancel_index += 1
         return {
-            "message": random.choice(responses),
+            "message": message,
             "action": "cancelled",
             "data": None
         }
     
-    async def _handle_suggest_next_task(self, tasks: List[Task]) -> Dict[str, Any]:
+    async def _handle_suggest_next_task(self, partition: _TaskPartition) -> Dict[str, Any]:
         """Suggest the next task the user should work on based on priority and due dates"""
-        now = now_brazil()
-        today = now.date()
-        
-        pending_tasks = [
-            t for t in tasks 
-            if str(t.status).lower().replace("taskstatus.", "") not in ["done", "concluida", "cancelled", "cancelada"]
-        ]
+        today = partition.today
+        pending_tasks = partition.active
         
         if not pending_tasks:
             return {
                 "message": "🎉 Parabéns! Você não tem tarefas pendentes. Todas as suas tarefas foram concluídas!\n\nQue tal criar uma nova tarefa? Basta dizer algo como:\n• \"Criar tarefa reunião com cliente\"",
-                "action": None,
-                "data": None
-            }
-        
-        overdue_tasks = []
-        urgent_tasks = []
-        high_priority_tasks = []
-        today_tasks = []
-        other_tasks = []
-        
-        for t in pending_tasks:
-            priority = str(t.priority).lower().replace("priority.", "")
-            status = str(t.status).lower().replace("taskstatus.", "")
-            
-            if t.due_date:
-                task_date = to_brazil_tz(t.due_date).date()
-                if task_date < today:
-                    overdue_tasks.append(t)
-                    continue
-                elif task_date == today:
-                    today_tasks.append(t)
-                    continue
-            
-            if priority in ["urgente", "urgent"]:
-                urgent_tasks.append(t)
-            elif priority in ["alta", "high"]:
-                high_priority_tasks.append(t)
-            else:
-                other_tasks.append(t)
+                "action": None,
+                "data": None
+            }
         
-        suggested_task = None
-        reason = ""
+        overdue_tasks = partition.overdue
+        urgent_tasks = partition.urgent
+        high_priority_tasks = partition.high
+        today_tasks = partition.due_today
+        other_tasks = partition.other
         
         if overdue_tasks:
-            overdue_tasks.sort(key=lambda t: (t.due_date, self._priority_order(t.priority)))
-            suggested_task = overdue_tasks[0]
-            days_overdue = (today - to_brazil_tz(suggested_task.due_date).date()).days
+            suggested = min(overdue_tasks, key=_BY_DUE_THEN_PRIORITY)
+            days_overdue = (today - to_brazil_tz(suggested.due_date).date()).days
             reason = f"⚠️ Esta tarefa está atrasada há {days_overdue} dia(s). Resolva-a imediatamente para evitar mais atrasos."
         elif urgent_tasks:
-            urgent_tasks.sort(key=lambda t: t.due_date if t.due_date else datetime.max.replace(tzinfo=timezone.utc))
-            suggested_task = urgent_tasks[0]
+            suggested = min(urgent_tasks, key=_BY_DUE)
             reason = "🚨 Esta tarefa tem prioridade URGENTE. Deve ser resolvida o mais rápido possível."
         elif today_tasks:
-            today_tasks.sort(key=lambda t: (self._priority_order(t.priority), t.due_date))
-            suggested_task = today_tasks[0]
+            suggested = min(today_tasks, key=_BY_PRIORITY_THEN_DUE)
             reason = "📅 Esta tarefa vence hoje. Priorize para não atrasar."
         elif high_priority_tasks:
-            high_priority_tasks.sort(key=lambda t: t.due_date if t.due_date else datetime.max.replace(tzinfo=timezone.utc))
-            suggested_task = high_priority_tasks[0]
+            suggested = min(high_priority_tasks, key=_BY_DUE)
             reason = "🔴 Esta tarefa tem alta prioridade. É importante resolvê-la logo."
         else:
-            other_tasks.sort(key=lambda t: t.created_at if t.created_at else datetime.max.replace(tzinfo=timezone.utc))
-            suggested_task = other_tasks[0] if other_tasks else pending_tasks[0]
+            suggested = min(other_tasks, key=lambda v: v.task.created_at or _NO_DATE)
             reason = "📋 Esta é a próxima tarefa na sua lista. Comece por ela para manter o progresso."
         
+        suggested_task = suggested.task
         priority_label = self._format_priority(suggested_task.priority)
         status_label = self._format_status(suggested_task.status)
         due_info = ""
-        if suggested_task.due_date:
-            due_date_br = to_brazil_tz(suggested_task.due_date)
+        if suggested.due_date:
+            due_date_br = to_brazil_tz(suggested.due_date)
             due_info = f"\n📆 Prazo: {due_date_br.strftime('%d/%m/%Y às %H:%M')}"
         
-        message = f"""🎯 Recomendo que você trabalhe nesta tarefa agora:
-
-{suggested_task.title}
-• Status: {status_label}
-• Prioridade: {priority_label}{due_info}
-
-{reason}
-
-📊 Resumo das suas tarefas pendentes:
-• Atrasadas: {len(overdue_tasks)}
-• Para hoje: {len(today_tasks)}
-• Urgentes: {len(urgent_tasks)}
-• Alta prioridade: {len(high_priority_tasks)}
-• Outras: {len(other_tasks)}
-
-Quer que eu marque esta tarefa como concluída quando terminar? Basta dizer "concluir {suggested_task.title[:30]}..."."""
+        message = _SUGGEST_TEMPLATE.format(
+            title=suggested_task.title,
+            status=status_label,
+            priority=priority_label,
+            due_info=due_info,
+            reason=reason,
+            overdue=len(overdue_tasks),
+            today=len(today_tasks),
+            urgent=len(urgent_tasks),
+            high=len(high_priority_tasks),
+            other=len(other_tasks),
+            short_title=suggested_task.title[:30],
+        )
 
         return {
             "message": message,
@@ -634,126 +1403,69 @@ Quer que eu marque esta tarefa como concluída quando terminar? Basta dizer "con
     
     def _priority_order(self, priority) -> int:
         """Return numeric order for priority (lower = higher priority)"""
-        p = str(priority).lower().replace("priority.", "")
-        order = {
-            "urgente": 0, "urgent": 0,
-            "alta": 1, "high": 1,
-            "media": 2, "medium": 2,
-            "baixa": 3, "low": 3
-        }
-        return order.get(p, 99)
+        order = _PRIORITY_ORDER.get(priority)
+        if order is None:
+            order = _PRIORITY_ORDER.get(_normalize_enum(priority), 99)
+        return order
     
     def _format_priority(self, priority) -> str:
         """Format priority for display"""
-        p = str(priority).lower().replace("priority.", "")
-        labels = {
-            "urgente": "🚨 Urgente",
-            "urgent": "🚨 Urgente",
-            "alta": "🔴 Alta",
-            "high": "🔴 Alta",
-            "media": "🟡 Média",
-            "medium": "🟡 Média",
-            "baixa": "🟢 Baixa",
-            "low": "🟢 Baixa"
-        }
-        return labels.get(p, p.capitalize())
+        label = _PRIORITY_LABEL.get(priority)
+        if label is None:
+            p = _normalize_enum(priority)
+            label = _PRIORITY_LABEL.get(p, p.capitalize())
+        return label
     
     def _format_status(self, status) -> str:
-        """Format status for display with emoji"""
-        s = str(status).lower().replace("taskstatus.", "")
-        labels = {
-            "todo": "📋 A Fazer",
-            "pending": "📋 A Fazer",
-            "in_progress": "🔄 Em Progresso",
-            "done": "✅ Concluída",
-            "cancelled": "❌ Cancelada"
-        }
-        return labels.get(s, s.capitalize())
+        """Format task status to Portuguese"""
+        label = _STATUS_LABEL.get(status)
+        if label is None:
+            status_str = _normalize_enum(status)
+            label = _STATUS_LABEL.get(status_str, status_str)
+        return label
     
     def _format_priority_text(self, priority) -> str:
         """Format priority to Portuguese text without emoji"""
-        p = str(priority).lower().replace("priority.", "")
-        labels = {
-            "urgente": "Urgente",
-            "urgent": "Urgente",
-            "alta": "Alta",
-            "high": "Alta",
-            "media": "Média",
-            "medium": "Média",
-            "baixa": "Baixa",
-            "low": "Baixa"
-        }
-        return labels.get(p, p.capitalize())
+        label = _PRIORITY_TEXT.get(priority)
+        if label is None:
+            p = _normalize_enum(priority)
+            label = _PRIORITY_TEXT.get(p, p.capitalize())
+        return label
     
     def _format_status_text(self, status) -> str:
         """Format status to Portuguese text without emoji"""
-        s = str(status).lower().replace("taskstatus.", "")
-        labels = {
-            "todo": "A Fazer",
-            "pending": "A Fazer",
-            "in_progress": "Em Progresso",
-            "done": "Concluída",
-            "cancelled": "Cancelada"
-        }
-        return labels.get(s, s.capitalize())
+        label = _STATUS_TEXT.get(status)
+        if label is None:
+            s = _normalize_enum(status)
+            label = _STATUS_TEXT.get(s, s.capitalize())
+        return label
+    
+    def _match_list_filter(self, message: str) -> Tuple[Optional[str], str]:
+        """Return (filter, period label) for the highest-priority filter mentioned"""
+        found = min(
+            (self._LIST_FILTER_ORDER[match.lastgroup] for match in self._LIST_FILTER_RE.finditer(message)),
+            default=None
+        )
+        if found is None:
+            return None, ""
+        index, period = found
+        return self._LIST_FILTERS[index][0], period
     
     async def _handle_list_tasks(
         self,
         message: str,
-        tasks: List[Task]
+        normalized: List[_NormalizedTask],
+        now: datetime
     ) -> Dict[str, Any]:
         """Handle request to list tasks"""
 
-        filtered_tasks = tasks
+        list_filter, period = self._match_list_filter(message)
 
-        if "hoje" in message or "today" in message:
-            today = now_brazil().date()
-            filtered_tasks = [
-                t for t in tasks
-                if t.due_date and to_brazil_tz(t.due_date).date() == today
-            ]
-            period = "hoje"
-        elif "amanhã" in message or "tomorrow" in message:
-            tomorrow = (now_brazil() + timedelta(days=1)).date()
-            filtered_tasks = [
-                t for t in tasks
-                if t.due_date and to_brazil_tz(t.due_date).date() == tomorrow
-            ]
-            period = "amanhã"
-        elif "semana" in message or "week" in message:
-            week_end = now_brazil() + timedelta(days=7)
-            filtered_tasks = [
-                t for t in tasks
-                if t.due_date and t.due_date <= week_end
-            ]
-            period = "esta semana"
-        elif "atrasada" in message or "atrasadas" in message or "vencida" in message or "overdue" in message or "late" in message:
-            today = now_brazil()
-            filtered_tasks = [
-                t for t in tasks
-                if t.due_date and to_brazil_tz(t.due_date) < today and str(t.status).lower().replace("taskstatus.", "") != "done"
-            ]
-            period = "atrasadas"
-        elif "pendente" in message or "pending" in message or "todo" in message:
-            filtered_tasks = [t for t in tasks if str(t.status).lower().replace("taskstatus.", "") in ["pending", "todo"]]
-            period = "pendentes"
-        elif "progresso" in message or "progress" in message:
-            filtered_tasks = [t for t in tasks if str(t.status).lower().replace("taskstatus.", "") == "in_progress"]
-            period = "em progresso"
-        elif "concluída" in message or "done" in message or "completed" in message:
-            filtered_tasks = [t for t in tasks if str(t.status).lower().replace("taskstatus.", "") == "done"]
-            period = "concluídas"
-        elif "alta" in message or "high" in message or "priorit" in message:
-            filtered_tasks = [t for t in tasks if str(t.priority).lower() in ["alta", "high"]]
-            period = "de alta prioridade"
-        elif "urgente" in message or "urgent" in message:
-            filtered_tasks = [t for t in tasks if str(t.priority).lower() in ["urgente", "urgent"]]
-            period = "urgentes"
-        else:
-            filtered_tasks = [t for t in tasks if str(t.status).lower().replace("taskstatus.", "") != "done"]
-            period = ""
+        predicate = _LIST_FILTER_PREDICATES[list_filter]
+        bounds = _ListBounds(now, now.date(), (now + timedelta(days=1)).date(), now + timedelta(days=7))
+        filtered = [n for n in normalized if predicate(n, bounds)]
         
-        if not filtered_tasks:
+        if not filtered:
             if period:
                 return {
                     "message": f"✨ Você não tem tarefas {period}. Ótimo trabalho!",
@@ -767,75 +1479,36 @@ Quer que eu marque esta tarefa como concluída quando terminar? Basta dizer "con
                     "data": None
                 }
 
-        def format_date(due_date) -> str:
-            if not due_date:
-                return ""
-            now = now_brazil()
-            due_date_brazil = to_brazil_tz(due_date)
-            date_diff = (due_date_brazil.date() - now.date()).days
-
-            if date_diff < 0:
-                return f" [ATRASADA {abs(date_diff)}d]"
-            elif date_diff == 0:
-                return f" [HOJE {due_date_brazil.strftime('%H:%M')}]"
-            elif date_diff == 1:
-                return f" [AMANHÃ {due_date_brazil.strftime('%H:%M')}]"
-            else:
-                return f" [{due_date_brazil.strftime('%d/%m %H:%M')}]"
-
-        def format_status(status: str) -> str:
-            return {
-                "pending": "PENDENTE",
-                "todo": "A FAZER",
-                "in_progress": "EM PROGRESSO",
-                "done": "CONCLUÍDA",
-                "cancelled": "CANCELADA"
-            }.get(status, status.upper())
-        
-        def format_priority(priority):
-            """Format priority to Portuguese"""
-            p = str(priority).lower().replace("priority.", "")
-            return {
-                "urgente": "URGENTE",
-                "urgent": "URGENTE",
-                "alta": "ALTA",
-                "high": "ALTA",
-                "media": "MÉDIA",
-                "medium": "MÉDIA",
-                "baixa": "BAIXA",
-                "low": "BAIXA"
-            }.get(p, p.upper())
-
+        shown = filtered[:10]
         task_lines = []
-        for idx, t in enumerate(filtered_tasks[:10], 1):
-            status = format_status(t.status)
-            priority = format_priority(t.priority)
-            date_info = format_date(t.due_date)
+        data = []
+        for idx, n in enumerate(shown, 1):
+            t = n.task
+            status_label = _LIST_STATUS_LABEL.get(n.status, n.status.upper())
+            priority_label = _LIST_PRIORITY_LABEL.get(n.priority, n.priority.upper())
+            date_info = _format_due_tag(n.due_local, now)
 
             title = t.title if len(t.title) <= 60 else t.title[:57] + "..."
 
-            task_line = f"{idx}. {title} | {status} | {priority}{date_info}"
-            task_lines.append(task_line)
+            task_lines.append(f"{idx}. {title} | {status_label} | {priority_label}{date_info}")
+            data.append({
+                "id": str(t.id),
+                "title": t.title,
+                "status": t.status,
+                "priority": t.priority,
+                "due_date": t.due_date.isoformat() if t.due_date else None
+            })
 
         task_list = "\n".join(task_lines)
 
-        total = len(filtered_tasks)
+        total = len(filtered)
         showing = min(10, total)
         more_info = f"\n\nMostrando {showing} de {total}" if total > 10 else ""
 
         return {
             "message": f"Você tem {total} tarefa(s) {period}:\n\n{task_list}{more_info}",
             "action": "list",
-            "data": [
-                {
-                    "id": str(t.id),
-                    "title": t.title,
-                    "status": t.status,
-                    "priority": t.priority,
-                    "due_date": t.due_date.isoformat() if t.due_date else None
-                }
-                for t in filtered_tasks[:10]
-            ]
+            "data": data
         }
     
     async def _handle_create_task(
@@ -892,6 +1565,11 @@ Quer que eu marque esta tarefa como concluída quando terminar? Basta dizer "con
         today_str = now.strftime("%Y-%m-%d")
         tomorrow_str = (now + timedelta(days=1)).strftime("%Y-%m-%d")
         
+        cache_key = (message.strip().lower(), today_str)
+        cached = _EXTRACT_CACHE.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+        
         system_prompt = f"""Você é um extrator de informações de tarefas. Analise a mensagem do usuário e extraia:
 
 1. TÍTULO: O nome/descrição da tarefa (limpo, sem palavras como "criar", "amanhã", "para")
@@ -921,16 +1599,23 @@ Saída: {{"title": "Ligar para o cliente", "due_date": "{today_str} 15:00", "pri
         user_prompt = f"Mensagem do usuário: \"{message}\"\n\nExtraia as informações em JSON:"
 
         try:
-            result = await self.openai_adapter.generate_completion(
+            # A resposta esperada é um único objeto JSON: o stream é encerrado
+            # assim que ele se fecha, sem esperar texto extra do modelo
+            scanner = _JsonObjectScanner()
+            stream = self.openai_adapter.generate_completion_stream(
                 prompt=user_prompt,
                 system_prompt=system_prompt,
                 temperature=0.1,
                 max_tokens=150
             )
+            try:
+                async for chunk in stream:
+                    if scanner.feed(chunk):
+                        break
+            finally:
+                await stream.aclose()
             
-            response_text = result.get("content", "").strip()
-            
-            import json
+            response_text = scanner.text.strip()
             
             if "```json" in response_text:
                 response_text = response_text.split("```json")[1].split("```")[0].strip()
@@ -940,6 +1625,7 @@ Saída: {{"title": "Ligar para o cliente", "due_date": "{today_str} 15:00", "pri
             task_info = json.loads(response_text)
             
             logger.info(f"GPT extracted task info: {task_info}")
+            _EXTRACT_CACHE.set(cache_key, dict(task_info))
             return task_info
             
         except Exception as e:
@@ -956,22 +1642,10 @@ Saída: {{"title": "Ligar para o cliente", "due_date": "{today_str} 15:00", "pri
             
             return {"title": task_text, "due_date": None, "priority": "medium"}
     
-    def _format_status(self, status) -> str:
-        """Format task status to Portuguese"""
-        status_str = str(status).lower().replace("taskstatus.", "")
-        status_map = {
-            "todo": "A Fazer",
-            "pending": "Pendente", 
-            "in_progress": "Em Progresso",
-            "done": "Concluída",
-            "cancelled": "Cancelada"
-        }
-        return status_map.get(status_str, status_str)
-    
     async def _handle_task_selection(
         self,
         message: str,
-        tasks: List[Task],
+        normalized: List[_NormalizedTask],
         action_type: str
     ) -> Dict[str, Any]:
         """Handle numeric selection from a previously shown task list"""
@@ -995,71 +1669,17 @@ Saída: {{"title": "Ligar para o cliente", "due_date": "{today_str} 15:00", "pri
             self.last_action_context = None
             self.pending_tasks_list = []
             
-            if action_type == "complete":
-                return {
-                    "message": f"✅ Marcar como concluída:\n\n📌 {task_title}\n\nConfirmar?",
-                    "action": "confirm_complete",
-                    "data": {
-                        "task_id": str(task_id),
-                        "task_title": task_title
-                    },
-                    "requires_confirmation": True,
-                    "action_buttons": [
-                        {"label": "✅ Confirmar", "action": "complete", "data": {"task_id": str(task_id)}},
-                        {"label": "❌ Cancelar", "action": "cancel", "data": None}
-                    ]
-                }
-            elif action_type == "delete":
-                return {
-                    "message": f"🗑️ Excluir tarefa:\n\n📌 {task_title}\n\n⚠️ Esta ação não pode ser desfeita. Confirmar?",
-                    "action": "confirm_delete",
-                    "data": {
-                        "task_id": str(task_id),
-                        "task_title": task_title
-                    },
-                    "requires_confirmation": True,
-                    "action_buttons": [
-                        {"label": "🗑️ Excluir", "action": "delete", "data": {"task_id": str(task_id)}},
-                        {"label": "❌ Cancelar", "action": "cancel", "data": None}
-                    ]
-                }
+            if action_type in ("complete", "delete"):
+                return _build_confirm_response(action_type, task_id, task_title)
         
-        pending_tasks = [t for t in tasks if str(t.status).lower().replace("taskstatus.", "") != "done"]
+        task = _nth_pending_task(normalized, task_index)
         
-        if 0 <= task_index < len(pending_tasks):
-            task = pending_tasks[task_index]
-            
+        if task is not None:
             self.last_action_context = None
             self.pending_tasks_list = []
             
-            if action_type == "complete":
-                return {
-                    "message": f"✅ Marcar como concluída:\n\n📌 {task.title}\n\nConfirmar?",
-                    "action": "confirm_complete",
-                    "data": {
-                        "task_id": str(task.id),
-                        "task_title": task.title
-                    },
-                    "requires_confirmation": True,
-                    "action_buttons": [
-                        {"label": "✅ Confirmar", "action": "complete", "data": {"task_id": str(task.id)}},
-                        {"label": "❌ Cancelar", "action": "cancel", "data": None}
-                    ]
-                }
-            elif action_type == "delete":
-                return {
-                    "message": f"🗑️ Excluir tarefa:\n\n📌 {task.title}\n\n⚠️ Esta ação não pode ser desfeita. Confirmar?",
-                    "action": "confirm_delete",
-                    "data": {
-                        "task_id": str(task.id),
-                        "task_title": task.title
-                    },
-                    "requires_confirmation": True,
-                    "action_buttons": [
-                        {"label": "🗑️ Excluir", "action": "delete", "data": {"task_id": str(task.id)}},
-                        {"label": "❌ Cancelar", "action": "cancel", "data": None}
-                    ]
-                }
+            if action_type in ("complete", "delete"):
+                return _build_confirm_response(action_type, task.id, task.title)
         
         return {
             "message": f"❌ Número inválido. Por favor, escolha um número válido da lista.",
@@ -1070,11 +1690,18 @@ Saída: {{"title": "Ligar para o cliente", "due_date": "{today_str} 15:00", "pri
     async def _handle_complete_task(
         self,
         message: str,
-        tasks: List[Task]
+        normalized: List[_NormalizedTask]
     ) -> Dict[str, Any]:
         """Handle request to mark a task as complete"""
         
-        pending_tasks = [t for t in tasks if str(t.status).lower().replace("taskstatus.", "") != "done"]
+        message_stripped = message.strip()
+        if message_stripped.isdigit():
+            task = _nth_pending_task(normalized, int(message_stripped) - 1)
+            if task is not None:
+                return _build_confirm_response("complete", task.id, task.title)
+        
+        pending = [n for n in normalized if n.status != "done"]
+        pending_tasks = [n.task for n in pending]
         
         if not pending_tasks:
             return {
@@ -1083,82 +1710,48 @@ Saída: {{"title": "Ligar para o cliente", "due_date": "{today_str} 15:00", "pri
                 "data": None
             }
         
-        message_stripped = message.strip()
-        if message_stripped.isdigit():
-            task_index = int(message_stripped) - 1
-            if 0 <= task_index < len(pending_tasks):
-                task = pending_tasks[task_index]
-                return {
-                    "message": f"✅ Marcar como concluída:\n\n📌 {task.title}\n\nConfirmar?",
-                    "action": "confirm_complete",
-                    "data": {
-                        "task_id": str(task.id),
-                        "task_title": task.title
-                    },
-                    "requires_confirmation": True,
-                    "action_buttons": [
-                        {"label": "✅ Confirmar", "action": "complete", "data": {"task_id": str(task.id)}},
-                        {"label": "❌ Cancelar", "action": "cancel", "data": None}
-                    ]
-                }
-        
-        task_keywords = []
-        exclude_words = ["concluir", "finalizar", "terminar", "completar", "complete", "finish", "done", "feito", "terminei", "tarefa", "tarefas", "marcar", "como", "concluída", "feita"]
-        for word in message.split():
-            if len(word) > 2 and word not in exclude_words:
-                task_keywords.append(word)
+        task_keywords = [
+            word for word in message.split()
+            if len(word) > 2 and word not in _COMPLETE_STOPWORDS
+        ]
         
-        matching_tasks = []
-        if task_keywords:
-            for task in pending_tasks:
-                if any(keyword in task.title.lower() for keyword in task_keywords):
-                    matching_tasks.append(task)
+        matching_tasks = _match_titles(pending, task_keywords) if task_keywords else []
         
         if not task_keywords or not matching_tasks:
-            task_list = "\n".join([f"{i+1}. {t.title} ({self._format_status(t.status)})" for i, t in enumerate(pending_tasks[:8])])
+            data = [
+                {"id": str(t.id), "title": t.title, "status": self._format_status(t.status)}
+                for t in pending_tasks[:8]
+            ]
+            task_list = "\n".join([f"{i}. {d['title']} ({d['status']})" for i, d in enumerate(data, 1)])
             return {
                 "message": f"✅ Qual tarefa você quer marcar como concluída?\n\n{task_list}\n\nDigite o nome ou número da tarefa.",
                 "action": "select_complete",
-                "data": [{"id": str(t.id), "title": t.title, "status": self._format_status(t.status)} for t in pending_tasks[:8]]
+                "data": data
             }
         
         if len(matching_tasks) == 1:
             task = matching_tasks[0]
-            return {
-                "message": f"✅ Marcar como concluída:\n\n📌 {task.title}\n\nConfirmar?",
-                "action": "confirm_complete",
-                "data": {
-                    "task_id": str(task.id),
-                    "task_title": task.title
-                },
-                "requires_confirmation": True,
-                "action_buttons": [
-                    {"label": "✅ Confirmar", "action": "complete", "data": {"task_id": str(task.id)}},
-                    {"label": "❌ Cancelar", "action": "cancel", "data": None}
-                ]
-            }
+            return _build_confirm_response("complete", task.id, task.title)
         else:
-            task_list = "\n".join([f"{i+1}. {t.title}" for i, t in enumerate(matching_tasks[:5])])
+            shown = matching_tasks[:5]
+            task_list = "\n".join([f"{i}. {t.title}" for i, t in enumerate(shown, 1)])
             return {
                 "message": f"Encontrei {len(matching_tasks)} tarefas:\n\n{task_list}\n\nQual você quer marcar como concluída?",
                 "action": "select_complete",
-                "data": [
-                    {"id": str(t.id), "title": t.title}
-                    for t in matching_tasks[:5]
-                ]
+                "data": [{"id": str(t.id), "title": t.title} for t in shown]
             }
     
     async def _handle_update_task(
         self, 
         message: str, 
-        tasks: List[Task]
+        normalized: List[_NormalizedTask]
     ) -> Dict[str, Any]:
         """Handle request to update a task"""
         
-        task_keywords = []
-        for word in message.split():
-            if len(word) > 3 and word not in ["atualizar", "modificar", "mudar", "update", "modify", "change", "para", "para"]:
-                task_keywords.append(word)
+        task_keywords = [
+            word for word in message.split()
+            if len(word) > 3 and word not in _UPDATE_STOPWORDS
+        ]
         
         if not task_keywords:
             return {
@@ -1167,10 +1760,7 @@ Saída: {{"title": "Ligar para o cliente", "due_date": "{today_str} 15:00", "pri
                 "data": None
             }
         
-        matching_tasks = []
-        for task in tasks:
-            if any(keyword in task.title.lower() for keyword in task_keywords):
-                matching_tasks.append(task)
+        matching_tasks = _match_titles(normalized, task_keywords)
         
         if not matching_tasks:
             return {
@@ -1190,35 +1780,34 @@ Saída: {{"title": "Ligar para o cliente", "due_date": "{today_str} 15:00", "pri
                 }
             }
         else:
-            task_list = "\n".join([f"• {t.title}" for t in matching_tasks[:5]])
+            shown = matching_tasks[:5]
+            task_list = "\n".join([f"• {t.title}" for t in shown])
             return {
                 "message": f"Encontrei {len(matching_tasks)} tarefas:\n\n{task_list}\n\nQual delas você quer atualizar?",
                 "action": "select",
-                "data": [
-                    {"id": str(t.id), "title": t.title}
-                    for t in matching_tasks[:5]
-                ]
+                "data": [{"id": str(t.id), "title": t.title} for t in shown]
             }
     
     async def _handle_delete_task(
         self, 
         message: str, 
-        tasks: List[Task]
+        normalized: List[_NormalizedTask]
     ) -> Dict[str, Any]:
         """Handle request to delete a task"""
         
-        task_keywords = []
-        for word in message.split():
-            if len(word) > 3 and word not in ["deletar", "remover", "excluir", "delete", "remove", "apagar"]:
-                task_keywords.append(word)
+        task_keywords = [
+            word for word in message.split()
+            if len(word) > 3 and word not in _DELETE_STOPWORDS
+        ]
         
         if not task_keywords:
-            if tasks:
-                task_list = "\n".join([f"{i+1}. {t.title}" for i, t in enumerate(tasks[:8])])
+            if normalized:
+                first_tasks = [n.task for n in normalized[:8]]
+                task_list = "\n".join([f"{i+1}. {t.title}" for i, t in enumerate(first_tasks)])
                 return {
                     "message": f"Qual tarefa você quer deletar?\n\n{task_list}\n\nDigite o nome ou número da tarefa.",
                     "action": "select_delete",
-                    "data": [{"id": str(t.id), "title": t.title} for t in tasks[:8]]
+                    "data": [{"id": str(t.id), "title": t.title} for t in first_tasks]
                 }
             return {
                 "message": "Você não tem tarefas para deletar.",
@@ -1226,10 +1815,7 @@ Saída: {{"title": "Ligar para o cliente", "due_date": "{today_str} 15:00", "pri
                 "data": None
             }
         
-        matching_tasks = []
-        for task in tasks:
-            if any(keyword in task.title.lower() for keyword in task_keywords):
-                matching_tasks.append(task)
+        matching_tasks = _match_titles(normalized, task_keywords)
         
         if not matching_tasks:
             return {
@@ -1240,65 +1826,37 @@ Saída: {{"title": "Ligar para o cliente", "due_date": "{today_str} 15:00", "pri
         
         if len(matching_tasks) == 1:
             task = matching_tasks[0]
-            return {
-                "message": f"🗑️ Tem certeza que quer deletar a tarefa:\n\n📌 {task.title}\n\n⚠️ Essa ação não pode ser desfeita.",
-                "action": "confirm_delete",
-                "data": {
-                    "task_id": str(task.id),
-                    "task_title": task.title
-                },
-                "requires_confirmation": True,
-                "action_buttons": [
-                    {"label": "🗑️ Sim, deletar", "action": "delete", "data": {"task_id": str(task.id)}},
-                    {"label": "❌ Cancelar", "action": "cancel", "data": None}
-                ]
-            }
+            return _build_confirm_response("delete_by_name", task.id, task.title)
         else:
-            task_list = "\n".join([f"{i+1}. {t.title}" for i, t in enumerate(matching_tasks[:5])])
+            shown = matching_tasks[:5]
+            task_list = "\n".join([f"{i}. {t.title}" for i, t in enumerate(shown, 1)])
             return {
                 "message": f"Encontrei {len(matching_tasks)} tarefas:\n\n{task_list}\n\nQual delas você quer deletar? Digite o número.",
                 "action": "select_delete",
-                "data": [
-                    {"id": str(t.id), "title": t.title}
-                    for t in matching_tasks[:5]
-                ]
+                "data": [{"id": str(t.id), "title": t.title} for t in shown]
             }
     
     async def _handle_task_status(
         self, 
         message: str, 
-        tasks: List[Task]
+        partition: _TaskPartition
     ) -> Dict[str, Any]:
         """Handle request for task status summary with insights"""
         
-        total = len(tasks)
+        total = partition.total
+        status_counts = partition.status_counts
         
-        pending = len([t for t in tasks if str(t.status).lower().replace("taskstatus.", "") == "pending"])
-        todo = len([t for t in tasks if str(t.status).lower().replace("taskstatus.", "") == "todo"])
-        in_progress = len([t for t in tasks if str(t.status).lower().replace("taskstatus.", "") == "in_progress"])
-        done = len([t for t in tasks if str(t.status).lower().replace("taskstatus.", "") == "done"])
+        pending = status_counts["pending"]
+        todo = status_counts["todo"]
+        in_progress = status_counts["in_progress"]
+        done = status_counts["done"]
         
         active_tasks = pending + todo + in_progress
         completion_rate = (done / total * 100) if total > 0 else 0
         
-        now = now_brazil()
-        overdue = len([
-            t for t in tasks 
-            if t.due_date and to_brazil_tz(t.due_date) < now and str(t.status).lower().replace("taskstatus.", "") != "done"
-        ])
-        
-        high_priority = len([
-            t for t in tasks 
-            if str(t.priority).lower() in ["alta", "high", "urgente", "urgent"] 
-            and str(t.status).lower().replace("taskstatus.", "") != "done"
-        ])
-        
-        today = now.date()
-        due_today = len([
-            t for t in tasks 
-            if t.due_date and to_brazil_tz(t.due_date).date() == today 
-            and str(t.status).lower().replace("taskstatus.", "") != "done"
-        ])
+        overdue = partition.overdue_now
+        high_priority = partition.high_priority_active
+        due_today = len(partition.due_today)
         
         status_lines = [
             f"📊 Resumo das suas tarefas:",
@@ -1345,82 +1903,26 @@ Saída: {{"title": "Ligar para o cliente", "due_date": "{today_str} 15:00", "pri
             }
         }
     
-    def _handle_help(self) -> Dict[str, Any]:
+    def _handle_help(self) -> Mapping[str, Any]:
         """Handle help request"""
-
-        help_text = """🤖 Comandos do Agente de IA
-
-📋 LISTAR:
-• Minhas tarefas / Tarefas de hoje
-• Tarefas atrasadas / Tarefas pendentes
-
-➕ CRIAR:
-• Criar [descrição da tarefa]
-• Ex: Criar reunião amanhã às 14h
-
-✅ CONCLUIR:
-• Concluir [nome da tarefa]
-• Ou digite o número após listar
-
-🗑️ DELETAR:
-• Deletar [nome da tarefa]
-
-📊 STATUS:
-• Meu progresso / Status
-
-💡 Dica: Fale naturalmente! Eu entendo o contexto."""
-
-        return {
-            "message": help_text,
-            "action": "help",
-            "data": None
-        }
+        return _HELP_RESPONSE
     
     def _handle_about_system(self, tasks: List[Task]) -> Dict[str, Any]:
         """Handle questions about the system itself"""
         
         total_tasks = len(tasks)
-        pending = sum(1 for t in tasks if t.status.value == "todo")
-        in_progress = sum(1 for t in tasks if t.status.value == "in_progress")
-        completed = sum(1 for t in tasks if t.status.value == "done")
-        
-        about_text = """🚀 SGTI - Sistema de Gerenciamento de Tarefas Inteligente
-
-Sou seu assistente pessoal de produtividade! Fui criado para ajudar você a organizar suas tarefas de forma inteligente.
-
-💡 O que posso fazer por você:
-
-📋 Gerenciar Tarefas
-   Criar, editar, concluir e organizar suas atividades
-
-🎯 Priorização Inteligente
-   Sugiro qual tarefa você deveria fazer primeiro com base em prazos e prioridades
-
-📊 Análise de Produtividade
-   Mostro estatísticas e insights sobre seu desempenho
-
-🗓️ Controle de Prazos
-   Aviso sobre tarefas atrasadas ou próximas do vencimento
-
-💬 Conversa Natural
-   Você pode falar comigo naturalmente, sem comandos específicos!
-
-"""
+        status_counts = Counter(_STATUS_VALUES.get(t.status) or _normalize_enum(t.status) for t in tasks)
+        pending = status_counts["todo"]
+        in_progress = status_counts["in_progress"]
+        completed = status_counts["done"]
         
+        parts = [_ABOUT_PREAMBLE]
         if total_tasks > 0:
-            about_text += f"""📈 Seu panorama atual:
-   Você tem {total_tasks} tarefa(s) no sistema
-   {pending} pendente(s), {in_progress} em andamento, {completed} concluída(s)
-
-"""
-        
-        about_text += """🎯 Experimente perguntar:
-   "Qual tarefa devo fazer agora?"
-   "Criar uma nova tarefa"
-   "Minhas tarefas para hoje"
-   "Meu progresso"
-
-Estou aqui para ajudar! Como posso te auxiliar?"""
+            parts.append(_ABOUT_PANORAMA_TEMPLATE.format(
+                total=total_tasks, pending=pending, in_progress=in_progress, completed=completed
+            ))
+        parts.append(_ABOUT_SUFFIX)
+        about_text = "".join(parts)
 
         return {
             "message": about_text,
@@ -1448,76 +1950,147 @@ Estou aqui para ajudar! Como posso te auxiliar?"""
     ) -> Dict[str, Any]:
         """Handle query using GPT-4 with improved prompting and context"""
 
-        now = now_brazil()
-        today = now.date()
-        tomorrow = (now + timedelta(days=1)).date()
+        cache_key = self._answer_cache_key(message, tasks)
+        if cache_key is not None:
+            cached = _ANSWER_CACHE.get(cache_key)
+            if cached is not None:
+                return dict(cached)
 
-        task_lines = []
-        for t in tasks[:30]:
-            temporal_tag = ""
-            if t.due_date:
-                task_date = to_brazil_tz(t.due_date).date()
-                if task_date < today:
-                    temporal_tag = " [ATRASADA]"
-                elif task_date == today:
-                    temporal_tag = " [HOJE]"
-                elif task_date == tomorrow:
-                    temporal_tag = " [AMANHÃ]"
-            
-            status_pt = self._format_status_text(t.status)
-            priority_pt = self._format_priority_text(t.priority)
+        system_prompt, user_prompt = self._build_general_prompt(
+            message, tasks, with_history=cache_key is None
+        )
 
-            task_line = f"• {t.title} | Status: {status_pt} | Prioridade: {priority_pt}"
-            if t.due_date:
-                task_line += f" | Prazo: {t.due_date.strftime('%d/%m/%Y %H:%M')}{temporal_tag}"
+        try:
+            result = await self.openai_adapter.generate_completion(
+                prompt=user_prompt,
+                system_prompt=system_prompt,
+                temperature=0.4,
+                max_tokens=800
+            )
 
-            task_lines.append(task_line)
+            response_content = result.get("content", "").strip()
 
-        task_summary = "\n".join(task_lines)
+            logger.info(
+                "GPT response received",
+                extra={
+                    "response_length": len(response_content),
+                    "tokens_used": result.get("tokens_used", 0),
+                    "cost": result.get("cost", 0)
+                }
+            )
 
-        recent_history = ""
-        if len(self.conversation_history) > 1:
-            recent_messages = self.conversation_history[-6:]
-            recent_history = "\n".join([
-                f"{msg['role'].upper()}: {msg['content'][:200]}"
-                for msg in recent_messages
-            ])
+            response = self._general_response(response_content)
+            if cache_key is not None and response["action"] == "general":
+                _ANSWER_CACHE.set(cache_key, dict(response))
+            return response
+        except Exception as e:
+            logger.error(f"GPT chat failed: {e}")
+            return self._general_failure()
+    
+    async def _stream_with_gpt(
+        self,
+        message: str,
+        tasks: List[Task]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming version of _handle_with_gpt: yields deltas, then the final response"""
+
+        cache_key = self._answer_cache_key(message, tasks)
+        cached = _ANSWER_CACHE.get(cache_key) if cache_key is not None else None
+        if cached is not None:
+            yield {"type": "delta", "content": cached["message"]}
+            yield {"type": "done", "response": dict(cached)}
+            return
+
+        system_prompt, user_prompt = self._build_general_prompt(
+            message, tasks, with_history=cache_key is None
+        )
+        parts: List[str] = []
+        # Os deltas param no limite da resposta, então o texto exibido é o mesmo da mensagem final
+        remaining = self.GENERAL_RESPONSE_MAX_CHARS
+        truncated = False
 
-        system_prompt = """Você é um assistente especializado em gerenciamento de tarefas. Suas responsabilidades são LIMITADAS a:
+        try:
+            stream = self.openai_adapter.generate_completion_stream(
+                prompt=user_prompt,
+                system_prompt=system_prompt,
+                temperature=0.4,
+                max_tokens=800
+            )
+            try:
+                async for chunk in stream:
+                    if len(chunk) > remaining:
+                        chunk = chunk[:remaining]
+                        truncated = True
+                    if chunk:
+                        parts.append(chunk)
+                        remaining -= len(chunk)
+                        yield {"type": "delta", "content": chunk}
+                    if truncated:
+                        yield {"type": "delta", "content": "..."}
+                        break
+            finally:
+                await stream.aclose()
+
+            response_content = "".join(parts).strip()
 
-1. Responder perguntas sobre as tarefas do usuário com base nos dados fornecidos
-2. Fornecer insights sobre produtividade e organização de tarefas
-3. Sugerir prioridades baseadas nas tarefas existentes
-4. Ajudar a entender status e progresso das tarefas
+            logger.info(
+                "GPT streamed response received",
+                extra={"response_length": len(response_content), "chunks": len(parts), "truncated": truncated}
+            )
 
-REGRAS CRÍTICAS:
-- SEMPRE use os dados REAIS das tarefas fornecidas - liste tarefas específicas com títulos, status e prazos
-- NUNCA invente ou sugira tarefas que não existem na lista fornecida
-- Quando perguntarem sobre tarefas (hoje, amanhã, pendentes, etc.), LISTE as tarefas reais com detalhes
-- Se não houver tarefas para o período/filtro solicitado, informe claramente
-- Seja específico e factual - cite títulos e detalhes das tarefas
-- Seja conciso mas completo (máximo 5-6 linhas)
-- Responda SEMPRE em português brasileiro
-- NÃO use emojis
-- NÃO responda perguntas não relacionadas a tarefas ou produtividade
+            response = self._general_response(response_content)
+            if truncated and response["action"] == "general":
+                response["message"] += "..."
+            if cache_key is not None and response["action"] == "general":
+                _ANSWER_CACHE.set(cache_key, dict(response))
+        except Exception as e:
+            logger.error(f"GPT chat stream failed: {e}")
+            response = self._general_failure()
 
-EXEMPLOS DE RESPOSTAS CORRETAS:
+        yield {"type": "done", "response": response}
 
-Pergunta: "O que tenho para hoje?"
-Resposta: "Você tem 2 tarefas para hoje:
-- Reunião com cliente (Status: todo, Prioridade: high)
-- Revisar código (Status: in_progress, Prioridade: medium)"
+    def _answer_cache_key(self, message: str, tasks: List[Task]) -> Optional[Tuple[Optional[UUID], str, date, str]]:
+        """Key for _ANSWER_CACHE, or None when the question depends on the conversation"""
+        normalized = message.strip().lower()
+        folded = _fold_accents(normalized)
+        if not _STANDALONE_TOPIC_RE.search(folded) or _FOLLOW_UP_RE.search(folded):
+            return None
+        return self.user_id, normalized, now_brazil().date(), _task_signature(tasks)
 
-Pergunta: "Quais são minhas tarefas urgentes?"
-Resposta: "Você tem 1 tarefa urgente:
-- Corrigir bug em produção (Status: todo, Prazo: hoje às 18h)"
+    def _prompt_history(self) -> str:
+        """Recent conversation lines sent in the general-query prompt ("" without history)"""
+        if len(self.conversation_history) <= 1:
+            return ""
+        return "\n".join(_history_within_budget(self._recent_history(6), self.HISTORY_PROMPT_CHARS))
 
-Se perguntarem algo fora do escopo, responda: "Só posso ajudar com questões relacionadas às suas tarefas. Digite 'ajuda' para ver os comandos."
-"""
+    def _build_general_prompt(
+        self,
+        message: str,
+        tasks: List[Task],
+        with_history: bool = True
+    ) -> Tuple[str, str]:
+        """Build the (system, user) prompts for free-form questions about the user's tasks
+
+        Cached standalone questions leave the history out so the answer only depends on the tasks.
+        """
+
+        now = now_brazil()
+        today = now.date()
 
-        current_datetime = now_brazil()
-        today_str = current_datetime.strftime("%d/%m/%Y")
-        time_str = current_datetime.strftime("%H:%M")
+        task_summary = "\n".join([
+            _prompt_task_line(
+                t,
+                _STATUS_TEXT.get(t.status) or self._format_status_text(t.status),
+                _PRIORITY_TEXT.get(t.priority) or self._format_priority_text(t.priority),
+                today,
+            )
+            for t in tasks[:30]
+        ])
+
+        recent_history = self._prompt_history() if with_history else ""
+
+        today_str = now.strftime("%d/%m/%Y")
+        time_str = now.strftime("%H:%M")
 
         history_section = ""
         if recent_history:
@@ -1539,61 +2112,49 @@ INSTRUÇÕES:
 
 Responda agora de forma útil e factual:"""
 
-        try:
-            logger.info(
-                "Calling GPT for chat response",
-                extra={
-                    "tasks_count": len(tasks),
-                    "has_history": bool(recent_history),
-                    "prompt_length": len(user_prompt)
-                }
-            )
-
-            result = await self.openai_adapter.generate_completion(
-                prompt=user_prompt,
-                system_prompt=system_prompt,
-                temperature=0.4,
-                max_tokens=800
-            )
-
-            response_content = result.get("content", "").strip()
-
-            logger.info(
-                "GPT response received",
-                extra={
-                    "response_length": len(response_content),
-                    "tokens_used": result.get("tokens_used", 0),
-                    "cost": result.get("cost", 0)
-                }
-            )
-
-            if not response_content:
-                return {
-                    "message": "Desculpe, não consegui gerar uma resposta adequada. Digite 'ajuda' para ver os comandos disponíveis.",
-                    "action": None,
-                    "data": None
-                }
+        logger.info(
+            "Calling GPT for chat response",
+            extra={
+                "tasks_count": len(tasks),
+                "has_history": bool(recent_history),
+                "prompt_length": len(user_prompt)
+            }
+        )
 
-            if len(response_content) > 1000:
-                response_content = response_content[:1000] + "..."
+        return _GENERAL_SYSTEM_PROMPT, user_prompt
 
+    @classmethod
+    def _general_response(cls, response_content: str) -> Dict[str, Any]:
+        if not response_content:
             return {
-                "message": response_content,
-                "action": "general",
-                "data": None
-            }
-        except Exception as e:
-            logger.error(f"GPT chat failed: {e}")
-            return {
-                "message": "Desculpe, não entendi. Digite 'ajuda' para ver os comandos disponíveis.",
+                "message": "Desculpe, não consegui gerar uma resposta adequada. Digite 'ajuda' para ver os comandos disponíveis.",
                 "action": None,
                 "data": None
             }
+
+        if len(response_content) > cls.GENERAL_RESPONSE_MAX_CHARS:
+            response_content = response_content[:cls.GENERAL_RESPONSE_MAX_CHARS] + "..."
+
+        return {
+            "message": response_content,
+            "action": "general",
+            "data": None
+        }
+
+    @staticmethod
+    def _general_failure() -> Dict[str, Any]:
+        return {
+            "message": "Desculpe, não entendi. Digite 'ajuda' para ver os comandos disponíveis.",
+            "action": None,
+            "data": None
+        }
     
     def clear_history(self):
         """Clear conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
+        self._assistant_contexts = (None, None)
+        self._recent_context_messages.clear()
     
     def get_history(self) -> List[Dict[str, Any]]:
         """Get conversation history"""
-        return self.conversation_history
+        return [msg._asdict() for msg in self.conversation_history]
@@ -63,7 +63,7 @@ class GPTService:
         due_date = None
         if data.get("due_date"):
             try:
-                due_date = datetime.fromisoformat(data["due_date"].replace("Z", "+00:00"))
+                due_date = datetime.fromisoformat(data["due_date"])
             except Exception:
                 pass
 
@@ -3,7 +3,7 @@ Serviço de notificações para alertar sobre prazos de tarefas
 """
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from uuid import UUID
 
 from domain.entities.task import Task
@@ -11,6 +11,35 @@ from domain.utils.datetime_utils import now_brazil
 
 logger = logging.getLogger("sgti")
 
+# Status que encerram a tarefa (PT e EN) e prioridades que pedem alerta mesmo sem prazo
+_DONE_STATUSES = frozenset({"done", "cancelled", "concluida", "cancelada"})
+_HIGH_PRIO = frozenset({"alta", "urgente", "high", "urgent"})
+
+
+# Seções da mensagem de notificações, na ordem de exibição: (categoria, cabeçalho, linha por tarefa)
+_MESSAGE_BUCKETS = (
+    ("overdue", "URGENTE: {count} tarefa(s) ATRASADA(S)!", "  - {title} (atrasada há {days_late} dia(s))"),
+    ("due_today", "\nVENCE HOJE: {count} tarefa(s)", "  - {title} às {time}"),
+    ("due_tomorrow", "\nVENCE AMANHÃ: {count} tarefa(s)", "  - {title} às {time}"),
+    ("high_priority_pending", "\nALTA PRIORIDADE sem prazo: {count} tarefa(s)", "  - {title}"),
+)
+
+
+def _render_bucket(tasks: List[Task], header: str, line_fmt: str, now: datetime) -> List[str]:
+    """Cabeçalho, até 3 tarefas e a contagem das restantes de uma seção da mensagem"""
+    count = len(tasks)
+    lines = [header.format(count=count)]
+    for task in tasks[:3]:
+        due = task.due_date
+        lines.append(line_fmt.format(
+            title=task.title,
+            time=f"{due.hour:02d}:{due.minute:02d}" if due else "",
+            days_late=(now - due).days if due else 0,
+        ))
+    if count > 3:
+        lines.append(f"  ... e mais {count - 3} tarefa(s)")
+    return lines
+
 
 class NotificationService:
     """Serviço para gerenciar notificações de tarefas"""
@@ -21,7 +50,8 @@ class NotificationService:
     def get_tasks_requiring_notification(
         self,
         tasks: List[Task],
-        hours_ahead: int = 24
+        hours_ahead: int = 24,
+        now: Optional[datetime] = None
     ) -> Dict[str, List[Task]]:
         """
         Retorna tarefas que precisam de notificação agrupadas por urgência
@@ -29,94 +59,74 @@ class NotificationService:
         Args:
             tasks: Lista de tarefas do usuário
             hours_ahead: Quantas horas à frente verificar (padrão: 24h)
+            now: Momento de referência (padrão: agora em Brasília)
 
         Returns:
             Dict com categorias de notificações
         """
-        now = now_brazil()
+        now = now or now_brazil()
         threshold = now + timedelta(hours=hours_ahead)
+        today = now.date()
+        tomorrow = (now + timedelta(days=1)).date()
 
-        notifications = {
-            "overdue": [],
-            "due_today": [],
-            "due_tomorrow": [],
-            "due_soon": [],
-            "high_priority_pending": []
-        }
+        overdue, due_today, due_tomorrow, due_soon, high_priority_pending = [], [], [], [], []
+        overdue_append = overdue.append
+        due_today_append = due_today.append
+        due_tomorrow_append = due_tomorrow.append
+        due_soon_append = due_soon.append
 
         for task in tasks:
-            if task.status in ["done", "cancelled"]:
+            if task.status in _DONE_STATUSES:
                 continue
 
-            if task.due_date:
-                due_date = task.due_date
+            due_date = task.due_date
+            if due_date:
+                due_day = due_date.date()
 
                 if due_date < now:
-                    notifications["overdue"].append(task)
+                    overdue_append(task)
 
-                elif due_date.date() == now.date():
-                    notifications["due_today"].append(task)
+                elif due_day == today:
+                    due_today_append(task)
 
-                elif due_date.date() == (now + timedelta(days=1)).date():
-                    notifications["due_tomorrow"].append(task)
+                elif due_day == tomorrow:
+                    due_tomorrow_append(task)
 
                 elif due_date <= threshold:
-                    notifications["due_soon"].append(task)
+                    due_soon_append(task)
 
-            elif task.priority in ["alta", "urgente", "high", "urgent"]:
-                notifications["high_priority_pending"].append(task)
+            elif task.priority in _HIGH_PRIO:
+                high_priority_pending.append(task)
 
-        return notifications
+        return {
+            "overdue": overdue,
+            "due_today": due_today,
+            "due_tomorrow": due_tomorrow,
+            "due_soon": due_soon,
+            "high_priority_pending": high_priority_pending
+        }
 
     def format_notification_message(
         self,
-        notifications: Dict[str, List[Task]]
+        notifications: Dict[str, List[Task]],
+        now: Optional[datetime] = None
     ) -> str:
         """
         Formata as notificações em uma mensagem legível
 
         Args:
             notifications: Dict com categorias de notificações
+            now: Momento de referência para os dias de atraso (padrão: agora em Brasília)
 
         Returns:
             Mensagem formatada
         """
+        now = now or now_brazil()
         messages = []
 
-        if notifications["overdue"]:
-            count = len(notifications["overdue"])
-            messages.append(f"URGENTE: {count} tarefa(s) ATRASADA(S)!")
-            for task in notifications["overdue"][:3]:
-                days_late = (now_brazil() - task.due_date).days
-                messages.append(f"  - {task.title} (atrasada há {days_late} dia(s))")
-            if count > 3:
-                messages.append(f"  ... e mais {count - 3} tarefa(s)")
-
-        if notifications["due_today"]:
-            count = len(notifications["due_today"])
-            messages.append(f"\nVENCE HOJE: {count} tarefa(s)")
-            for task in notifications["due_today"][:3]:
-                time_str = task.due_date.strftime("%H:%M")
-                messages.append(f"  - {task.title} às {time_str}")
-            if count > 3:
-                messages.append(f"  ... e mais {count - 3} tarefa(s)")
-
-        if notifications["due_tomorrow"]:
-            count = len(notifications["due_tomorrow"])
-            messages.append(f"\nVENCE AMANHÃ: {count} tarefa(s)")
-            for task in notifications["due_tomorrow"][:3]:
-                time_str = task.due_date.strftime("%H:%M")
-                messages.append(f"  - {task.title} às {time_str}")
-            if count > 3:
-                messages.append(f"  ... e mais {count - 3} tarefa(s)")
-
-        if notifications["high_priority_pending"]:
-            count = len(notifications["high_priority_pending"])
-            messages.append(f"\nALTA PRIORIDADE sem prazo: {count} tarefa(s)")
-            for task in notifications["high_priority_pending"][:3]:
-                messages.append(f"  - {task.title}")
-            if count > 3:
-                messages.append(f"  ... e mais {count - 3} tarefa(s)")
+        for key, header, line_fmt in _MESSAGE_BUCKETS:
+            if notifications[key]:
+                messages.extend(_render_bucket(notifications[key], header, line_fmt, now))
 
         if not messages:
             return "Nenhuma notificação pendente. Você está em dia com suas tarefas!"
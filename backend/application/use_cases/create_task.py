@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 from uuid import UUID, uuid4
@@ -87,7 +88,7 @@ class CreateTaskUseCase:
                 else:
                     start_date = start_date.replace(month=start_date.month + 1)
         
-        created_tasks = []
+        tasks = []
         for i in range(max_recurrences):
             if frequency == "daily":
                 occurrence_date = start_date + timedelta(days=i * interval)
@@ -123,12 +124,15 @@ class CreateTaskUseCase:
                 natural_language_input=natural_language_input if i == 0 else None,
                 gpt_response=gpt_response if i == 0 else None,
             )
-            
-            created_task = await self.task_repository.create(task)
-            created_tasks.append(created_task)
-            
-            if self.event_callback:
-                await self.event_callback("task_created", created_task.to_dict(), user_id)
+            tasks.append(task)
+        
+        created_tasks = await self.task_repository.create_many(tasks)
+        
+        if self.event_callback:
+            await asyncio.gather(*(
+                self.event_callback("task_created", created_task.to_dict(), user_id)
+                for created_task in created_tasks
+            ))
         
         return created_tasks[0], {**gpt_response, "recurring_tasks_created": len(created_tasks)}
 
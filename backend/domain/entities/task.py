@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, NamedTuple, Optional
 from uuid import UUID, uuid4
 
 from domain.value_objects.priority import Priority
@@ -47,6 +47,27 @@ class Task:
         self.gpt_response = gpt_response
         self.created_at = created_at or now_brazil()
         self.updated_at = updated_at or now_brazil()
+        self._title_source: Optional[str] = None
+        self._title_lower = ""
+        self._title_tokens: frozenset[str] = frozenset()
+
+    def _refresh_title_cache(self) -> None:
+        if self._title_source is not self.title:
+            self._title_lower = self.title.lower()
+            self._title_tokens = frozenset(self._title_lower.split())
+            self._title_source = self.title
+
+    @property
+    def title_lower(self) -> str:
+        """Título em minúsculas, recalculado só quando o título muda"""
+        self._refresh_title_cache()
+        return self._title_lower
+
+    @property
+    def title_tokens(self) -> frozenset[str]:
+        """Palavras do título em minúsculas, recalculadas só quando o título muda"""
+        self._refresh_title_cache()
+        return self._title_tokens
 
     def mark_completed(self) -> None:
         self.status = TaskStatus.DONE
@@ -74,3 +95,16 @@ class Task:
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+class TaskAnalyticsRow(NamedTuple):
+    """Projeção leve de uma tarefa com apenas as colunas usadas pelo analytics"""
+    status: str
+    priority: str
+    created_at: Optional[datetime]
+    completed_at: Optional[datetime]
+    due_date: Optional[datetime]
+    estimated_duration: Optional[int]
+    tags: Optional[list[str]]
+    project_id: Optional[UUID]
+    updated_at: Optional[datetime]
@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from domain.entities.task import Task
+from domain.entities.task import Task, TaskAnalyticsRow
 from domain.value_objects.task_status import TaskStatus
 
 
@@ -11,6 +12,11 @@ class TaskRepository(ABC):
     async def create(self, task: Task) -> Task:
         pass
 
+    @abstractmethod
+    async def create_many(self, tasks: list[Task]) -> list[Task]:
+        """Insere várias tarefas de uma vez, na ordem recebida"""
+        pass
+
     @abstractmethod
     async def get_by_id(self, task_id: UUID) -> Optional[Task]:
         pass
@@ -37,6 +43,20 @@ class TaskRepository(ABC):
     async def delete(self, task_id: UUID) -> bool:
         pass
 
+    @abstractmethod
+    async def complete_by_id(self, task_id: UUID, user_id: UUID, completed_at: datetime) -> Optional[str]:
+        """Marca a tarefa do usuário como concluída; retorna o título ou None se não existir"""
+        pass
+
+    @abstractmethod
+    async def delete_by_id(self, task_id: UUID, user_id: UUID) -> Optional[str]:
+        """Remove a tarefa do usuário; retorna o título ou None se não existir"""
+        pass
+
     @abstractmethod
     async def get_subtasks(self, parent_task_id: UUID) -> list[Task]:
         pass
+
+    @abstractmethod
+    async def get_analytics_rows(self, user_id: UUID, limit: int = 10000) -> list[TaskAnalyticsRow]:
+        pass
@@ -2,11 +2,11 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import delete, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domain.entities.project import Project
-from domain.entities.task import Task
+from domain.entities.task import Task, TaskAnalyticsRow
 from domain.entities.user import User
 from domain.repositories.project_repository import ProjectRepository
 from domain.repositories.task_repository import TaskRepository
@@ -142,7 +142,19 @@ class PostgreSQLTaskRepository(TaskRepository):
         self.session = session
 
     async def create(self, task: Task) -> Task:
-        task_model = TaskModel(
+        task_model = self._to_model(task)
+        self.session.add(task_model)
+        await self.session.flush()
+        return self._to_entity(task_model)
+
+    async def create_many(self, tasks: list[Task]) -> list[Task]:
+        task_models = [self._to_model(task) for task in tasks]
+        self.session.add_all(task_models)
+        await self.session.flush()
+        return [self._to_entity(task_model) for task_model in task_models]
+
+    def _to_model(self, task: Task) -> TaskModel:
+        return TaskModel(
             id=task.id,
             user_id=task.user_id,
             project_id=task.project_id,
@@ -160,9 +172,6 @@ class PostgreSQLTaskRepository(TaskRepository):
             natural_language_input=task.natural_language_input,
             gpt_response=task.gpt_response,
         )
-        self.session.add(task_model)
-        await self.session.flush()
-        return self._to_entity(task_model)
 
     async def get_by_id(self, task_id: UUID) -> Optional[Task]:
         result = await self.session.execute(select(TaskModel).where(TaskModel.id == task_id))
@@ -240,6 +249,31 @@ class PostgreSQLTaskRepository(TaskRepository):
             return True
         return False
 
+    async def complete_by_id(self, task_id: UUID, user_id: UUID, completed_at: datetime) -> Optional[str]:
+        """Conclui a tarefa com um único UPDATE ... RETURNING, sem carregar o modelo antes"""
+        result = await self.session.execute(
+            update(TaskModel)
+            .where(TaskModel.id == task_id, TaskModel.user_id == user_id)
+            .values(
+                status=TaskStatus.DONE.value,
+                completed_at=completed_at,
+                updated_at=datetime.utcnow(),
+            )
+            .returning(TaskModel.title)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none()
+
+    async def delete_by_id(self, task_id: UUID, user_id: UUID) -> Optional[str]:
+        """Remove a tarefa com um único DELETE ... RETURNING, sem carregar o modelo antes"""
+        result = await self.session.execute(
+            delete(TaskModel)
+            .where(TaskModel.id == task_id, TaskModel.user_id == user_id)
+            .returning(TaskModel.title)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none()
+
     async def get_subtasks(self, parent_task_id: UUID) -> list[Task]:
         result = await self.session.execute(
             select(TaskModel).where(TaskModel.parent_task_id == parent_task_id)
@@ -247,6 +281,27 @@ class PostgreSQLTaskRepository(TaskRepository):
         task_models = result.scalars().all()
         return [self._to_entity(model) for model in task_models]
 
+    async def get_analytics_rows(self, user_id: UUID, limit: int = 10000) -> list[TaskAnalyticsRow]:
+        """Carrega só as colunas do analytics, sem hidratar modelos ORM nem entidades"""
+        query = (
+            select(
+                TaskModel.status,
+                TaskModel.priority,
+                TaskModel.created_at,
+                TaskModel.completed_at,
+                TaskModel.due_date,
+                TaskModel.estimated_duration,
+                TaskModel.tags,
+                TaskModel.project_id,
+                TaskModel.updated_at,
+            )
+            .where(TaskModel.user_id == user_id)
+            .order_by(TaskModel.created_at.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return [TaskAnalyticsRow._make(row) for row in result.all()]
+
     def _to_entity(self, model: TaskModel) -> Task:
         return Task(
             id=model.id,
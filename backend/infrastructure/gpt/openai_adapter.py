@@ -1,7 +1,7 @@
 import json
 import logging
 from datetime import datetime, timezone
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 from zoneinfo import ZoneInfo
 
 from openai import AsyncOpenAI, OpenAIError
@@ -180,24 +180,23 @@ Retorne apenas JSON válido seguindo o schema, sem texto adicional."""
         system_prompt: Optional[str] = None,
         response_format: Optional[dict] = None,
         temperature: float = 0.7,
-        max_tokens: int = 500
+        max_tokens: int = 500,
+        history: Optional[list[dict[str, str]]] = None
     ) -> dict[str, Any]:
-        """Generate a general completion from GPT with configurable parameters"""
-        try:
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
-
-            kwargs = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens,
-            }
+        """Generate a general completion from GPT with configurable parameters
 
-            if response_format:
-                kwargs["response_format"] = response_format
+        `history` holds earlier chat turns ({"role", "content"}) sent between the
+        system prompt and the prompt, keeping the request prefix stable across turns.
+        """
+        try:
+            kwargs = self.build_completion_body(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                response_format=response_format,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                history=history,
+            )
 
             response = await self.client.chat.completions.create(**kwargs)
 
@@ -214,6 +213,127 @@ Retorne apenas JSON válido seguindo o schema, sem texto adicional."""
             logger.error(f"GPT completion failed: {e}")
             raise
 
+    async def generate_completion_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        response_format: Optional[dict] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 500
+    ) -> AsyncIterator[str]:
+        """Stream a completion from GPT, yielding content deltas as they arrive
+
+        Closing the generator early (aclose) also closes the HTTP stream.
+        """
+        kwargs = self.build_completion_body(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            response_format=response_format,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
+        try:
+            stream = await self.client.chat.completions.create(stream=True, **kwargs)
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                await stream.close()
+        except Exception as e:
+            logger.error(f"GPT streaming completion failed: {e}")
+            raise
+
+    def build_completion_body(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        response_format: Optional[dict] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        history: Optional[list[dict[str, str]]] = None
+    ) -> dict[str, Any]:
+        """Build the chat completion request body shared by direct and batch calls"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        if history:
+            messages.extend(history)
+        messages.append({"role": "user", "content": prompt})
+
+        body = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+
+        if response_format:
+            body["response_format"] = response_format
+
+        return body
+
+    async def submit_batch(self, requests: list[dict[str, Any]]) -> str:
+        """Upload chat completion requests as JSONL and start an OpenAI batch
+
+        Each request is a dict with "custom_id" and "body" (see build_completion_body).
+        """
+        lines = [
+            json.dumps({
+                "custom_id": request["custom_id"],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": request["body"],
+            })
+            for request in requests
+        ]
+
+        try:
+            batch_file = await self.client.files.create(
+                file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch",
+            )
+            batch = await self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+        except OpenAIError as e:
+            logger.error(
+                "GPT batch submission failed",
+                extra={"error": str(e), "requests": len(requests)},
+            )
+            raise Exception(f"GPT batch submission failed: {str(e)}")
+
+        return batch.id
+
+    async def get_batch_results(self, batch_id: str) -> Optional[dict[str, Optional[str]]]:
+        """Return message content per custom_id, or None while the batch is not finished"""
+        batch = await self.client.batches.retrieve(batch_id)
+        if batch.status != "completed":
+            if batch.status in ("failed", "expired", "cancelled"):
+                raise Exception(f"GPT batch {batch_id} ended with status {batch.status}")
+            return None
+
+        if not batch.output_file_id:
+            return {}
+
+        output = await self.client.files.content(batch.output_file_id)
+        results: dict[str, Optional[str]] = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get("response") or {}
+            if response.get("status_code") != 200:
+                results[item["custom_id"]] = None
+                continue
+            choices = response.get("body", {}).get("choices") or [{}]
+            results[item["custom_id"]] = choices[0].get("message", {}).get("content")
+
+        return results
+
     def _calculate_cost(self, tokens: int) -> float:
         cost_per_1k_tokens = 0.03 if self.model == "gpt-4" else 0.002
         return (tokens / 1000) * cost_per_1k_tokens
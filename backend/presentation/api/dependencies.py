@@ -57,6 +57,7 @@ async def get_auth_service(session: AsyncSession = Depends(get_db_session)) -> A
         algorithm=settings.jwt_algorithm,
         access_token_expire_minutes=settings.access_token_expire_minutes,
         refresh_token_expire_days=settings.refresh_token_expire_days,
+        bcrypt_rounds=settings.bcrypt_rounds,
     )
 
 
@@ -1,15 +1,18 @@
 """
 AI Features API Routes
 """
+import json
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from application.services.ai_insights_service import AIInsightsService
 from application.services.chat_assistant_service import ChatAssistantService
+from domain.entities.task import Task
 from domain.entities.user import User
 from infrastructure.database.postgresql_repository import PostgreSQLTaskRepository
 from presentation.api.dependencies import get_current_user, get_db_session
@@ -177,7 +180,8 @@ async def get_ai_insights_service(
     
     return AIInsightsService(
         openai_adapter=openai_adapter,
-        provider="gpt4"
+        provider="gpt4",
+        max_concurrency=get_settings().llm_max_concurrency
     )
 
 
@@ -222,6 +226,31 @@ async def get_chat_assistant_service(
     return service
 
 
+async def _load_task_with_context(
+    repo: PostgreSQLTaskRepository,
+    task_id: UUID,
+    user_id: UUID,
+    limit: int,
+) -> Tuple[Task, List[Task]]:
+    """Load the user's recent tasks and pick the target task from them.
+
+    The target is only fetched separately when it falls outside the loaded page,
+    saving a database round trip in the common case.
+    """
+    context_tasks, _ = await repo.get_by_user_id(user_id, limit=limit)
+    task = next((t for t in context_tasks if t.id == task_id), None)
+    if task is None:
+        task = await repo.get_by_id(task_id)
+
+    if not task or task.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+
+    return task, context_tasks
+
+
 @router.post("/subtasks/suggest", response_model=SubtaskSuggestionsResponse)
 async def suggest_subtasks(
     request: SubtaskSuggestionRequest,
@@ -322,17 +351,14 @@ async def suggest_scheduling(
     """Suggest best time to schedule a task"""
     try:
         repo = PostgreSQLTaskRepository(session)
-        task = await repo.get_by_id(UUID(request.task_id))
-        
-        if not task or task.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Task not found"
-            )
-        
-        all_tasks, _ = await repo.get_by_user_id(current_user.id, limit=1000)
+        task, context_tasks = await _load_task_with_context(
+            repo,
+            UUID(request.task_id),
+            current_user.id,
+            limit=AIInsightsService.SCHEDULING_CONTEXT_SIZE,
+        )
         
-        suggestion = await ai_service.suggest_scheduling(task, all_tasks)
+        suggestion = await ai_service.suggest_scheduling(task, context_tasks)
         return SchedulingSuggestionResponse(**suggestion)
     except HTTPException:
         raise
@@ -354,15 +380,9 @@ async def detect_dependencies(
     """Detect potential dependencies between tasks"""
     try:
         repo = PostgreSQLTaskRepository(session)
-        task = await repo.get_by_id(UUID(request.task_id))
-        
-        if not task or task.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Task not found"
-            )
-        
-        all_tasks, _ = await repo.get_by_user_id(current_user.id, limit=1000)
+        task, all_tasks = await _load_task_with_context(
+            repo, UUID(request.task_id), current_user.id, limit=1000
+        )
         
         dependencies = await ai_service.detect_dependencies(task, all_tasks)
         
@@ -461,6 +481,66 @@ async def chat_message(
         )
 
 
+_CHAT_STREAM_ERROR = ChatMessageResponse(
+    message="Desculpe, ocorreu um erro. Tente novamente ou digite 'ajuda' para ver os comandos disponíveis.",
+    action=None,
+).model_dump(mode="json")
+
+
+def _sse_event(event: Dict[str, Any]) -> str:
+    return f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+@router.post("/chat/stream")
+async def chat_message_stream(
+    request: ChatMessageRequest,
+    current_user: User = Depends(get_current_user),
+    chat_service: ChatAssistantService = Depends(get_chat_assistant_service),
+    session: AsyncSession = Depends(get_db_session),
+):
+    """Process a chat message streaming the answer as server-sent events
+
+    Emits `delta` events while GPT writes free-form answers and a final `done`
+    event carrying the same payload as POST /ai/chat.
+    """
+    repo = PostgreSQLTaskRepository(session)
+    tasks, _ = await repo.get_by_user_id(current_user.id, limit=1000)
+
+    logger.info(
+        f"Chat stream started",
+        extra={
+            "user_id": str(current_user.id),
+            "message_length": len(request.message),
+            "tasks_count": len(tasks),
+        }
+    )
+
+    async def events():
+        try:
+            async for event in chat_service.process_message_stream(
+                message=request.message,
+                user_tasks=tasks
+            ):
+                if event["type"] == "done":
+                    event = {
+                        "type": "done",
+                        "response": ChatMessageResponse(**event["response"]).model_dump(mode="json"),
+                    }
+                yield _sse_event(event)
+        except Exception as e:
+            logger.error(
+                f"Chat stream failed: {str(e)}",
+                exc_info=True,
+                extra={
+                    "user_id": str(current_user.id),
+                    "error_type": type(e).__name__,
+                }
+            )
+            yield _sse_event({"type": "done", "response": _CHAT_STREAM_ERROR})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @router.get("/agent/status")
 async def get_agent_status(
     current_user: User = Depends(get_current_user),
@@ -540,7 +620,7 @@ async def execute_chat_action(
                 from domain.utils.datetime_utils import BRAZIL_TZ
                 try:
                     if "T" in due_date_str:
-                        due_date = datetime.fromisoformat(due_date_str.replace("Z", "+00:00"))
+                        due_date = datetime.fromisoformat(due_date_str)
                         if due_date.tzinfo is not None and str(due_date.tzinfo) != "America/Sao_Paulo":
                             due_date = due_date.astimezone(BRAZIL_TZ)
                     elif " " in due_date_str:
@@ -1,6 +1,7 @@
 """
 Analytics API Routes
 """
+import asyncio
 import logging
 from typing import Optional
 from fastapi import APIRouter, Depends, Query
@@ -9,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from application.services.analytics_service import AnalyticsService
 from application.services.notification_service import NotificationService
 from domain.entities.user import User
+from domain.utils.datetime_utils import now_brazil
 from infrastructure.database.postgresql_repository import PostgreSQLTaskRepository
 from presentation.api.dependencies import get_current_user, get_db_session
 from pydantic import BaseModel
@@ -65,10 +67,16 @@ async def get_analytics_report(
         )
 
         repo = PostgreSQLTaskRepository(session)
-        tasks, _ = await repo.get_by_user_id(current_user.id, limit=10000)
+        tasks = await repo.get_analytics_rows(current_user.id)
 
         analytics_service = AnalyticsService()
-        report = analytics_service.generate_full_report(tasks, period_days=period_days)
+        # Relatório é CPU-bound; roda numa thread para não travar o event loop
+        report = await asyncio.to_thread(
+            analytics_service.generate_full_report,
+            tasks,
+            period_days=period_days,
+            user_id=current_user.id,
+        )
 
         logger.info(f"Analytics report generated successfully for user {current_user.id}")
 
@@ -90,10 +98,16 @@ async def get_insights(
     """
     try:
         repo = PostgreSQLTaskRepository(session)
-        tasks, _ = await repo.get_by_user_id(current_user.id, limit=10000)
+        tasks = await repo.get_analytics_rows(current_user.id)
 
         analytics_service = AnalyticsService()
-        report = analytics_service.generate_full_report(tasks, period_days=period_days)
+        # Relatório é CPU-bound; roda numa thread para não travar o event loop
+        report = await asyncio.to_thread(
+            analytics_service.generate_full_report,
+            tasks,
+            period_days=period_days,
+            user_id=current_user.id,
+        )
         insights = analytics_service.generate_insights(report)
 
         return InsightsResponse(
@@ -127,12 +141,13 @@ async def get_notifications(
         repo = PostgreSQLTaskRepository(session)
         tasks, _ = await repo.get_by_user_id(current_user.id, limit=10000)
 
+        now = now_brazil()
         notification_service = NotificationService()
         notifications = notification_service.get_tasks_requiring_notification(
-            tasks, hours_ahead=hours_ahead
+            tasks, hours_ahead=hours_ahead, now=now
         )
 
-        message = notification_service.format_notification_message(notifications)
+        message = notification_service.format_notification_message(notifications, now=now)
         summary = notification_service.get_notification_summary(notifications)
 
         result = {
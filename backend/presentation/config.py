@@ -10,10 +10,12 @@ class Settings(BaseSettings):
     redis_url: str = "redis://localhost:6379"
     openai_api_key: str = ""
     openai_model: str = "gpt-4"
+    llm_max_concurrency: int = 10
     jwt_secret_key: str = "your-secret-key-change-in-production"
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
+    bcrypt_rounds: int = 12
     environment: str = "development"
     log_level: str = "INFO"
     cors_origins: str | list[str] = ["http://localhost:3000", "http://localhost:5173"]
@@ -0,0 +1,258 @@
+import pytest
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from application.services import ai_insights_service
+from application.services.ai_insights_service import AIInsightsService
+from domain.entities.task import Task
+from domain.utils.datetime_utils import now_brazil
+from domain.value_objects.priority import Priority
+from domain.value_objects.task_status import TaskStatus
+from infrastructure.gpt.openai_adapter import OpenAIAdapter
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    ai_insights_service._SUBTASKS_CACHE.clear()
+    ai_insights_service._SCHEDULING_CACHE.clear()
+
+
+@pytest.fixture
+def mock_openai_adapter():
+    adapter = MagicMock(spec=OpenAIAdapter)
+    adapter.generate_completion = AsyncMock()
+    return adapter
+
+
+@pytest.fixture
+def ai_service(mock_openai_adapter):
+    return AIInsightsService(openai_adapter=mock_openai_adapter, provider="gpt4")
+
+
+@pytest.mark.asyncio
+async def test_analyze_sentiment_urgency_neutral(ai_service):
+    result = await ai_service.analyze_sentiment_urgency("Organizar a mesa")
+
+    assert result["priority"] == "medium"
+    assert result["urgency_score"] == 0.5
+    assert result["sentiment"] == "neutral"
+
+
+@pytest.mark.asyncio
+async def test_analyze_sentiment_urgency_strongest_level_wins(ai_service):
+    result = await ai_service.analyze_sentiment_urgency(
+        "Quando der, revisar o relatório importante. URGENTE!"
+    )
+
+    assert result["priority"] == "high"
+    assert result["urgency_score"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_analyze_sentiment_urgency_low_phrase(ai_service):
+    result = await ai_service.analyze_sentiment_urgency("Ler aquele livro algum dia")
+
+    assert result["priority"] == "low"
+    assert result["urgency_score"] == 0.2
+
+
+@pytest.mark.asyncio
+async def test_analyze_sentiment_positive_wins_over_negative(ai_service):
+    negative = await ai_service.analyze_sentiment_urgency("Corrigir erro no login")
+    mixed = await ai_service.analyze_sentiment_urgency("Ótimo, o bug foi encontrado")
+
+    assert negative["sentiment"] == "negative"
+    assert mixed["sentiment"] == "positive"
+
+
+@pytest.mark.asyncio
+async def test_suggest_subtasks_many_returns_results_in_order(ai_service, mock_openai_adapter):
+    async def fake_completion(prompt, **kwargs):
+        title = "A" if "Tarefa: Primeira" in prompt else "B"
+        return {"content": f'{{"subtasks": [{{"title": "{title}"}}]}}'}
+
+    mock_openai_adapter.generate_completion = AsyncMock(side_effect=fake_completion)
+
+    results = await ai_service.suggest_subtasks_many([("Primeira", None), ("Segunda", "desc")])
+
+    assert [r[0]["title"] for r in results] == ["A", "B"]
+    assert mock_openai_adapter.generate_completion.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_suggest_subtasks_reuses_cache_for_near_identical_titles(ai_service, mock_openai_adapter):
+    mock_openai_adapter.generate_completion = AsyncMock(
+        return_value={"content": '{"subtasks": [{"title": "Rodar testes"}]}'}
+    )
+
+    first = await ai_service.suggest_subtasks("Deploy to production")
+    second = await ai_service.suggest_subtasks("deploy to  production!")
+
+    assert first == second
+    mock_openai_adapter.generate_completion.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_suggest_subtasks_cache_is_not_mutated_by_callers(ai_service, mock_openai_adapter):
+    mock_openai_adapter.generate_completion = AsyncMock(
+        return_value={"content": '{"subtasks": [{"title": "Rodar testes"}]}'}
+    )
+
+    first = await ai_service.suggest_subtasks("Deploy to production")
+    first[0]["title"] = "Alterado"
+    second = await ai_service.suggest_subtasks("Deploy to production")
+    second.append({"title": "Extra"})
+    third = await ai_service.suggest_subtasks("Deploy to production")
+
+    assert [s["title"] for s in second] == ["Rodar testes", "Extra"]
+    assert [s["title"] for s in third] == ["Rodar testes"]
+
+
+@pytest.mark.asyncio
+async def test_suggest_scheduling_cache_is_not_mutated_by_callers(ai_service, mock_openai_adapter):
+    mock_openai_adapter.generate_completion = AsyncMock(return_value={"content": (
+        '{"suggestion": "Amanhã cedo", "suggested_time": "09:00", "reason": "Livre", "confidence": 0.8}'
+    )})
+    task = Task(user_id=uuid4(), title="Relatório")
+
+    first = await ai_service._suggest_scheduling_gpt(task, [])
+    first["reason"] = "Alterado"
+    second = await ai_service._suggest_scheduling_gpt(task, [])
+
+    assert second["reason"] == "Livre"
+    mock_openai_adapter.generate_completion.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_suggest_subtasks_stream_yields_items_incrementally(ai_service, mock_openai_adapter):
+    chunks = ['{"subt', 'asks": [{"title": "Um", "estimated_duration": 30}', ', {"title": "Do', 'is"}]}']
+    consumed = []
+
+    async def fake_stream(**kwargs):
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    mock_openai_adapter.generate_completion_stream = fake_stream
+
+    received = []
+    async for subtask in ai_service.suggest_subtasks_stream("Planejar viagem"):
+        received.append((subtask["title"], len(consumed)))
+
+    assert received == [("Um", 2), ("Dois", 4)]
+
+
+@pytest.mark.asyncio
+async def test_suggest_subtasks_stream_releases_gate_before_yielding(mock_openai_adapter):
+    async def fake_stream(**kwargs):
+        yield '{"subtasks": [{"title": "Um", "estimated_duration": 30}'
+        yield ', {"title": "Dois"}]}'
+
+    mock_openai_adapter.generate_completion_stream = fake_stream
+    service = AIInsightsService(openai_adapter=mock_openai_adapter, provider="gpt4", max_concurrency=1)
+
+    stream = service.suggest_subtasks_stream("Planejar viagem")
+    first = await anext(stream)
+
+    assert first["title"] == "Um"
+    assert not service._llm_gate.locked()
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_suggest_subtasks_stream_cache_hit_yields_copies(ai_service, mock_openai_adapter):
+    async def fake_stream(**kwargs):
+        yield '{"subtasks": [{"title": "Um", "estimated_duration": 30}]}'
+
+    mock_openai_adapter.generate_completion_stream = fake_stream
+
+    first = [subtask async for subtask in ai_service.suggest_subtasks_stream("Planejar viagem")]
+    first[0]["title"] = "Alterado"
+    second = [subtask async for subtask in ai_service.suggest_subtasks_stream("Planejar viagem")]
+
+    assert second[0]["title"] == "Um"
+
+
+@pytest.mark.asyncio
+async def test_generate_summary_counts_and_pending_order(ai_service):
+    user_id = uuid4()
+    now = now_brazil()
+    tasks = [
+        Task(user_id=user_id, title="Em andamento", status=TaskStatus.IN_PROGRESS, priority=Priority.ALTA),
+        Task(user_id=user_id, title="A fazer", status=TaskStatus.TODO, priority=Priority.URGENTE,
+             due_date=now - timedelta(days=1)),
+        Task(user_id=user_id, title="Feita", status=TaskStatus.DONE, actual_duration=90,
+             completed_at=now),
+        Task(user_id=user_id, title="Cancelada", status=TaskStatus.CANCELLED),
+    ]
+
+    summary = await ai_service.generate_summary(tasks, "daily")
+
+    assert summary["summary"] == {"completed": 1, "in_progress": 1, "todo": 1, "total_time_minutes": 90}
+    assert [t["title"] for t in summary["high_priority_pending"]] == ["A fazer", "Em andamento"]
+    assert summary["top_completed"] == [{"title": "Feita", "priority": "media"}]
+    assert any("1 tarefas estão atrasadas" in insight for insight in summary["insights"])
+
+
+@pytest.mark.asyncio
+async def test_generate_summary_without_tasks(ai_service):
+    summary = await ai_service.generate_summary([], "weekly")
+
+    assert summary["summary"] == {"completed": 0, "in_progress": 0, "todo": 0, "total_time_minutes": 0}
+    assert summary["insights"] == ["📋 Você não tem tarefas ativas. Crie novas tarefas para começar!"]
+    assert len(summary["recommendations"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_detect_dependencies_related_and_blocking(ai_service):
+    user_id = uuid4()
+    task = Task(user_id=user_id, title="Testar fluxo de pagamento")
+    related = Task(user_id=user_id, title="Revisar fluxo de pagamento")
+    blocking = Task(user_id=user_id, title="Desenvolver API")
+    done = Task(user_id=user_id, title="Documentar fluxo de pagamento", status=TaskStatus.DONE)
+
+    dependencies = await ai_service.detect_dependencies(task, [task, related, blocking, done])
+
+    assert [(d["task_title"], d["relationship"]) for d in dependencies] == [
+        ("Desenvolver API", "blocks"),
+        ("Revisar fluxo de pagamento", "related"),
+    ]
+    assert dependencies[1]["confidence"] == 0.75
+
+
+@pytest.mark.asyncio
+async def test_estimate_duration_blends_similar_history(ai_service):
+    user_id = uuid4()
+    history = [
+        Task(user_id=user_id, title="Relatório mensal de vendas", actual_duration=120),
+        Task(user_id=user_id, title="Pagar contas", actual_duration=10),
+        Task(user_id=user_id, title="Relatório trimestral"),
+    ]
+
+    duration = await ai_service.estimate_duration("Relatório anual", historical_tasks=history)
+
+    assert duration == 90
+
+
+@pytest.mark.asyncio
+async def test_subtasks_batch_requires_gpt4_provider(mock_openai_adapter):
+    service = AIInsightsService(openai_adapter=mock_openai_adapter, provider="none")
+
+    with pytest.raises(ValueError):
+        await service.submit_subtasks_batch([("Deploy", None)])
+    with pytest.raises(ValueError):
+        await service.get_subtasks_batch_results("batch_1")
+
+
+@pytest.mark.asyncio
+async def test_subtasks_batch_results_keep_failed_items_as_none(ai_service, mock_openai_adapter):
+    mock_openai_adapter.get_batch_results = AsyncMock(return_value={
+        "0": '{"subtasks": [{"title": "Rodar testes"}]}',
+        "1": '{"subtasks": []}',
+        "2": None,
+    })
+
+    results = await ai_service.get_subtasks_batch_results("batch_1")
+
+    assert results == {"0": [{"title": "Rodar testes"}], "1": [], "2": None}
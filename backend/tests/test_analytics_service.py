@@ -0,0 +1,128 @@
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+from uuid import uuid4
+
+from application.services import analytics_service
+from application.services.analytics_service import AnalyticsService
+from domain.entities.task import Task, TaskAnalyticsRow
+from domain.utils.datetime_utils import now_brazil
+from domain.value_objects.priority import Priority
+from domain.value_objects.task_status import TaskStatus
+
+
+@pytest.fixture(autouse=True)
+def clear_report_cache():
+    analytics_service._REPORT_CACHE.clear()
+
+
+def _build_tasks():
+    user_id = uuid4()
+    now = now_brazil()
+    return [
+        Task(user_id=user_id, title="Atrasada", status=TaskStatus.TODO, priority=Priority.URGENTE,
+             due_date=now - timedelta(days=3), estimated_duration=60, tags=["trabalho"]),
+        Task(user_id=user_id, title="Em andamento", status=TaskStatus.IN_PROGRESS, priority=Priority.HIGH,
+             estimated_duration=30, tags=["trabalho", "casa"]),
+        Task(user_id=user_id, title="Feita no prazo", status=TaskStatus.DONE, priority=Priority.LOW,
+             created_at=now - timedelta(hours=5), completed_at=now - timedelta(hours=1),
+             due_date=now + timedelta(days=1)),
+        Task(user_id=user_id, title="Cancelada", status=TaskStatus.CANCELADA, project_id=uuid4()),
+    ]
+
+
+def test_generate_full_report_aggregates_every_section():
+    report = AnalyticsService().generate_full_report(_build_tasks(), period_days=7)
+
+    assert report["summary"] == {
+        "total_tasks": 4,
+        "active_tasks": 2,
+        "completed_tasks": 1,
+        "cancelled_tasks": 1,
+        "completion_rate": 25.0,
+        "cancellation_rate": 25.0,
+    }
+    assert report["completion"]["completed_in_period"] == 1
+    assert report["completion"]["avg_completion_time_hours"] == 4.0
+    assert report["completion"]["on_time_rate"] == 100.0
+    assert report["priority_distribution"] == {"urgente": 1, "alta": 1, "media": 0, "baixa": 0}
+    assert report["status_distribution"] == {
+        "pending": 0, "todo": 1, "in_progress": 1, "done": 1, "cancelled": 1
+    }
+    assert report["time_analysis"]["overdue_count"] == 1
+    assert report["time_analysis"]["total_estimated_hours"] == 1.5
+    assert report["overdue_analysis"]["total_overdue"] == 1
+    assert report["overdue_analysis"]["max_days_overdue"] == 3
+    assert len(report["trends"]["daily_trends"]) == 8
+    assert report["tags_analysis"]["most_used_tags"][0] == {"tag": "trabalho", "count": 2}
+    assert report["project_distribution"]["tasks_without_project"] == 3
+
+
+def test_sub_reports_match_full_report():
+    service = AnalyticsService()
+    tasks = _build_tasks()
+    report = service.generate_full_report(tasks)
+
+    assert service.get_summary_stats(tasks) == report["summary"]
+    assert service.get_priority_distribution(tasks) == report["priority_distribution"]
+    assert service.get_overdue_analysis(tasks) == report["overdue_analysis"]
+
+
+def test_sub_reports_use_given_reference_time():
+    service = AnalyticsService()
+    tasks = _build_tasks()
+    later = now_brazil() + timedelta(days=10)
+
+    assert service.get_overdue_analysis(tasks, now=later)["max_days_overdue"] == 13
+    assert service.get_time_analysis(tasks, now=later)["overdue_count"] == 1
+    assert len(service.get_trends(tasks, days=3, now=later)["daily_trends"]) == 4
+
+
+def test_analytics_rows_produce_same_report_as_entities():
+    service = AnalyticsService()
+    tasks = _build_tasks()
+    rows = [
+        TaskAnalyticsRow(
+            status=t.status.value,
+            priority=t.priority.value,
+            created_at=t.created_at,
+            completed_at=t.completed_at,
+            due_date=t.due_date,
+            estimated_duration=t.estimated_duration,
+            tags=t.tags or None,
+            project_id=t.project_id,
+            updated_at=t.updated_at,
+        )
+        for t in tasks
+    ]
+
+    assert service.generate_full_report(rows) == service.generate_full_report(tasks)
+
+
+def test_generate_full_report_without_tasks():
+    service = AnalyticsService()
+    report = service.generate_full_report([], period_days=7)
+
+    assert report["summary"]["total_tasks"] == 0
+    assert report["status_distribution"]["done"] == 0
+    assert [day["created"] for day in report["trends"]["daily_trends"]] == [0] * 8
+    assert report["overdue_analysis"]["total_overdue"] == 0
+    assert service.generate_insights(report) == [
+        "📋 Você ainda não tem tarefas cadastradas. Comece criando sua primeira tarefa!"
+    ]
+
+
+def test_generate_full_report_reuses_cached_report_until_tasks_change():
+    service = AnalyticsService()
+    tasks = _build_tasks()
+    user_id = tasks[0].user_id
+
+    with patch.object(AnalyticsService, "_collect", wraps=service._collect) as collect:
+        first = service.generate_full_report(tasks, user_id=user_id)
+        first["summary"]["total_tasks"] = -1
+        second = service.generate_full_report(tasks, user_id=user_id)
+        tasks[0].updated_at = now_brazil() + timedelta(seconds=1)
+        service.generate_full_report(tasks, user_id=user_id)
+
+    assert second["summary"]["total_tasks"] == 4
+    assert collect.call_count == 2
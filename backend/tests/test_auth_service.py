@@ -1,12 +1,21 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
+from jose import jwt
+
+from application.services import auth_service as auth_module
 from application.services.auth_service import AuthService
 from domain.entities.user import User
 from domain.repositories.user_repository import UserRepository
 
 
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    auth_module._TOKEN_CACHE.clear()
+
+
 @pytest.fixture
 def mock_user_repository():
     repo = MagicMock(spec=UserRepository)
@@ -152,3 +161,39 @@ def test_hash_and_verify_password(auth_service):
     assert hashed != password
     assert auth_service.verify_password(password, hashed)
     assert not auth_service.verify_password("wrong_password", hashed)
+
+
+def test_password_context_is_shared_and_honors_rounds(mock_user_repository):
+    fast = AuthService(user_repository=mock_user_repository, secret_key="k", bcrypt_rounds=4)
+    other = AuthService(user_repository=mock_user_repository, secret_key="k", bcrypt_rounds=4)
+
+    hashed = fast.hash_password("password123")
+
+    assert fast.pwd_context is other.pwd_context
+    assert hashed.startswith("$2b$04$")
+    assert AuthService(user_repository=mock_user_repository, secret_key="k").verify_password(
+        "password123", hashed
+    )
+
+
+def test_verify_token_reuses_verified_payload(auth_service):
+    token = auth_service.create_access_token(uuid4(), "test@example.com")
+
+    with patch.object(auth_module.jwt, "decode", wraps=jwt.decode) as decode:
+        first = auth_service.verify_token(token, "access")
+        second = auth_service.verify_token(token, "access")
+        wrong_type = auth_service.verify_token(token, "refresh")
+
+    assert first == second
+    assert wrong_type is None
+    decode.assert_called_once()
+
+
+def test_verify_token_rejects_expired_cached_payload(auth_service):
+    exp = datetime.utcnow() - timedelta(minutes=1)
+    token = jwt.encode({"sub": str(uuid4()), "type": "access", "exp": exp}, "test-secret-key", algorithm="HS256")
+    auth_module._TOKEN_CACHE.set(
+        ("test-secret-key", "HS256", token), jwt.get_unverified_claims(token)
+    )
+
+    assert auth_service.verify_token(token, "access") is None
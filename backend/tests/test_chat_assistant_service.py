@@ -0,0 +1,401 @@
+import pytest
+from datetime import timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from application.services import chat_assistant_service
+from application.services.chat_assistant_service import ChatAssistantService
+from domain.entities.task import Task
+from domain.utils.datetime_utils import now_brazil
+from domain.value_objects.priority import Priority
+from domain.value_objects.task_status import TaskStatus
+from infrastructure.gpt.openai_adapter import OpenAIAdapter
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    chat_assistant_service._INTENT_CACHE.clear()
+    chat_assistant_service._EXTRACT_CACHE.clear()
+    chat_assistant_service._ANSWER_CACHE.clear()
+
+
+@pytest.fixture
+def mock_openai_adapter():
+    adapter = MagicMock(spec=OpenAIAdapter)
+    adapter.generate_completion = AsyncMock(return_value={"content": "general"})
+    return adapter
+
+
+@pytest.fixture
+def chat_service(mock_openai_adapter):
+    return ChatAssistantService(openai_adapter=mock_openai_adapter)
+
+
+def test_quick_intent_check_ignores_accents(chat_service):
+    assert chat_service._quick_intent_check("olá") == "greeting"
+    assert chat_service._quick_intent_check("e ai") == "greeting"
+    assert chat_service._quick_intent_check("o que você faz") == "about_system"
+    assert chat_service._quick_intent_check("deixa pra la") == "confirm_no"
+
+
+def test_quick_intent_check_prefix_verbs(chat_service):
+    assert chat_service._quick_intent_check("criar relatório") == "create_task"
+    assert chat_service._quick_intent_check("finalizar deploy") == "complete_task"
+    assert chat_service._quick_intent_check("remover reunião") == "delete_task"
+    assert chat_service._quick_intent_check("criarrelatorio") is None
+
+
+def test_quick_intent_check_digit_requires_selection_context(chat_service):
+    assert chat_service._quick_intent_check("2") is None
+
+    chat_service.last_action_context = "complete"
+
+    assert chat_service._quick_intent_check("2") == "select_complete"
+
+
+def test_conversation_context_uses_last_two_assistant_messages(chat_service):
+    chat_service._remember_assistant_context("Qual delas? Digite o número da tarefa.")
+    chat_service._remember_assistant_context("Por nada!")
+
+    assert chat_service._get_conversation_context() == "awaiting_selection"
+
+    chat_service._remember_assistant_context("Ok, sem problemas!")
+
+    assert chat_service._get_conversation_context() is None
+
+
+@pytest.mark.asyncio
+async def test_task_status_ignores_closed_tasks_in_alerts(chat_service):
+    user_id = uuid4()
+    now = now_brazil()
+    tasks = [
+        Task(user_id=user_id, title="Atrasada", status=TaskStatus.TODO, priority=Priority.HIGH,
+             due_date=now - timedelta(days=2)),
+        Task(user_id=user_id, title="Hoje", status=TaskStatus.IN_PROGRESS, priority=Priority.LOW,
+             due_date=now + timedelta(minutes=1)),
+        Task(user_id=user_id, title="Cancelada", status=TaskStatus.CANCELLED, priority=Priority.URGENT,
+             due_date=now - timedelta(days=2)),
+        Task(user_id=user_id, title="Feita", status=TaskStatus.DONE),
+    ]
+
+    response = await chat_service.process_message("meu progresso", tasks)
+
+    assert response["data"]["total"] == 4
+    assert response["data"]["done"] == 1
+    assert response["data"]["overdue"] == 1
+    assert response["data"]["high_priority_pending"] == 1
+
+
+@pytest.mark.asyncio
+async def test_detect_intent_uses_keywords_before_gpt(chat_service, mock_openai_adapter):
+    assert await chat_service._detect_intent("pode listar minhas tarefas?") == "list_tasks"
+    assert await chat_service._detect_intent("olá! quero criar uma tarefa") == "create_task"
+    assert await chat_service._detect_intent("depois vejo") == "general"
+    mock_openai_adapter.generate_completion.assert_not_awaited()
+
+    await chat_service._detect_intent("reunião com cliente às 14h")
+
+    mock_openai_adapter.generate_completion.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_gpt_intent_is_cached_per_message_and_context(chat_service, mock_openai_adapter):
+    mock_openai_adapter.generate_completion = AsyncMock(return_value={"content": "create_task"})
+
+    first = await chat_service._detect_intent_with_gpt("reunião com cliente às 14h")
+    second = await chat_service._detect_intent_with_gpt("reunião com cliente às 14h")
+
+    assert first == second == "create_task"
+    mock_openai_adapter.generate_completion.assert_awaited_once()
+
+    chat_service._remember_assistant_context("Qual delas? Digite o número da tarefa.")
+    await chat_service._detect_intent_with_gpt("reunião com cliente às 14h")
+
+    assert mock_openai_adapter.generate_completion.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_gpt_intent_sends_recent_turns_as_history(chat_service, mock_openai_adapter):
+    await chat_service.process_message("oi", [])
+    await chat_service._detect_intent_with_gpt("reunião com cliente às 14h")
+
+    kwargs = mock_openai_adapter.generate_completion.await_args.kwargs
+    assert [m["role"] for m in kwargs["history"]] == ["user", "assistant"]
+    assert kwargs["history"][0]["content"] == "oi"
+    assert kwargs["prompt"].startswith("MENSAGEM ATUAL DO USUÁRIO")
+
+
+@pytest.mark.asyncio
+async def test_execute_complete_uses_single_repository_call(mock_openai_adapter):
+    user_id = uuid4()
+    task_id = uuid4()
+    repo = MagicMock()
+    repo.complete_by_id = AsyncMock(return_value="Relatório")
+    service = ChatAssistantService(openai_adapter=mock_openai_adapter, task_repository=repo, user_id=user_id)
+
+    result = await service.execute_action("complete", {"task_id": str(task_id)})
+
+    assert result["success"] is True
+    assert result["task"]["title"] == "Relatório"
+    repo.complete_by_id.assert_awaited_once()
+    assert repo.complete_by_id.await_args.args[:2] == (task_id, user_id)
+    repo.get_by_id.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_execute_delete_reports_missing_task(mock_openai_adapter):
+    repo = MagicMock()
+    repo.delete_by_id = AsyncMock(return_value=None)
+    service = ChatAssistantService(openai_adapter=mock_openai_adapter, task_repository=repo, user_id=uuid4())
+
+    result = await service.execute_action("delete", {"task_id": str(uuid4())})
+
+    assert result == {"success": False, "message": "Tarefa não encontrada"}
+
+
+@pytest.mark.asyncio
+async def test_execute_action_rejects_invalid_task_id(mock_openai_adapter):
+    repo = MagicMock()
+    service = ChatAssistantService(openai_adapter=mock_openai_adapter, task_repository=repo, user_id=uuid4())
+
+    result = await service.execute_action("delete", {"task_id": "não-é-uuid"})
+
+    assert result == {"success": False, "message": "ID inválido"}
+    repo.delete_by_id.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_history_returns_plain_dicts(chat_service):
+    await chat_service.process_message("oi", [])
+
+    history = chat_service.get_history()
+
+    assert [m["role"] for m in history] == ["user", "assistant"]
+    assert history[0]["content"] == "oi"
+    assert set(history[0]) == {"role", "content", "timestamp"}
+
+    chat_service.clear_history()
+
+    assert chat_service.get_history() == []
+
+
+def test_thanks_replies_rotate(chat_service):
+    replies = [chat_service._handle_thanks()["message"] for _ in range(5)]
+
+    assert len(set(replies[:4])) == 4
+    assert replies[4] == replies[0]
+
+
+def test_detect_intent_fallback_matches_whole_words(chat_service):
+    assert chat_service._detect_intent_fallback("oi!") == "greeting"
+    assert chat_service._detect_intent_fallback("depois eu vejo") == "general"
+    assert chat_service._detect_intent_fallback("boa noite, nova tarefa") == "greeting"
+    assert chat_service._detect_intent_fallback("ver minhas tarefas") == "list_tasks"
+
+
+def test_list_filter_uses_first_filter_in_priority_order(chat_service):
+    assert chat_service._match_list_filter("tarefas urgentes de hoje") == ("today", "hoje")
+    assert chat_service._match_list_filter("listar atrasadas") == ("overdue", "atrasadas")
+    assert chat_service._match_list_filter("em progresso") == ("in_progress", "em progresso")
+    assert chat_service._match_list_filter("minhas tarefas") == (None, "")
+
+
+@pytest.mark.asyncio
+async def test_list_urgent_tasks_filters_by_priority(chat_service):
+    user_id = uuid4()
+    tasks = [
+        Task(user_id=user_id, title="Deploy", priority=Priority.URGENTE),
+        Task(user_id=user_id, title="Relatório", priority=Priority.HIGH),
+        Task(user_id=user_id, title="Email", priority=Priority.LOW),
+    ]
+
+    response = await chat_service.process_message("listar urgentes", tasks)
+
+    assert [t["title"] for t in response["data"]] == ["Deploy"]
+
+
+def fake_stream(chunks, consumed):
+    async def stream(**kwargs):
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+    return stream
+
+
+@pytest.mark.asyncio
+async def test_extract_task_info_is_cached_per_message(chat_service, mock_openai_adapter):
+    consumed = []
+    mock_openai_adapter.generate_completion_stream = fake_stream(
+        ['{"title": "Reunião", "due_date": null, "priority": "high"}'], consumed
+    )
+
+    first = await chat_service._extract_task_info_with_gpt("criar reunião")
+    second = await chat_service._extract_task_info_with_gpt("  Criar reunião ")
+
+    assert first == second == {"title": "Reunião", "due_date": None, "priority": "high"}
+    assert len(consumed) == 1
+
+
+@pytest.mark.asyncio
+async def test_extract_task_info_stops_stream_after_json_object(chat_service, mock_openai_adapter):
+    consumed = []
+    mock_openai_adapter.generate_completion_stream = fake_stream(
+        ['```json\n{"title": "Pagar {conta}", ', '"due_date": null, "priority": "low"}', "\n```", " Espero ter ajudado!"],
+        consumed,
+    )
+
+    task_info = await chat_service._extract_task_info_with_gpt("pagar conta")
+
+    assert task_info == {"title": "Pagar {conta}", "due_date": None, "priority": "low"}
+    assert len(consumed) == 2
+
+
+def test_match_titles_finds_any_keyword_substring():
+    user_id = uuid4()
+    tasks = [Task(user_id=user_id, title=title) for title in ("Relatório mensal", "Enviar email", "Deploy")]
+    normalized = chat_assistant_service._normalize_tasks(tasks)
+
+    assert [t.title for t in chat_assistant_service._match_titles(normalized, ["relat"])] == ["Relatório mensal"]
+    assert [t.title for t in chat_assistant_service._match_titles(normalized, ["email", "deploy"])] == [
+        "Enviar email", "Deploy",
+    ]
+
+
+def test_list_filter_matches_whole_words(chat_service):
+    assert chat_service._match_list_filter("mostrar todos") == (None, "")
+    assert chat_service._match_list_filter("comprar chocolate") == (None, "")
+    assert chat_service._match_list_filter("tarefas prioritárias") == ("high", "de alta prioridade")
+
+
+@pytest.mark.asyncio
+async def test_process_message_stream_yields_deltas_then_final_response(chat_service, mock_openai_adapter):
+    mock_openai_adapter.generate_completion_stream = fake_stream(["Você tem ", "2 tarefas."], [])
+
+    events = [event async for event in chat_service.process_message_stream("depois eu vejo isso", [])]
+
+    assert [e["content"] for e in events if e["type"] == "delta"] == ["Você tem ", "2 tarefas."]
+    assert events[-1] == {
+        "type": "done",
+        "response": {"message": "Você tem 2 tarefas.", "action": "general", "data": None},
+    }
+    assert chat_service.get_history()[-1]["content"] == "Você tem 2 tarefas."
+
+
+@pytest.mark.asyncio
+async def test_process_message_stream_routes_known_intents(chat_service):
+    events = [event async for event in chat_service.process_message_stream("ajuda", [])]
+
+    assert len(events) == 1
+    assert events[0]["type"] == "done"
+    assert events[0]["response"]["action"] == "help"
+
+
+@pytest.mark.asyncio
+async def test_general_answer_is_cached_until_tasks_change(chat_service, mock_openai_adapter):
+    tasks = [Task(user_id=uuid4(), title="Relatório")]
+
+    first = await chat_service._handle_with_gpt("O que tenho para hoje?", tasks)
+    second = await chat_service._handle_with_gpt("o que tenho para hoje? ", tasks)
+
+    assert first == second == {"message": "general", "action": "general", "data": None}
+    mock_openai_adapter.generate_completion.assert_awaited_once()
+
+    tasks[0].updated_at += timedelta(minutes=1)
+    await chat_service._handle_with_gpt("O que tenho para hoje?", tasks)
+
+    assert mock_openai_adapter.generate_completion.await_count == 2
+
+
+def test_prompt_task_line_shows_due_date_in_brazil_time():
+    now = now_brazil()
+    due = now.replace(hour=14, minute=0, second=0, microsecond=0)
+    task = Task(user_id=uuid4(), title="Reunião", due_date=due.astimezone(timezone.utc))
+
+    line = chat_assistant_service._prompt_task_line(task, "A Fazer", "Alta", now.date())
+
+    assert line == f"• Reunião | Status: A Fazer | Prioridade: Alta | Prazo: {due:%d/%m/%Y} 14:00 [HOJE]"
+
+
+def test_history_within_budget_keeps_newest_messages_whole():
+    messages = [
+        chat_assistant_service._HistoryMessage("user", "a" * 10, ""),
+        chat_assistant_service._HistoryMessage("assistant", "b" * 300, ""),
+        chat_assistant_service._HistoryMessage("user", "c" * 50, ""),
+    ]
+
+    assert chat_assistant_service._history_within_budget(messages, 400) == [
+        "USER: " + "a" * 10, "ASSISTANT: " + "b" * 300, "USER: " + "c" * 50,
+    ]
+    assert chat_assistant_service._history_within_budget(messages, 150) == [
+        "ASSISTANT: " + "b" * 100, "USER: " + "c" * 50,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_general_answer_cache_is_not_shared_across_users(mock_openai_adapter):
+    alice = ChatAssistantService(openai_adapter=mock_openai_adapter, user_id=uuid4())
+    bob = ChatAssistantService(openai_adapter=mock_openai_adapter, user_id=uuid4())
+
+    await alice._handle_with_gpt("O que tenho para hoje?", [])
+    await bob._handle_with_gpt("O que tenho para hoje?", [])
+
+    assert mock_openai_adapter.generate_completion.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_conversational_questions_skip_answer_cache(chat_service, mock_openai_adapter):
+    chat_service._append_history("user", "Tenho consulta médica amanhã", "")
+    chat_service._append_history("assistant", "Anotado!", "")
+
+    await chat_service._handle_with_gpt("O que você lembra sobre mim?", [])
+    await chat_service._handle_with_gpt("O que você lembra sobre mim?", [])
+    await chat_service._handle_with_gpt("e essa tarefa?", [])
+    await chat_service._handle_with_gpt("e essa tarefa?", [])
+
+    assert mock_openai_adapter.generate_completion.await_count == 4
+    assert "HISTÓRICO DA CONVERSA" in mock_openai_adapter.generate_completion.await_args.kwargs["prompt"]
+
+
+@pytest.mark.asyncio
+async def test_repeated_question_in_one_session_calls_gpt_once(chat_service, mock_openai_adapter):
+    tasks = [Task(user_id=uuid4(), title="Relatório")]
+
+    for _ in range(3):
+        response = await chat_service.process_message("qual a tarefa mais antiga que eu tenho?", tasks)
+
+    answer_calls = [
+        call for call in mock_openai_adapter.generate_completion.await_args_list
+        if call.kwargs.get("max_tokens") == 800
+    ]
+    assert len(answer_calls) == 1
+    assert "HISTÓRICO DA CONVERSA" not in answer_calls[0].kwargs["prompt"]
+    assert response == {"message": "general", "action": "general", "data": None}
+
+
+@pytest.mark.asyncio
+async def test_process_message_stream_stops_deltas_at_response_limit(chat_service, mock_openai_adapter):
+    consumed = []
+    mock_openai_adapter.generate_completion_stream = fake_stream(["a" * 600, "b" * 600, "c" * 600], consumed)
+
+    events = [event async for event in chat_service.process_message_stream("depois eu vejo isso", [])]
+
+    streamed = "".join(e["content"] for e in events if e["type"] == "delta")
+    assert streamed == "a" * 600 + "b" * 400 + "..."
+    assert events[-1]["response"]["message"] == streamed
+    assert len(consumed) == 2
+
+
+@pytest.mark.asyncio
+async def test_process_message_stream_records_reply_when_consumer_stops(chat_service, mock_openai_adapter):
+    consumed = []
+    mock_openai_adapter.generate_completion_stream = fake_stream(["Você tem ", "2 tarefas."], consumed)
+
+    events = chat_service.process_message_stream("depois eu vejo isso", [])
+    first = await anext(events)
+    await events.aclose()
+
+    assert first == {"type": "delta", "content": "Você tem "}
+    assert [(m["role"], m["content"]) for m in chat_service.get_history()] == [
+        ("user", "depois eu vejo isso"), ("assistant", "Você tem "),
+    ]
+    assert consumed == ["Você tem "]
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from application.services.notification_service import NotificationService
+from domain.entities.task import Task
+from domain.value_objects.priority import Priority
+from domain.value_objects.task_status import TaskStatus
+
+NOW = datetime(2025, 3, 10, 15, 30, tzinfo=ZoneInfo("America/Sao_Paulo"))
+
+
+def _build_tasks():
+    user_id = uuid4()
+    return [
+        Task(user_id=user_id, title="Atrasada", due_date=NOW - timedelta(days=2, hours=1)),
+        Task(user_id=user_id, title="Hoje", due_date=NOW.replace(hour=18, minute=0)),
+        Task(user_id=user_id, title="Amanhã", due_date=NOW + timedelta(days=1)),
+        Task(user_id=user_id, title="Urgente", priority=Priority.URGENT),
+        Task(user_id=user_id, title="Feita", status=TaskStatus.DONE, due_date=NOW - timedelta(days=1)),
+        Task(user_id=user_id, title="Cancelada", status=TaskStatus.CANCELADA, due_date=NOW - timedelta(days=1)),
+    ]
+
+
+def test_get_tasks_requiring_notification_groups_by_reference_time():
+    notifications = NotificationService().get_tasks_requiring_notification(_build_tasks(), now=NOW)
+
+    assert {key: [t.title for t in tasks] for key, tasks in notifications.items()} == {
+        "overdue": ["Atrasada"],
+        "due_today": ["Hoje"],
+        "due_tomorrow": ["Amanhã"],
+        "due_soon": [],
+        "high_priority_pending": ["Urgente"],
+    }
+
+
+def test_format_notification_message_uses_reference_time():
+    service = NotificationService()
+    notifications = service.get_tasks_requiring_notification(_build_tasks(), now=NOW)
+
+    message = service.format_notification_message(notifications, now=NOW)
+
+    assert message == (
+        "URGENTE: 1 tarefa(s) ATRASADA(S)!\n"
+        "  - Atrasada (atrasada há 2 dia(s))\n"
+        "\nVENCE HOJE: 1 tarefa(s)\n"
+        "  - Hoje às 18:00\n"
+        "\nVENCE AMANHÃ: 1 tarefa(s)\n"
+        "  - Amanhã às 15:30\n"
+        "\nALTA PRIORIDADE sem prazo: 1 tarefa(s)\n"
+        "  - Urgente"
+    )
+
+
+def test_format_notification_message_without_notifications():
+    service = NotificationService()
+    notifications = service.get_tasks_requiring_notification([], now=NOW)
+
+    assert service.format_notification_message(notifications, now=NOW) == (
+        "Nenhuma notificação pendente. Você está em dia com suas tarefas!"
+    )
+
+
+def test_format_notification_message_shows_three_tasks_per_section():
+    service = NotificationService()
+    tasks = [Task(user_id=uuid4(), title=f"Tarefa {i}", priority=Priority.HIGH) for i in range(5)]
+    notifications = service.get_tasks_requiring_notification(tasks, now=NOW)
+
+    assert service.format_notification_message(notifications, now=NOW) == (
+        "\nALTA PRIORIDADE sem prazo: 5 tarefa(s)\n"
+        "  - Tarefa 0\n"
+        "  - Tarefa 1\n"
+        "  - Tarefa 2\n"
+        "  ... e mais 2 tarefa(s)"
+    )
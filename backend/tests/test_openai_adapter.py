@@ -0,0 +1,96 @@
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from infrastructure.gpt.openai_adapter import OpenAIAdapter
+
+
+@pytest.fixture
+def adapter():
+    adapter = OpenAIAdapter(api_key="test-key", model="gpt-4")
+    adapter.client = MagicMock()
+    adapter.client.files.create = AsyncMock(return_value=SimpleNamespace(id="file_in"))
+    adapter.client.batches.create = AsyncMock(return_value=SimpleNamespace(id="batch_1"))
+    return adapter
+
+
+def _output_line(custom_id, status_code, content=None):
+    body = {"choices": [{"message": {"content": content}}]} if status_code == 200 else {"error": "x"}
+    return json.dumps({"custom_id": custom_id, "response": {"status_code": status_code, "body": body}})
+
+
+def test_build_completion_body_orders_system_history_and_prompt(adapter):
+    body = adapter.build_completion_body(
+        prompt="Agora",
+        system_prompt="Sistema",
+        response_format={"type": "json_object"},
+        temperature=0.2,
+        max_tokens=100,
+        history=[{"role": "user", "content": "Antes"}],
+    )
+
+    assert body == {
+        "model": "gpt-4",
+        "messages": [
+            {"role": "system", "content": "Sistema"},
+            {"role": "user", "content": "Antes"},
+            {"role": "user", "content": "Agora"},
+        ],
+        "temperature": 0.2,
+        "max_tokens": 100,
+        "response_format": {"type": "json_object"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_submit_batch_uploads_one_jsonl_line_per_request(adapter):
+    requests = [
+        {"custom_id": "0", "body": adapter.build_completion_body(prompt="Um")},
+        {"custom_id": "1", "body": adapter.build_completion_body(prompt="Dois")},
+    ]
+
+    batch_id = await adapter.submit_batch(requests)
+
+    assert batch_id == "batch_1"
+    filename, payload = adapter.client.files.create.await_args.kwargs["file"]
+    assert filename == "batch.jsonl"
+    lines = [json.loads(line) for line in payload.decode("utf-8").split("\n")]
+    assert [line["custom_id"] for line in lines] == ["0", "1"]
+    assert all(line["method"] == "POST" and line["url"] == "/v1/chat/completions" for line in lines)
+    assert lines[1]["body"]["messages"] == [{"role": "user", "content": "Dois"}]
+    adapter.client.batches.create.assert_awaited_once_with(
+        input_file_id="file_in", endpoint="/v1/chat/completions", completion_window="24h"
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_batch_results_parses_completed_output(adapter):
+    adapter.client.batches.retrieve = AsyncMock(
+        return_value=SimpleNamespace(status="completed", output_file_id="file_out")
+    )
+    output = "\n".join([_output_line("0", 200, '{"subtasks": []}'), "", _output_line("1", 500)])
+    adapter.client.files.content = AsyncMock(return_value=SimpleNamespace(text=output))
+
+    results = await adapter.get_batch_results("batch_1")
+
+    assert results == {"0": '{"subtasks": []}', "1": None}
+    adapter.client.files.content.assert_awaited_once_with("file_out")
+
+
+@pytest.mark.asyncio
+async def test_get_batch_results_returns_none_while_running(adapter):
+    adapter.client.batches.retrieve = AsyncMock(return_value=SimpleNamespace(status="in_progress"))
+    adapter.client.files.content = AsyncMock()
+
+    assert await adapter.get_batch_results("batch_1") is None
+    adapter.client.files.content.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", ["failed", "expired", "cancelled"])
+async def test_get_batch_results_raises_for_finished_unsuccessful_batch(adapter, status):
+    adapter.client.batches.retrieve = AsyncMock(return_value=SimpleNamespace(status=status))
+
+    with pytest.raises(Exception, match=status):
+        await adapter.get_batch_results("batch_1")
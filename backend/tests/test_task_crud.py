@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
+from application.services.gpt_service import ParsedTask
 from application.use_cases.create_task import CreateTaskUseCase
 from application.use_cases.manage_tasks import (
     GetTasksUseCase,
@@ -19,6 +20,7 @@ from domain.value_objects.task_status import TaskStatus
 def mock_task_repository():
     repo = MagicMock(spec=TaskRepository)
     repo.create = AsyncMock()
+    repo.create_many = AsyncMock(side_effect=lambda tasks: tasks)
     repo.get_by_id = AsyncMock()
     repo.get_by_user_id = AsyncMock()
     repo.update = AsyncMock()
@@ -53,6 +55,26 @@ async def test_create_task_structured(mock_task_repository):
     mock_task_repository.create.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_create_recurring_tasks_inserts_series_in_one_call(mock_task_repository):
+    mock_gpt_service = MagicMock()
+    mock_gpt_service.parse_task = AsyncMock(return_value=(
+        ParsedTask(title="Planning", recurrence={"frequency": "weekly", "interval": 1}),
+        {"model": "gpt-4"},
+    ))
+    events = AsyncMock()
+    use_case = CreateTaskUseCase(mock_task_repository, mock_gpt_service)
+    use_case.set_event_callback(events)
+
+    first, response = await use_case.execute_from_natural_language(uuid4(), "planning toda semana", max_recurrences=4)
+
+    mock_task_repository.create_many.assert_awaited_once()
+    mock_task_repository.create.assert_not_called()
+    assert first.title == "Planning (1/4)"
+    assert response["recurring_tasks_created"] == 4
+    assert events.await_count == 4
+
+
 @pytest.mark.asyncio
 async def test_get_tasks_by_user(mock_task_repository):
     use_case = GetTasksUseCase(mock_task_repository)